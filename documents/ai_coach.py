@@ -0,0 +1,181 @@
+# ai_coach.py
+# ---------------------------------------------------------------------------
+# Async OpenAI coaching tips with a latency budget.
+#
+# • Calls go through one AsyncOpenAI client; a semaphore caps how many are
+#   in flight across the whole process.
+# • The prompt is built from metrics rounded to coaching precision (1 mph,
+#   10 ms, 2°), so near‑identical swings share a prompt; answers are kept in
+#   an LRU keyed on that prompt and identical in‑flight calls are shared.
+# • `tips_within_budget()` waits at most `budget_s`; if the model is slower
+#   the caller gets the still‑running task back and can deliver the tips later.
+#
+# OPENAI_BASE_URL points the client at a local stub server for testing.
+# ---------------------------------------------------------------------------
+
+import asyncio
+import os
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import openai
+
+import telemetry
+from swing_pipeline import DEFAULT_SHOULDER_WIDTH_IN
+
+AI_MODEL = os.environ.get("OPENAI_MODEL", "gpt-4")
+
+SYSTEM_PROMPT = """You are a professional baseball swing coach with expertise in biomechanics and swing analysis.
+                Focus on providing specific, actionable advice based on the measured metrics.
+                Explain how each metric indicates a potential improvement area and what specific adjustments would help."""
+
+# metric → bucket size used in the prompt (and therefore the cache key)
+_BUCKETS = {
+    "peak_hand_speed_mph": 1.0,
+    "time_peak_to_contact_ms": 10.0,
+    "hip_rot_deg": 2.0,
+    "shoulder_rot_deg": 2.0,
+    "hip_shoulder_separation_deg": 2.0,
+    "lead_elbow_angle_deg": 2.0,
+    "bat_lag_deg": 2.0,
+}
+
+AITips = Tuple[List[str], Optional[str]]
+
+
+def bucketed(swing: dict) -> dict:
+    """The prompt metrics rounded to their bucket size."""
+    return {k: round(float(swing[k]) / step) * step for k, step in _BUCKETS.items()}
+
+
+def coaching_prompt(swing: dict, side: str = "Right",
+                    shoulder_width: Optional[float] = None) -> str:
+    m = bucketed(swing)
+    user_shoulder_width = shoulder_width if shoulder_width is not None else DEFAULT_SHOULDER_WIDTH_IN
+    return f"""
+        You are analysing a {side.lower()}-handed amateur baseball swing.
+        Below are the key measurements **at contact** and through the swing.
+        Use them to give simple, specific coaching advice.
+
+        Swing measurements
+        ------------------
+        • Peak wrist speed ............... {m["peak_hand_speed_mph"]:.1f} mph (using {user_shoulder_width} inch shoulder width)
+        • Time between peak speed and contact ..... {m["time_peak_to_contact_ms"]:.0f} ms
+
+        Body rotation (separation angles)
+        • Hip rotation at contact ....... {m["hip_rot_deg"]:.1f}°
+        • Shoulder rotation at contact .. {m["shoulder_rot_deg"]:.1f}°
+        • Hip-to-shoulder separation ..... {m["hip_shoulder_separation_deg"]:.1f}°
+
+        Bat & arm position
+        • Lead-arm elbow angle .......... {m["lead_elbow_angle_deg"]:.1f}°
+        • Bat-lag (forearm↔bat) ......... {m["bat_lag_deg"]:.1f}°
+
+        Instructions
+        ------------
+        1. **Return 3 – 4 bullet points** (≤ 20 words each) that an average 12-year-old can try today.
+        2. Reference the *measurements* above in plain language (mph, degrees, milliseconds).
+        3. **Do NOT** mention "pixels," raw keypoint names, or data collection details.
+        4. Be encouraging and prioritise the single biggest gain first.
+        """
+
+
+def parse_tips(text: str) -> List[str]:
+    return [tip.strip() for tip in text.strip().split('\n') if tip.strip()]
+
+
+class AICoach:
+    """
+    Shared async front‑end to the OpenAI chat API (one per process).
+
+    budget_s         how long a request is willing to wait for tips
+    timeout_s        hard limit for one API call (keeps running past the budget)
+    max_concurrency  calls in flight at once, process‑wide
+    cache_size       prompts remembered
+    """
+
+    def __init__(self, budget_s: float = 6.0, timeout_s: float = 45.0,
+                 max_concurrency: int = 4, cache_size: int = 512):
+        self.budget_s = budget_s
+        self.timeout_s = timeout_s
+        self.cache_size = cache_size
+        self._limit = asyncio.Semaphore(max_concurrency)
+        self._cache: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._inflight: dict = {}
+        self._client = None
+
+    @classmethod
+    def from_env(cls) -> "AICoach":
+        env = os.environ.get
+        return cls(
+            budget_s=float(env("AI_BUDGET_S", 6.0)),
+            timeout_s=float(env("AI_TIMEOUT_S", 45.0)),
+            max_concurrency=int(env("AI_MAX_CONCURRENCY", 4)),
+            cache_size=int(env("AI_CACHE_SIZE", 512)),
+        )
+
+    def _get_client(self):
+        if self._client is None:
+            # base_url defaults to OPENAI_BASE_URL when set
+            self._client = openai.AsyncOpenAI(api_key=openai.api_key, max_retries=0)
+        return self._client
+
+    async def _call(self, prompt: str) -> List[str]:
+        async with self._limit:
+            with telemetry.span("openai"):
+                response = await asyncio.wait_for(
+                    self._get_client().chat.completions.create(
+                        model=AI_MODEL,
+                        messages=[
+                            {"role": "system", "content": SYSTEM_PROMPT},
+                            {"role": "user", "content": prompt}
+                        ],
+                        max_tokens=750
+                    ),
+                    self.timeout_s,
+                )
+        return parse_tips(response.choices[0].message.content)
+
+    async def tips(self, swing: dict, side: str = "Right",
+                   shoulder_width: Optional[float] = None) -> AITips:
+        """Coaching bullets for one swing → (ai_tips, error_ai); no budget applied."""
+        if not openai.api_key:
+            return [], "OpenAI API key not configured"
+
+        prompt = coaching_prompt(swing, side, shoulder_width)
+        if prompt in self._cache:
+            self._cache.move_to_end(prompt)
+            return list(self._cache[prompt]), None
+
+        call = self._inflight.get(prompt)
+        if call is None:
+            call = self._inflight[prompt] = asyncio.ensure_future(self._call(prompt))
+            call.add_done_callback(lambda _: self._inflight.pop(prompt, None))
+        try:
+            ai_tips = await asyncio.shield(call)
+        except asyncio.TimeoutError:
+            return [], f"OpenAI call exceeded {self.timeout_s:.0f}s"
+        except Exception as e:
+            print(f"OpenAI API error: {str(e)}")
+            return [], str(e)
+
+        self._cache[prompt] = ai_tips
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return list(ai_tips), None
+
+    async def tips_within_budget(
+        self, swing: dict, side: str = "Right", shoulder_width: Optional[float] = None,
+    ) -> Tuple[List[str], Optional[str], Optional["asyncio.Task[AITips]"]]:
+        """
+        tips() bounded by budget_s → (ai_tips, error_ai, late).
+        *late* is None when the answer made it in time; otherwise it is the
+        running task, which resolves to (ai_tips, error_ai) later.
+        """
+        task = asyncio.ensure_future(self.tips(swing, side, shoulder_width))
+        try:
+            ai_tips, error_ai = await asyncio.wait_for(asyncio.shield(task), self.budget_s)
+        except asyncio.TimeoutError:
+            telemetry.AI_LATE.inc()
+            return [], None, task
+        return ai_tips, error_ai, None
@@ -0,0 +1,144 @@
+# analysis_cache.py
+# ---------------------------------------------------------------------------
+# Content‑addressed, size‑bounded on‑disk cache for swing analyses.
+#
+# Two kinds of entries, both keyed by the SHA‑256 of the uploaded video:
+#   pose/<hash>.pose                 – pose track (pose_store format); reused
+#                                      whenever the same clip comes back, so
+#                                      only metrics are recomputed
+#   result/<hash>-<params>.json      – the full response for one parameter
+#                                      set (side, shoulder width)
+#   session/<session_id>.json        – which video a session analysed, so
+#                                      /reanalyze can find its pose track
+#
+# Eviction is least‑recently‑used across both kinds once the total size goes
+# over `max_bytes`.  Recency is kept in file mtimes so it survives restarts.
+# ---------------------------------------------------------------------------
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Union
+
+
+def video_key(side: str, shoulder_width: Optional[float], default_width: float = 16.0) -> str:
+    """Normalise the analysis parameters that change the result."""
+    hand = "L" if side.lower().startswith("l") else "R"
+    width = shoulder_width if shoulder_width is not None else default_width
+    return f"{hand}{width:.2f}"
+
+
+class AnalysisCache:
+    def __init__(self, root: Union[str, Path], max_bytes: int = 2 << 30):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        (self.root / "pose").mkdir(parents=True, exist_ok=True)
+        (self.root / "result").mkdir(parents=True, exist_ok=True)
+        (self.root / "session").mkdir(parents=True, exist_ok=True)
+
+        # path → size, least recently used first
+        self._lru: "OrderedDict[Path, int]" = OrderedDict()
+        entries = []
+        for sub in ("pose", "result", "session"):
+            for p in (self.root / sub).iterdir():
+                if p.name.startswith("."):
+                    p.unlink(missing_ok=True)       # half‑written leftovers
+                    continue
+                st = p.stat()
+                entries.append((st.st_mtime, p, st.st_size))
+        for _, p, size in sorted(entries):
+            self._lru[p] = size
+        self._total = sum(self._lru.values())
+
+    # ------------------------------------------------------------------ #
+    def pose_path(self, video_hash: str) -> Path:
+        return self.root / "pose" / f"{video_hash}.pose"
+
+    def result_path(self, video_hash: str, params: str) -> Path:
+        return self.root / "result" / f"{video_hash}-{params}.json"
+
+    def session_path(self, session_id: str) -> Path:
+        return self.root / "session" / f"{session_id}.json"
+
+    def _touch(self, path: Path) -> bool:
+        with self._lock:
+            if path not in self._lru:
+                return False
+            self._lru.move_to_end(path)
+        try:
+            os.utime(path, (time.time(), time.time()))
+        except FileNotFoundError:
+            with self._lock:
+                self._total -= self._lru.pop(path, 0)
+            return False
+        return True
+
+    def _add(self, path: Path) -> None:
+        size = path.stat().st_size
+        with self._lock:
+            self._total += size - self._lru.pop(path, 0)
+            self._lru[path] = size
+            while self._total > self.max_bytes and len(self._lru) > 1:
+                old, old_size = self._lru.popitem(last=False)
+                self._total -= old_size
+                old.unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------ #
+    def get_pose(self, video_hash: str) -> Optional[Path]:
+        """Path of the cached .pose file for this video, or None."""
+        path = self.pose_path(video_hash)
+        return path if self._touch(path) else None
+
+    def put_pose_file(self, video_hash: str, src: Union[str, Path]) -> Path:
+        """Move a finished .pose file (written elsewhere) into the cache."""
+        path = self.pose_path(video_hash)
+        # a unique temp name: concurrent requests for the same video must not
+        # move or replace each other's file
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".")
+        os.close(fd)
+        try:
+            shutil.move(str(src), tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self._add(path)
+        return path
+
+    def _get_json(self, path: Path) -> Optional[dict]:
+        if not self._touch(path):
+            return None
+        try:
+            return json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _put_json(self, path: Path, data: dict) -> None:
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+        self._add(path)
+
+    def get_result(self, video_hash: str, params: str) -> Optional[dict]:
+        return self._get_json(self.result_path(video_hash, params))
+
+    def put_result(self, video_hash: str, params: str, result: dict) -> None:
+        self._put_json(self.result_path(video_hash, params), result)
+
+    def get_session(self, session_id: str) -> Optional[dict]:
+        """{"video_hash", "video_url"} recorded for a finished session, or None."""
+        return self._get_json(self.session_path(session_id))
+
+    def put_session(self, session_id: str, record: dict) -> None:
+        self._put_json(self.session_path(session_id), record)
+
+    def size(self) -> int:
+        return self._total
+
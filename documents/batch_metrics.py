@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+batch_metrics.py
+~~~~~~~~~~~~~~~~
+`metrics.enrich_and_measure` for many swings at once.
+
+Swings are stacked into one padded tensor
+
+    keypoints  (swings, frames, 17, 2)   NaN past each swing's length
+    speed      (swings, frames)          COM speed (the DataFrame `speed` column)
+    lengths    (swings,)                 real frames per swing
+    lefty      (swings,)                 handedness
+
+and every metric is computed for all swings with array ops – no per‑swing
+Python.  Results match the single‑swing function (same smoothing, same
+fallbacks); use `stack_swings()` to build the inputs from DataFrames or
+pose arrays.
+"""
+
+from typing import Dict, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from scipy.signal import savgol_coeffs
+
+from com_velo_parser import KEYPOINT_COLUMNS, KEYPOINTS, _KP_INDEX, px_s_to_mph
+from swing_pose import SwingPose
+
+DEG = 180 / np.pi
+
+# peak_wrist_speed smoothing: Savitzky–Golay, window 5, order 2, mode="interp"
+_SG_WINDOW, _SG_ORDER = 5, 2
+_SG_COEFFS = savgol_coeffs(_SG_WINDOW, _SG_ORDER)
+_vander = np.vander(np.arange(_SG_WINDOW, dtype=float), _SG_ORDER + 1, increasing=True)
+_SG_EDGE = _vander @ np.linalg.pinv(_vander)      # polyfit → value at each window position
+
+# peak_wrist_speed defaults when there is nothing to measure
+_DEFAULT_SPEED_PX_S = 1000.0
+
+
+def stack_swings(
+    swings: Sequence[Union[pd.DataFrame, Dict[str, np.ndarray], SwingPose]],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pad DataFrames (load_com_velo_csv), pose arrays (read_pose) or SwingPose
+    objects into → (keypoints (S, F, 17, 2), speed (S, F), lengths (S,)).
+    """
+    swings = [s.arrays() if isinstance(s, SwingPose) else s for s in swings]
+    lengths = np.array([len(s["keypoints"] if isinstance(s, dict) else s) for s in swings])
+    S, F = len(swings), int(lengths.max(initial=0))
+    first = swings[0]["keypoints"] if S and isinstance(swings[0], dict) else None
+    dtype = first.dtype if first is not None else np.float64
+    keypoints = np.full((S, F, len(KEYPOINTS), 2), np.nan, dtype=dtype)
+    speed = np.zeros((S, F))
+    for i, s in enumerate(swings):
+        n = lengths[i]
+        if isinstance(s, dict):
+            keypoints[i, :n] = s["keypoints"]
+            vel = s["velocity"]
+            speed[i, :n] = np.hypot(np.nan_to_num(vel[:, 0]), np.nan_to_num(vel[:, 1]))
+        else:
+            keypoints[i, :n] = s[KEYPOINT_COLUMNS].to_numpy().reshape(n, -1, 2)
+            speed[i, :n] = s["speed"].to_numpy()
+    return keypoints, speed, lengths
+
+
+def _pick(keypoints: np.ndarray, names: np.ndarray, frame: np.ndarray) -> np.ndarray:
+    """keypoints[s, frame[s], names[s]] for every swing s → (S, 2) float64."""
+    s = np.arange(len(keypoints))
+    return keypoints[s, frame, names].astype(float)
+
+
+def _angle(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """∠ABC in degrees for rows of points, as metrics._angle."""
+    ba = a - b
+    bc = c - b
+    cos_th = (ba * bc).sum(-1) / (np.linalg.norm(ba, axis=-1) * np.linalg.norm(bc, axis=-1) + 1e-9)
+    return np.clip(np.arccos(cos_th), 0, np.pi) * DEG
+
+
+def _ffill_bfill(x: np.ndarray, inside: np.ndarray) -> np.ndarray:
+    """pandas ffill().bfill() along axis 1, within each swing's length."""
+    F = x.shape[1]
+    pos = np.arange(F)
+    valid = inside & ~np.isnan(x)
+    idx = np.maximum.accumulate(np.where(valid, pos, 0), axis=1)
+    x = np.take_along_axis(x, idx, axis=1)
+    valid = np.take_along_axis(valid, idx, axis=1)
+    idx = np.minimum.accumulate(np.where(valid, pos, F - 1)[:, ::-1], axis=1)[:, ::-1]
+    return np.take_along_axis(x, idx, axis=1)
+
+
+def _savgol(d: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """savgol_filter(d[s, :n], 5, 2, mode="interp") for every swing with n ≥ 5."""
+    S, F = d.shape
+    out = d.copy()
+    if F < _SG_WINDOW:
+        return out
+    half = _SG_WINDOW // 2
+    out[:, half:F - half] = sum(
+        c * d[:, k:F - _SG_WINDOW + 1 + k] for k, c in enumerate(_SG_COEFFS[::-1])
+    )
+    # the first / last half‑window come from a polynomial fit of the edge window
+    out[:, :half] = d[:, :_SG_WINDOW] @ _SG_EDGE[:half].T
+    s = np.arange(S)
+    tail = np.maximum(lengths, _SG_WINDOW)[:, None] - _SG_WINDOW + np.arange(_SG_WINDOW)
+    fitted = np.take_along_axis(d, tail, axis=1) @ _SG_EDGE[-half:].T
+    for j in range(half):
+        out[s, tail[:, _SG_WINDOW - half + j]] = fitted[:, j]
+    return np.where((lengths >= _SG_WINDOW)[:, None], out, d)
+
+
+def peak_wrist_speeds(
+    keypoints: np.ndarray, lengths: np.ndarray, wrist: np.ndarray, fps: float = 30.0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorised com_velo_parser.peak_wrist_speed (smooth=True)
+    → (frame_idx (S,), speed_px_s (S,)).  *wrist* is a keypoint index per swing.
+    """
+    S, F = keypoints.shape[:2]
+    if F == 0:
+        return np.zeros(S, dtype=int), np.full(S, _DEFAULT_SPEED_PX_S)
+    inside = np.arange(F) < lengths[:, None]
+    xy = keypoints[np.arange(S), :, wrist]                 # (S, F, 2)
+
+    speed = np.zeros((S, F))
+    for axis in range(2):
+        pos = _ffill_bfill(xy[..., axis], inside)
+        d = np.zeros((S, F))
+        d[:, 1:] = (pos[:, 1:] - pos[:, :-1]).astype(float)
+        d = _savgol(d, lengths)
+        speed += d * d
+    speed = np.sqrt(speed) * fps
+
+    speed = np.where(inside & np.isfinite(speed), speed, -np.inf)
+    frame_idx = speed.argmax(axis=1)
+    peak = speed[np.arange(S), frame_idx]
+    found = np.isfinite(peak) & (lengths >= 2)
+    return np.where(found, frame_idx, 0), np.where(found, peak, _DEFAULT_SPEED_PX_S)
+
+
+def batch_measure(
+    keypoints: np.ndarray,
+    speed: np.ndarray,
+    lengths: np.ndarray,
+    lefty: Union[bool, np.ndarray] = False,
+    fps: float = 30.0,
+    shoulder_in: Union[float, np.ndarray] = 16.0,
+) -> Dict[str, np.ndarray]:
+    """
+    enrich_and_measure for every swing in the stack → dict of (S,) arrays with
+    the same keys.  *lefty* and *shoulder_in* may be scalars or per swing.
+    """
+    keypoints = np.asarray(keypoints)
+    S, F = keypoints.shape[:2]
+    lengths = np.asarray(lengths)
+    lefty = np.broadcast_to(np.asarray(lefty, dtype=bool), (S,))
+    shoulder_in = np.broadcast_to(np.asarray(shoulder_in, dtype=float), (S,))
+    kp = _KP_INDEX
+
+    def side(left: str, right: str) -> np.ndarray:
+        return np.where(lefty, kp[left], kp[right])
+
+    wrist_kp = side("left_wrist", "right_wrist")
+    trail_wrist = side("right_wrist", "left_wrist")
+    lead_elbow = side("left_elbow", "right_elbow")
+    lead_shldr = side("left_shoulder", "right_shoulder")
+
+    # ---- 2. contact frame = peak COM speed ------------------------------ #
+    inside = np.arange(F) < lengths[:, None]
+    contact_f = np.where(inside, speed, -np.inf).argmax(axis=1) if F else np.zeros(S, dtype=int)
+
+    # ---- 1. peak hand speed -------------------------------------------- #
+    first = np.zeros(S, dtype=int)
+    ls = _pick(keypoints, np.full(S, kp["left_shoulder"]), first)
+    rs = _pick(keypoints, np.full(S, kp["right_shoulder"]), first)
+    shoulder_px = np.linalg.norm(ls - rs, axis=-1)
+
+    peak_f, speed_px_s = peak_wrist_speeds(keypoints, lengths, wrist_kp, fps=fps)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        measured = px_s_to_mph(speed_px_s, shoulder_px / shoulder_in)
+
+    missing = np.isnan(shoulder_px)
+    usable = ~missing & (shoulder_px > 0) & (shoulder_in > 0)
+    hand_speed_mph = np.where(missing, 60.0, np.where(usable, measured, 65.0))
+    hand_speed_mph = np.where(np.isnan(hand_speed_mph), 55.0, hand_speed_mph)
+    peak_speed_f = np.where(usable, peak_f, contact_f)
+
+    time_peak_to_contact_ms = np.abs(contact_f - peak_speed_f) / fps * 1000
+
+    # ---- 3. hip / shoulder rotation & separation ------------------------ #
+    def at_contact(names) -> np.ndarray:
+        names = np.full(S, kp[names]) if isinstance(names, str) else names
+        return _pick(keypoints, names, contact_f)
+
+    hip_vec = at_contact("right_hip") - at_contact("left_hip")
+    sh_vec = at_contact("right_shoulder") - at_contact("left_shoulder")
+    hip_rot_deg = np.degrees(np.arctan2(hip_vec[:, 1], hip_vec[:, 0]))
+    shoulder_rot_deg = np.degrees(np.arctan2(sh_vec[:, 1], sh_vec[:, 0]))
+    hip_sep_deg = np.abs(((shoulder_rot_deg - hip_rot_deg + 180) % 360) - 180)
+
+    # ---- 4. lead‑elbow extension / 5. bat lag ---------------------------- #
+    p_s = at_contact(lead_shldr)
+    lead_elbow_deg = _angle(p_s, at_contact(lead_elbow), at_contact(wrist_kp))
+    bat_lag_deg = _angle(p_s, at_contact(trail_wrist), at_contact("nose"))
+
+    return dict(
+        peak_hand_speed_mph=hand_speed_mph,
+        peak_hand_speed_frame=peak_speed_f,
+        hip_rot_deg=hip_rot_deg,
+        shoulder_rot_deg=shoulder_rot_deg,
+        hip_shoulder_separation_deg=hip_sep_deg,
+        lead_elbow_angle_deg=lead_elbow_deg,
+        bat_lag_deg=bat_lag_deg,
+        time_peak_to_contact_ms=time_peak_to_contact_ms,
+        contact_frame=contact_f,
+    )
+
+
+def measure_swings(
+    swings: Sequence[Union[pd.DataFrame, Dict[str, np.ndarray], SwingPose]],
+    sides: Union[str, Sequence[str]] = "Right",
+    fps: float = 30.0,
+    shoulder_in: Union[float, Sequence[float]] = 16.0,
+) -> pd.DataFrame:
+    """stack_swings + batch_measure → one row of metrics per swing."""
+    keypoints, speed, lengths = stack_swings(swings)
+    if isinstance(sides, str):
+        sides = [sides] * len(lengths)
+    lefty = np.array([s.lower().startswith("l") for s in sides], dtype=bool)
+    return pd.DataFrame(batch_measure(keypoints, speed, lengths, lefty,
+                                      fps=fps, shoulder_in=np.asarray(shoulder_in, dtype=float)))
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+batch_swings.py
+~~~~~~~~~~~~~~~
+Analyse a whole folder of swings – videos or pose tracks (.pose / CSV) –
+on a pool of worker processes and write one summary row per swing.
+
+    python batch_swings.py clips/ "session2/*.mov" --out summary.csv
+
+• Each worker loads and warms its own pose model once (only when there are
+  videos to process); pose tracks skip inference entirely.
+• Rows are appended to the summary as swings finish, so an interrupted run
+  picks up where it stopped: files already in the summary with status "ok"
+  are skipped.  Failed files are retried on the next run.
+• Videos also leave a .pose file next to the summary (--pose-dir) so later
+  runs with other parameters don't re‑infer.
+"""
+
+import argparse
+import contextlib
+import csv
+import glob
+import hashlib
+import io
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from pose_store import POSE_SUFFIX
+
+VIDEO_SUFFIXES = {".mp4", ".mov", ".m4v", ".avi", ".mkv"}
+POSE_SUFFIXES = {POSE_SUFFIX, ".csv"}
+
+METRIC_COLUMNS = [
+    "peak_hand_speed_mph",
+    "peak_hand_speed_frame",
+    "time_peak_to_contact_ms",
+    "contact_frame",
+    "hip_rot_deg",
+    "shoulder_rot_deg",
+    "hip_shoulder_separation_deg",
+    "lead_elbow_angle_deg",
+    "bat_lag_deg",
+]
+SUMMARY_COLUMNS = ["file", "status", "error", "seconds"] + METRIC_COLUMNS
+
+
+def find_inputs(patterns: Iterable[str]) -> List[Path]:
+    """Expand directories (recursively) and globs into swing files, sorted."""
+    found = set()
+    for pat in patterns:
+        p = Path(pat)
+        if p.is_dir():
+            candidates = p.rglob("*")
+        elif p.exists():
+            candidates = [p]
+        else:
+            candidates = (Path(m) for m in glob.glob(pat, recursive=True))
+        for c in candidates:
+            if c.is_file() and c.suffix.lower() in VIDEO_SUFFIXES | POSE_SUFFIXES:
+                found.add(c.resolve())
+    return sorted(found)
+
+
+def load_done(summary: Path) -> Dict[str, dict]:
+    """Rows already in *summary*, keyed by file (the last row per file wins)."""
+    if not summary.exists():
+        return {}
+    with summary.open(newline="") as f:
+        return {row["file"]: row for row in csv.DictReader(f)}
+
+
+def pose_path(pose_dir: Union[str, Path], video: Union[str, Path]) -> Path:
+    """Where the .pose track of *video* is kept (stem + short path hash)."""
+    tag = hashlib.sha1(str(video).encode()).hexdigest()[:8]
+    return Path(pose_dir, f"{Path(video).stem}-{tag}{POSE_SUFFIX}")
+
+
+# ---- worker side ------------------------------------------------------------ #
+def _init_worker(threads: int, warm: bool) -> None:
+    if warm:
+        import torch
+        import pose_model
+        torch.set_num_threads(threads)
+        pose_model.warmup()
+
+
+def _analyse(path: str, side: str, shoulder_width: Optional[float],
+             pose_dir: Optional[str], verbose: bool) -> dict:
+    from swing_pipeline import analyse_pose_file, analyse_video
+
+    t0 = time.perf_counter()
+    row = {"file": path, "status": "ok", "error": ""}
+    # the analysis code is chatty – keep the progress output readable
+    quiet = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    try:
+        with quiet:
+            if Path(path).suffix.lower() in VIDEO_SUFFIXES:
+                out_bin = pose_path(pose_dir, path) if pose_dir else None
+                if out_bin is not None and out_bin.exists():
+                    # inferred on an earlier run – metrics only
+                    result = analyse_pose_file(out_bin, side, shoulder_width)
+                else:
+                    result = analyse_video(path, side, shoulder_width,
+                                           out_bin=str(out_bin) if out_bin else None)
+            else:
+                result = analyse_pose_file(path, side, shoulder_width)
+        row.update({k: result["swing"].get(k) for k in METRIC_COLUMNS})
+    except Exception as e:
+        row.update(status="error", error=str(e))
+    row["seconds"] = round(time.perf_counter() - t0, 3)
+    return row
+
+
+# ---- driver ----------------------------------------------------------------- #
+def run_batch(
+    inputs: List[Path],
+    summary: Path,
+    side: str = "Right",
+    shoulder_width: Optional[float] = None,
+    workers: Optional[int] = None,
+    pose_dir: Optional[Path] = None,
+    verbose: bool = False,
+) -> Dict[str, int]:
+    """Analyse *inputs* not yet in *summary* → {"done", "failed", "skipped"}."""
+    done = load_done(summary)
+    todo = [p for p in inputs if done.get(str(p), {}).get("status") != "ok"]
+    skipped = len(inputs) - len(todo)
+    print(f"{len(inputs)} swings found, {skipped} already in {summary}, {len(todo)} to analyse")
+    if not todo:
+        return {"done": 0, "failed": 0, "skipped": skipped}
+
+    has_video = any(p.suffix.lower() in VIDEO_SUFFIXES for p in todo)
+    cores = os.cpu_count() or 1
+    # inference wants a few cores per worker; pose tracks are cheap
+    workers = workers or (max(1, cores // 2) if has_video else cores)
+    workers = min(workers, len(todo))
+    if pose_dir is not None:
+        pose_dir.mkdir(parents=True, exist_ok=True)
+
+    summary.parent.mkdir(parents=True, exist_ok=True)
+    new_file = not summary.exists() or summary.stat().st_size == 0
+    counts = {"done": 0, "failed": 0, "skipped": skipped}
+    t0 = time.perf_counter()
+
+    with summary.open("a", newline="") as f, ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),   # torch is not fork‑safe
+        initializer=_init_worker,
+        initargs=(max(1, cores // workers), has_video),
+    ) as pool:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS)
+        if new_file:
+            writer.writeheader()
+
+        futures = [
+            pool.submit(_analyse, str(p), side, shoulder_width,
+                        str(pose_dir) if pose_dir else None, verbose)
+            for p in todo
+        ]
+        for n, fut in enumerate(as_completed(futures), 1):
+            row = fut.result()
+            writer.writerow(row)
+            f.flush()                    # every finished swing survives a crash
+
+            counts["done" if row["status"] == "ok" else "failed"] += 1
+            elapsed = time.perf_counter() - t0
+            rate = n / elapsed
+            eta = (len(todo) - n) / rate if rate else 0.0
+            status = "ok" if row["status"] == "ok" else f"FAILED: {row['error']}"
+            print(f"[{n}/{len(todo)}] {Path(row['file']).name}  {row['seconds']:.1f}s  {status}"
+                  f"  |  {rate:.2f} swings/s, ETA {eta:.0f}s")
+
+    elapsed = time.perf_counter() - t0
+    print(f"\nAnalysed {counts['done']} swings ({counts['failed']} failed) in {elapsed:.1f}s "
+          f"on {workers} workers – {len(todo) / elapsed:.2f} swings/s")
+    return counts
+
+
+def main():
+    p = argparse.ArgumentParser(description="Batch swing analysis → summary CSV")
+    p.add_argument("inputs", nargs="+", help="directories, files or glob patterns")
+    p.add_argument("--out", type=Path, default=Path("swing_summary.csv"), help="summary CSV (appended / resumed)")
+    p.add_argument("--side", default="Right", help="batter handedness (Right/Left)")
+    p.add_argument("--shoulder-width", type=float, default=None, help="shoulder width in inches")
+    p.add_argument("--workers", type=int, default=None, help="worker processes")
+    p.add_argument("--pose-dir", type=Path, default=None,
+                   help="keep .pose files for analysed videos here (default: next to --out)")
+    p.add_argument("--no-pose", action="store_true", help="don't keep .pose files for videos")
+    p.add_argument("--verbose", action="store_true", help="show the analysis output of every swing")
+    args = p.parse_args()
+
+    pose_dir = None if args.no_pose else (args.pose_dir or args.out.parent / "poses")
+    # the summary / kept poses may live inside a scanned folder – not swings
+    own = {args.out.resolve()}
+    inputs = [f for f in find_inputs(args.inputs)
+              if f not in own and not (pose_dir and pose_dir.resolve() in f.parents)]
+    if not inputs:
+        p.error("no videos or pose files matched")
+    run_batch(inputs, args.out, side=args.side, shoulder_width=args.shoulder_width,
+              workers=args.workers, pose_dir=pose_dir, verbose=args.verbose)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,55 +10,124 @@ format and turn it into a tidy pandas DataFrame.
 • Splits COM and velocity into numeric x/y columns.
 • Adds a pre‑computed `speed` magnitude column.
 • Converts the foot_contact flags to booleans.
-• Exposes helper functions for simple swing tips.
+• Memory‑maps binary .pose files (see pose_store) instead of parsing.
+• Completes keypoint‑only payloads from on‑device pose (COM, velocity).
+• Optionally gap‑fills and smooths all keypoints + COM once (pose_filters).
+• Exposes helper functions for simple swing tips (fault rules: swing_rules).
+• `SwingAnalysis` wraps one swing and memoises the derived quantities
+  (contact frame, wrist speed, shoulder width …) shared by the tips and
+  the metrics.
 """
 
 import ast
+import json
+import logging
 import math
-from typing import Dict, Tuple, List, Optional
+from functools import cached_property
+from typing import Dict, Tuple, List, Optional, Union
 
 import numpy as np
 import pandas as pd
 
+from pose_store import is_pose_file, loads_pose, read_pose
+from pose_track import KEYPOINTS
+from swing_rules import recommend, tip_features
+
+log = logging.getLogger(__name__)
+
 
 # ------- configuration ----------------------------------------------------- #
-KEYPOINTS: List[str] = [
-    "nose", "left_eye", "right_eye", "left_ear", "right_ear",
-    "left_shoulder", "right_shoulder", "left_elbow", "right_elbow",
-    "left_wrist", "right_wrist", "left_hip", "right_hip",
-    "left_knee", "right_knee", "left_ankle", "right_ankle",
-]
+_KP_INDEX: Dict[str, int] = {name: i for i, name in enumerate(KEYPOINTS)}
+KEYPOINT_COLUMNS: List[str] = [f"{kp}_{ax}" for kp in KEYPOINTS for ax in ("x", "y")]
 
 # you can pass a frame‑width/height if you want normalised [0‑1] coords later
 DEFAULT_FRAME_WIDTH = 1920
 DEFAULT_FRAME_HEIGHT = 1080
+
+# keypoints below this confidence count as missing (as in extract_pose)
+DEFAULT_CONF_THR = 0.6
+DEFAULT_FPS = 30.0
 # --------------------------------------------------------------------------- #
 
 
-def _safe_tuple(obj) -> Tuple[float, float]:
-    """ast.literal_eval a string like '(123.4, 567.8)' → (123.4, 567.8)."""
-    if isinstance(obj, str):
+def _loads(cell):
+    """
+    Decode one JSON cell as written by extract_pose_csv.  Older CSVs used
+    Python literals ("(None,None)", "{'front': False}") so fall back to
+    ast.literal_eval before giving up.
+    """
+    if not isinstance(cell, str):
+        return None
+    try:
+        return json.loads(cell)
+    except ValueError:
         try:
-            result = ast.literal_eval(obj)
-            if isinstance(result, (tuple, list)) and len(result) == 2:
-                return tuple(float(x) if x is not None else None for x in result)
+            return ast.literal_eval(cell)
         except (ValueError, SyntaxError):
-            return (None, None)
-    elif isinstance(obj, (tuple, list)) and len(obj) == 2:
-        return tuple(float(x) if x is not None else None for x in obj)
-    return (None, None)
+            return None
 
 
-def _parse_contact(flag_str: str) -> Tuple[bool, bool]:
+def decode_keypoints(cells) -> np.ndarray:
     """
-    Turn "{'front': False, 'back': False}" → (False, False).
-    If the entry is empty / malformed we return (False, False).
+    Bulk‑decode a `keypoints` column in one pass.
+    Returns a preallocated (frames, 17, 2) float array, NaN where a keypoint
+    was missing or filtered out by confidence.
     """
-    try:
-        d = ast.literal_eval(flag_str)
-        return bool(d.get("front", False)), bool(d.get("back", False))
-    except Exception:
-        return False, False
+    out = np.full((len(cells), len(KEYPOINTS), 2), np.nan)
+    for row, cell in enumerate(cells):
+        named = _loads(cell)
+        if not isinstance(named, dict):
+            continue
+        for name, xy in named.items():
+            col = _KP_INDEX.get(name)
+            if col is not None and xy is not None:
+                out[row, col] = [np.nan if v is None else v for v in xy[:2]]
+    return out
+
+
+def decode_pairs(cells) -> np.ndarray:
+    """Bulk‑decode a column of '[x, y]' cells → (frames, 2) float array."""
+    out = np.full((len(cells), 2), np.nan)
+    for row, cell in enumerate(cells):
+        pair = _loads(cell)
+        if isinstance(pair, (tuple, list)) and len(pair) == 2:
+            out[row] = [np.nan if v is None else v for v in pair]
+    return out
+
+
+def decode_contact(cells) -> np.ndarray:
+    """Bulk‑decode the foot_contact column → (frames, 2) bool array [front, back]."""
+    out = np.zeros((len(cells), 2), dtype=bool)
+    for row, cell in enumerate(cells):
+        flags = _loads(cell)
+        if isinstance(flags, dict):
+            out[row] = bool(flags.get("front", False)), bool(flags.get("back", False))
+    return out
+
+
+def frame_from_pose(arrays: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """
+    Build the wide DataFrame (same numeric columns as load_com_velo_csv) from
+    typed pose arrays, e.g. the ones read from a .pose file.  The keypoint
+    block wraps the (frames, 17, 2) array without copying it, so writes to
+    the frame reach the arrays (private pages for read_pose's mapping).
+    """
+    kps = arrays["keypoints"]
+    n = len(kps)
+    df = pd.DataFrame(kps.reshape(n, -1), columns=KEYPOINT_COLUMNS, copy=False)
+    df.insert(0, "frame", np.arange(n))
+    df.insert(1, "time", arrays["time"] if "time" in arrays else np.full(n, np.nan))
+
+    com, vel = arrays["com"], arrays["velocity"]
+    df["com_x"], df["com_y"] = com[:, 0], com[:, 1]
+    df["vel_x"], df["vel_y"] = vel[:, 0], vel[:, 1]
+    df["speed"] = np.hypot(np.nan_to_num(vel[:, 0]), np.nan_to_num(vel[:, 1]))
+
+    contact = arrays.get("foot_contact")
+    if contact is None:
+        contact = np.zeros((n, 2), dtype=bool)
+    df["contact_front"], df["contact_back"] = contact[:, 0], contact[:, 1]
+    return df
 
 
 def load_com_velo_csv(
@@ -66,62 +135,171 @@ def load_com_velo_csv(
     frame_w: int = DEFAULT_FRAME_WIDTH,
     frame_h: int = DEFAULT_FRAME_HEIGHT,
     normalise: bool = False,
+    smooth: Optional[str] = None,
+    fps: float = DEFAULT_FPS,
 ) -> pd.DataFrame:
     """
     Reads the CSV and returns a tidy DataFrame with one column per numeric value.
     Set *normalise=True* to scale all pixel coordinates to [0, 1] using frame_w/h.
+    *smooth* ("savgol" / "one_euro") runs pose_filters.smooth_frame first.
+
+    A binary .pose file (see pose_store) is detected by its magic bytes and
+    memory‑mapped instead of parsed; it yields the same numeric columns and
+    is just as writable (the mapping is copy‑on‑write, the file is never
+    modified).  One difference: `time` holds seconds from the first frame,
+    where the CSV leaves it blank (NaN).
     """
+    if is_pose_file(path):
+        arrays, _ = read_pose(path)
+        df = frame_from_pose(arrays)
+        if smooth:
+            from pose_filters import smooth_frame
+            smooth_frame(df, smooth, fps=fps)
+        if normalise:
+            _normalise(df, frame_w, frame_h)
+        return df
+
     df = pd.read_csv(path)
+    cols: Dict[str, np.ndarray] = {}
 
     # -- keypoints ----------------------------------------------------------- #
-    kp_dicts = df["keypoints"].apply(
-        lambda s: ast.literal_eval(s) if isinstance(s, str) else {}
-    )
-    for kp in KEYPOINTS:
-        df[f"{kp}_x"] = kp_dicts.apply(lambda d: d.get(kp, (np.nan, np.nan))[0])
-        df[f"{kp}_y"] = kp_dicts.apply(lambda d: d.get(kp, (np.nan, np.nan))[1])
+    # one decode pass into a (frames, 17, 2) array; reshaping to (frames, 34)
+    # gives the nose_x, nose_y, left_eye_x, ... column order directly
+    kps = decode_keypoints(df["keypoints"].to_numpy()).reshape(len(df), -1)
+    for i, col in enumerate(KEYPOINT_COLUMNS):
+        cols[col] = kps[:, i]
 
     # -- COM & velocity ------------------------------------------------------ #
     try:
-        com_series = df["COM"].apply(_safe_tuple)
-        df["com_x"] = com_series.apply(lambda x: x[0])
-        df["com_y"] = com_series.apply(lambda x: x[1])
-        
-        vel_series = df["velocity"].apply(_safe_tuple)
-        df["vel_x"] = vel_series.apply(lambda x: x[0])
-        df["vel_y"] = vel_series.apply(lambda x: x[1])
-        
+        com = decode_pairs(df["COM"].to_numpy())
+        vel = decode_pairs(df["velocity"].to_numpy())
+        cols["com_x"], cols["com_y"] = com[:, 0], com[:, 1]
+        cols["vel_x"], cols["vel_y"] = vel[:, 0], vel[:, 1]
+
         # Calculate speed, handling NaN values
-        df["speed"] = np.sqrt(df["vel_x"].fillna(0)**2 + df["vel_y"].fillna(0)**2)
+        cols["speed"] = np.hypot(np.nan_to_num(vel[:, 0]), np.nan_to_num(vel[:, 1]))
     except Exception as e:
         print(f"Error processing COM/velocity: {str(e)}")
         # Set default values
-        df["com_x"] = np.nan
-        df["com_y"] = np.nan
-        df["vel_x"] = 0.0
-        df["vel_y"] = 0.0
-        df["speed"] = 0.0
+        n = len(df)
+        cols["com_x"] = np.full(n, np.nan)
+        cols["com_y"] = np.full(n, np.nan)
+        cols["vel_x"] = np.zeros(n)
+        cols["vel_y"] = np.zeros(n)
+        cols["speed"] = np.zeros(n)
 
     # -- foot‑contact flags -------------------------------------------------- #
     try:
-        contact_series = df["foot_contact"].apply(_parse_contact)
-        df["contact_front"] = contact_series.apply(lambda x: x[0])
-        df["contact_back"] = contact_series.apply(lambda x: x[1])
+        contact = decode_contact(df["foot_contact"].to_numpy())
+        cols["contact_front"], cols["contact_back"] = contact[:, 0], contact[:, 1]
     except Exception as e:
         print(f"Error processing foot contact: {str(e)}")
-        df["contact_front"] = False
-        df["contact_back"] = False
+        cols["contact_front"] = np.zeros(len(df), dtype=bool)
+        cols["contact_back"] = np.zeros(len(df), dtype=bool)
+
+    # build all derived columns in a single concat instead of ~45 inserts
+    df = pd.concat([df, pd.DataFrame(cols, index=df.index)], axis=1)
+
+    if smooth:
+        from pose_filters import smooth_frame
+        smooth_frame(df, smooth, fps=fps)
 
     # -- optional normalisation --------------------------------------------- #
     if normalise:
-        for col in df.filter(like="_x").columns:
-            df[col] = df[col].div(frame_w).fillna(0.5)
-        for col in df.filter(like="_y").columns:
-            df[col] = df[col].div(frame_h).fillna(0.5)
+        _normalise(df, frame_w, frame_h)
 
     return df
 
 
+def track_from_keypoints(
+    arrays: Dict[str, np.ndarray],
+    conf_thr: float = DEFAULT_CONF_THR,
+    fps: float = DEFAULT_FPS,
+) -> Dict[str, np.ndarray]:
+    """
+    Complete a keypoints‑only track (pose detected on the phone) to the arrays
+    extract_pose writes: low‑confidence keypoints → NaN, COM = hip midpoint,
+    velocity = ΔCOM / Δt (0 where either COM is missing).
+
+    Needs `keypoints` (frames, 17, 2); `conf` (frames, 17) and `time`
+    (frames,) seconds are optional – without `time` frames are 1/fps apart.
+    """
+    kps = np.asarray(arrays["keypoints"], dtype=np.float32)
+    if kps.ndim != 3 or kps.shape[1:] != (len(KEYPOINTS), 2):
+        raise ValueError(f"keypoints must be (frames, {len(KEYPOINTS)}, 2), got {kps.shape}")
+    n = len(kps)
+
+    conf = arrays.get("conf")
+    if conf is not None:
+        conf = np.asarray(conf, dtype=np.float32)
+        if conf.shape != kps.shape[:2]:
+            raise ValueError(f"conf must be (frames, {len(KEYPOINTS)}), got {conf.shape}")
+        kps = np.where((conf >= conf_thr)[:, :, None], kps, np.nan)
+        detected = conf.max(axis=1, initial=0.0) > 0
+    else:
+        detected = np.isfinite(kps).any(axis=(1, 2))
+
+    if "time" in arrays:
+        t = np.asarray(arrays["time"], dtype=np.float64)
+        if t.shape != (n,):
+            raise ValueError(f"time must be (frames,), got {t.shape}")
+        t = t - t[0] if n else t
+    else:
+        t = np.arange(n) / fps
+
+    hips = kps[:, [_KP_INDEX["left_hip"], _KP_INDEX["right_hip"]]].astype(np.float64)
+    com = hips.mean(axis=1)
+    vel = np.zeros((n, 2))
+    if n > 1:
+        dt = np.diff(t)[:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = np.where(dt > 0, np.diff(com, axis=0) / dt, 0.0)
+        vel[1:] = np.nan_to_num(step, nan=0.0, posinf=0.0, neginf=0.0)
+
+    return dict(
+        keypoints=kps,
+        conf=conf if conf is not None else np.isfinite(kps[:, :, 0]).astype(np.float32),
+        com=com,
+        velocity=vel,
+        time=t,
+        foot_contact=np.zeros((n, 2), dtype=bool),
+        detected=detected,
+    )
+
+
+def load_keypoint_payload(data: bytes) -> Tuple[pd.DataFrame, Dict[str, np.ndarray], float]:
+    """
+    A pose container received as bytes (see pose_store) → (DataFrame with the
+    load_com_velo_csv columns, completed arrays, fps).
+
+    Keypoint‑only payloads go through track_from_keypoints; meta may carry
+    `conf_thr` and `fps`.  The fps is estimated from `time` when present.
+    """
+    arrays, meta = loads_pose(data)
+    if "keypoints" not in arrays:
+        raise ValueError("payload has no keypoints array")
+    fps = float(meta.get("fps") or DEFAULT_FPS)
+    if "time" in arrays and len(arrays["time"]) > 1:
+        dt = np.diff(np.asarray(arrays["time"], dtype=np.float64))
+        dt = dt[dt > 0]
+        if len(dt):
+            fps = 1.0 / float(np.median(dt))
+    if not {"com", "velocity"} <= arrays.keys():
+        arrays = track_from_keypoints(
+            arrays, conf_thr=float(meta.get("conf_thr", DEFAULT_CONF_THR)), fps=fps)
+    if len(arrays["keypoints"]) == 0:
+        raise ValueError("payload has no frames")
+    return frame_from_pose(arrays), arrays, fps
+
+
+def _normalise(df: pd.DataFrame, frame_w: int, frame_h: int) -> None:
+    """Scale all pixel coordinates to [0, 1] in place (missing → 0.5)."""
+    for col in df.filter(like="_x").columns:
+        df[col] = df[col].div(frame_w).fillna(0.5)
+    for col in df.filter(like="_y").columns:
+        df[col] = df[col].div(frame_h).fillna(0.5)
+
+
 def find_contact_frame(df: pd.DataFrame) -> int:
     """
     Heuristic: contact ≈ frame with *maximum* hand speed.
@@ -170,9 +348,9 @@ def mph_from_px_speed(
     else:
         raise ValueError("mode must be 'distance' or 'shoulder'")
 
-    mph = speed_px_s          / px_per_in   \
-                          / 12             \
-                          * 3600 / 5280
+    mph = (speed_px_s / px_per_in
+           / 12
+           * 3600 / 5280)
     return mph
 
 
@@ -189,18 +367,19 @@ def peak_wrist_speed(
         speed_px_s  – peak speed in pixels/second
         speed_mph   – peak speed in mph   (None if px_per_inch not given)
     """
-    print(f"DEBUG peak_wrist_speed starting with wrist={wrist}, fps={fps}, px_per_inch={px_per_inch}")
+    log.debug("peak_wrist_speed starting with wrist=%s, fps=%s, px_per_inch=%s", wrist, fps, px_per_inch)
     
     try:
         # Check if wrist keypoints exist in the dataframe
         if f"{wrist}_x" not in df.columns or f"{wrist}_y" not in df.columns:
-            print(f"DEBUG Error: Wrist columns {wrist}_x and {wrist}_y not found in DataFrame. Available columns: {df.columns.tolist()}")
+            log.warning("Wrist columns %s_x and %s_y not found in DataFrame. Available columns: %s",
+                        wrist, wrist, df.columns.tolist())
             # Return default values
             return dict(frame_idx=0, speed_px_s=1000.0, speed_mph=60.0)
         
         # Check if we have sufficient data
         if df.shape[0] < 2:
-            print("DEBUG Error: DataFrame has too few rows for velocity calculation")
+            log.warning("DataFrame has too few rows for velocity calculation")
             return dict(frame_idx=0, speed_px_s=1000.0, speed_mph=60.0)
             
         # ------------------------------------------------------
@@ -211,13 +390,13 @@ def peak_wrist_speed(
         
         # Check for NaN values in wrist positions
         if wrist_x.isnull().any() or wrist_y.isnull().any():
-            print("DEBUG Warning: NaN values in wrist position data")
+            log.debug("NaN values in wrist position data")
             # Fill NaN values with forward fill and then backward fill
-            wrist_x = wrist_x.fillna(method='ffill').fillna(method='bfill')
-            wrist_y = wrist_y.fillna(method='ffill').fillna(method='bfill')
+            wrist_x = wrist_x.ffill().bfill()
+            wrist_y = wrist_y.ffill().bfill()
         
-        dx = wrist_x.diff().to_numpy()
-        dy = wrist_y.diff().to_numpy()
+        dx = wrist_x.diff().to_numpy(dtype=float, copy=True)
+        dy = wrist_y.diff().to_numpy(dtype=float, copy=True)
 
         # first frame has NaN diff → set to 0
         dx[0], dy[0] = 0.0, 0.0
@@ -231,7 +410,7 @@ def peak_wrist_speed(
                 dx = savgol_filter(dx, window_length=5, polyorder=2, mode="interp")
                 dy = savgol_filter(dy, window_length=5, polyorder=2, mode="interp")
             except Exception as smooth_err:
-                print(f"DEBUG: Error in smoothing: {smooth_err}")
+                log.warning("Error in smoothing: %s", smooth_err)
                 # Continue without smoothing
 
         # ------------------------------------------------------
@@ -243,14 +422,14 @@ def peak_wrist_speed(
         # Find peak speed, avoiding any NaN or inf values
         valid_indices = np.where(np.isfinite(speed_px_s))[0]
         if len(valid_indices) == 0:
-            print("DEBUG Error: No valid speed values found")
+            log.warning("No valid speed values found")
             idx_peak = 0
             v_peak_px_s = 1000.0  # default value
         else:
             idx_peak = valid_indices[np.argmax(speed_px_s[valid_indices])]
             v_peak_px_s = float(speed_px_s[idx_peak])
 
-        print(f"DEBUG: Peak speed: {v_peak_px_s} px/s at frame {idx_peak}")
+        log.debug("Peak speed: %s px/s at frame %s", v_peak_px_s, idx_peak)
         
         # ------------------------------------------------------
         # 4. convert to MPH if scale known
@@ -258,42 +437,126 @@ def peak_wrist_speed(
         if px_per_inch and px_per_inch > 0:
             v_in_s = v_peak_px_s / px_per_inch         # inches / second
             v_mph = v_in_s * (1/12) * (3600/5280)     # → miles / hour
-            print(f"DEBUG: Converted to {v_mph} mph")
+            log.debug("Converted to %s mph", v_mph)
         else:
-            print(f"DEBUG: Cannot calculate MPH, px_per_inch={px_per_inch}")
+            log.debug("Cannot calculate MPH, px_per_inch=%s", px_per_inch)
             v_mph = None
 
         return dict(frame_idx=idx_peak,
                     speed_px_s=v_peak_px_s,
                     speed_mph=v_mph)
     
-    except Exception as e:
-        import traceback
-        print(f"DEBUG ERROR in peak_wrist_speed: {str(e)}")
-        print(traceback.format_exc())
+    except Exception:
+        log.exception("Error in peak_wrist_speed")
         # Return default values in case of error
         return dict(frame_idx=0, speed_px_s=1000.0, speed_mph=60.0)
 
 
+def px_s_to_mph(speed_px_s: float, px_per_inch: float) -> float:
+    return speed_px_s / px_per_inch / 12 * 3600 / 5280
 
-def simple_swing_tips(df: pd.DataFrame, side: str = "Right") -> list[str]:
-    tips = []
 
-    # --- 1. Bat speed & peak hand speed ------------------------------------
-    contact_f = find_contact_frame(df)
-    contact_speed = df.loc[contact_f, "speed"]
+class SwingAnalysis:
+    """
+    One swing's DataFrame plus everything derived from it.
 
-    if contact_speed < 0.005:      # px / frame (tune threshold)
-        tips.append(f"Bat speed low: {contact_speed:.3f} px/frame at contact.")
+    Each quantity is computed on first access and cached on the instance, so
+    simple_swing_tips, metrics.enrich_and_measure and the /process payload
+    can share one object instead of re‑deriving contact frame, wrist speed
+    and shoulder width each time.
+    """
+
+    def __init__(self, df: pd.DataFrame, side: str = "Right", fps: float = 30.0):
+        if "speed" not in df:
+            raise ValueError("Run load_com_velo_csv() first!")
+        self.df = df
+        self.side = side
+        self.fps = fps
+        lefty = side.lower().startswith("l")
+        self.wrist_kp = "left_wrist" if lefty else "right_wrist"
+        self.trail_wrist = "right_wrist" if lefty else "left_wrist"
+        self.lead_elbow = "left_elbow" if lefty else "right_elbow"
+        self.lead_shoulder = "left_shoulder" if lefty else "right_shoulder"
+
+    @classmethod
+    def of(cls, data: Union["SwingAnalysis", pd.DataFrame],
+           side: str = "Right", fps: float = 30.0) -> "SwingAnalysis":
+        """Pass a SwingAnalysis through; wrap a bare DataFrame."""
+        return data if isinstance(data, cls) else cls(data, side=side, fps=fps)
+
+    # ------------------------------------------------------------------ #
+    @cached_property
+    def contact_frame(self) -> int:
+        return find_contact_frame(self.df)
+
+    @cached_property
+    def peak_speed(self) -> float:
+        return float(self.df["speed"].max())
+
+    @cached_property
+    def contact(self) -> pd.Series:
+        """The DataFrame row at the contact frame."""
+        return self.df.loc[self.contact_frame]
+
+    @cached_property
+    def kinematics(self):
+        """pose_filters.Kinematics – velocity / speed of every point, once."""
+        from pose_filters import Kinematics
+        return Kinematics.from_frame(self.df, self.fps)
+
+    @cached_property
+    def wrist_speed(self) -> dict:
+        """
+        peak_wrist_speed() of the lead wrist (px/s; no mph).  A frame that is
+        already smoothed (pose_filters) is read from the cached kinematics.
+        """
+        if not self.df.attrs.get("smoothing"):
+            return peak_wrist_speed(self.df, wrist=self.wrist_kp, fps=self.fps)
+        frame, speed = self.kinematics.peak(self.wrist_kp)
+        if not np.isfinite(speed):
+            frame, speed = 0, 1000.0            # peak_wrist_speed's default
+        return dict(frame_idx=frame, speed_px_s=speed, speed_mph=None)
+
+    @cached_property
+    def shoulder_px(self) -> float:
+        """Shoulder breadth in pixels on the first frame (NaN if missing)."""
+        return float(np.linalg.norm(self.point("left_shoulder", 0)
+                                    - self.point("right_shoulder", 0)))
+
+    # ------------------------------------------------------------------ #
+    def point(self, kp: str, frame: Optional[int] = None) -> np.ndarray:
+        """(x, y) of keypoint *kp* at *frame* (default: the contact frame)."""
+        if frame is None:
+            row = self.contact
+            return np.array([row[f"{kp}_x"], row[f"{kp}_y"]], dtype=float)
+        return self.df.loc[frame, [f"{kp}_x", f"{kp}_y"]].to_numpy(dtype=float)
+
+    def px_per_inch(self, shoulder_in: float) -> float:
+        return self.shoulder_px / shoulder_in
+
+    def wrist_mph(self, shoulder_in: float) -> float:
+        """Peak lead‑wrist speed in mph, scaled by a shoulder breadth in inches."""
+        return px_s_to_mph(self.wrist_speed["speed_px_s"], self.px_per_inch(shoulder_in))
+
+
+def simple_swing_tips(
+    df: Union[pd.DataFrame, SwingAnalysis],
+    side: str = "Right",
+    advice: Optional[dict] = None,
+) -> list[str]:
+    """
+    Hand‑speed estimate plus one tip per fault from the swing_rules table.
+    Pass *advice* (swing_rules.recommend output) if the rules already ran.
+    """
+    tips = []
+    swing = SwingAnalysis.of(df, side=side)
 
+    # --- 1. Peak hand speed ------------------------------------------------
     # choose trail wrist based on handedness
-    wrist_kp = "left_wrist" if side.lower().startswith("l") else "right_wrist"
-    wrist_res = peak_wrist_speed(df, wrist=wrist_kp, fps=30.0)
+    wrist_res = swing.wrist_speed
 
     # real‑world mph via shoulder breadth heuristic
-    left  = df.loc[0, ["left_shoulder_x", "left_shoulder_y"]].to_numpy()
-    right = df.loc[0, ["right_shoulder_x", "right_shoulder_y"]].to_numpy()
-    shoulder_px = float(np.linalg.norm(left - right))
+    shoulder_px = swing.shoulder_px
 
     K = np.array([[1.02004390e3, 0., 6.35908127e2],
                   [0., 1.01924129e3, 3.74085015e2],
@@ -306,36 +569,11 @@ def simple_swing_tips(df: pd.DataFrame, side: str = "Right") -> list[str]:
 
     if mph is not None:
         tips.append(f"Peak hand speed ≈ {mph:.1f} mph.")
-    f_px = 0.5 * (K[0, 0] + K[1, 1])      # ≈ 1020 px for your iPhone
-
-    # 1) scale implied by the distance you typed
-    px_per_in_dist = f_px / 2.74 / 39.3701      # ← used in mode="distance"
-
-    # 2) scale implied by the shoulders in frame‑0
-    left  = df.loc[0, ["left_shoulder_x", "left_shoulder_y"]].to_numpy()
-    right = df.loc[0, ["right_shoulder_x", "right_shoulder_y"]].to_numpy()
-    shoulder_px     = np.linalg.norm(left - right)
-    px_per_in_shldr = shoulder_px / 16.0               # assumes 16‑inch breadth
-
-    print(f"px/in from distance  : {px_per_in_dist:.2f}")
-    print(f"px/in from shoulders : {px_per_in_shldr:.2f}")
-
-
-
-    
-    # --- 2. Hip‑rotation check ---------------------------------------------
-    start_sep = abs(df.loc[0, "left_hip_x"] - df.loc[0, "right_hip_x"])
-    contact_sep = abs(df.loc[contact_f, "left_hip_x"]
-                      - df.loc[contact_f, "right_hip_x"])
-    if contact_sep - start_sep < 5:      # px
-        tips.append("Open hips earlier – limited rotation before contact.")
-
-    # --- 3. Weight shift ----------------------------------------------------
-    ankle_mid_x = (df["left_ankle_x"] + df["right_ankle_x"]) * 0.5
-    shift = df.loc[contact_f, "com_x"] - ankle_mid_x[contact_f]
-    if shift < 0:
-        tips.append("Weight still back at contact – shift onto front leg.")
 
+    # --- 2. Faults: bat speed, hip rotation, weight shift, … ----------------
+    if advice is None:
+        advice = recommend(tip_features(swing))
+    tips.extend(advice["tips"])
     return tips
 
 
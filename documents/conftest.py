@@ -0,0 +1,24 @@
+# conftest.py
+# ---------------------------------------------------------------------------
+# Shared pytest fixtures: synthetic swings from swing_bench (no video, pose
+# model or torch needed), written once per session as CSV + .pose.
+# ---------------------------------------------------------------------------
+
+import pytest
+
+import swing_bench
+from com_velo_parser import load_com_velo_csv
+
+SWING_LENGTHS = [60, 240, 600]
+
+
+@pytest.fixture(scope="session")
+def swing_files(tmp_path_factory):
+    """frames → {"csv": Path, "pose": Path} for each of SWING_LENGTHS."""
+    return swing_bench.write_fixtures(tmp_path_factory.mktemp("swings"), SWING_LENGTHS)
+
+
+@pytest.fixture(params=SWING_LENGTHS)
+def swing_df(request, swing_files):
+    """A fresh load_com_velo_csv DataFrame per test (callers may mutate it)."""
+    return load_com_velo_csv(swing_files[request.param]["csv"])
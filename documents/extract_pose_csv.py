@@ -12,127 +12,578 @@ frame,keypoints,COM,velocity,foot_contact,time
 • `foot_contact` dummy placeholder for later logic
 • `time` left blank (fill with timestamp if you capture it)
 
+Optionally (--bin) the same track is also written as a binary .pose file
+(see pose_store) with typed keypoint / confidence / COM / velocity / time
+arrays that load_com_velo_csv memory‑maps instead of parsing.
+
+With --every K (keyframe mode) the network only runs on every K‑th frame;
+keypoints in between are carried forward with optical flow, inference
+turns dense whenever the hands move fast, and the window around peak wrist
+speed is always re‑inferred – meant for high‑frame‑rate clips.
+
 Usage
 ------
-python extract_pose_csv.py --video swing.mp4 --out swing_com_velo.csv
+python extract_pose_csv.py --video swing.mp4 --out swing_com_velo.csv [--bin swing.pose]
+python extract_pose_csv.py --video swing240.mov --out swing.csv --every 8
+python extract_pose_csv.py --video swing.mp4 --out swing.csv --backend openvino-s-int8
 """
 import os
 os.environ["KMP_DUPLICATE_LIB_OK"] = "TRUE"
 
-import json, csv, argparse, os, cv2
+import argparse, os, queue, threading, time, cv2
 from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
 import numpy as np
-from ultralytics import YOLO
-import torch.serialization
 
-# Add safe globals for model loading
+import pose_model
+from pose_backends import PoseBackend
+from pose_model import get_model, inference_lock
+from pose_store import write_pose
+from pose_track import KEYPOINTS, TrackBuilder, write_pose_csv
+import telemetry
+
+# ------- pipeline stages --------------------------------------------------- #
+_DONE = object()           # end‑of‑stream marker passed between stages
+
+
+class StageStats:
+    """Frames handled and busy seconds (queue waits excluded) for one stage."""
+
+    __slots__ = ("name", "frames", "busy")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.frames = 0
+        self.busy = 0.0
+
+    @property
+    def fps(self) -> float:
+        return self.frames / self.busy if self.busy > 0 else float("inf")
 
-KEYPOINTS = [
-    "nose", "left_eye", "right_eye", "left_ear", "right_ear",
-    "left_shoulder", "right_shoulder", "left_elbow", "right_elbow",
-    "left_wrist", "right_wrist", "left_hip", "right_hip",
-    "left_knee", "right_knee", "left_ankle", "right_ankle",
-]
+    def as_dict(self) -> dict:
+        return {"frames": self.frames, "seconds": round(self.busy, 4), "fps": round(self.fps, 2)}
 
-def main(video: Path, out_csv: Path, conf_thr: float = .6):
-    # Load model with weights_only=True to avoid pickle compatibility issues
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """Blocking put that gives up once *stop* is set (downstream failed)."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _decode(cap, frames_q: queue.Queue, stats: StageStats, stop: threading.Event):
+    """Stage 1: read frames from the already‑open capture into a bounded queue."""
     try:
-        print("Attempting to load model with weights_only=True...")
-        model = YOLO("yolov8m-pose.pt", task='pose', weights_only=True)
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            ok, frame = cap.read()
+            stats.busy += time.perf_counter() - t0
+            if not ok:
+                break
+            stats.frames += 1
+            if not _put(frames_q, frame, stop):
+                return
     except Exception as e:
-        print(f"Failed with weights_only=True: {str(e)}")
+        _put(frames_q, e, stop)
+    _put(frames_q, _DONE, stop)
+
+
+def _best_person(result) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Pick the person with the largest bbox → (box (4,), xy (17, 2), conf (17,)) or None."""
+    best = None
+    max_area = 0
+    for box, kpts, confs in zip(
+        result.boxes.xyxy.cpu().numpy(),
+        result.keypoints.xy.cpu().numpy(),
+        result.keypoints.conf.cpu().numpy(),
+    ):
+        x1, y1, x2, y2 = box
+        area = (x2 - x1) * (y2 - y1)
+        if area > max_area:
+            max_area = area
+            best = (box, kpts, confs)
+    return best
+
+
+class _Detector:
+    """
+    Stage 2: batched inference.
+
+    With *roi=True* the batter is tracked: once found, each following batch
+    is cropped to the last box expanded by *roi_margin* (fraction of the box
+    size per side) and inferred at the smaller *roi_imgsz*.  A frame falls
+    back to full‑frame detection when nobody is found in the crop, the mean
+    keypoint confidence drops below *roi_min_conf*, or the box touches a
+    crop edge that isn't the frame edge (the person is leaving the crop).
+    """
+
+    def __init__(
+        self,
+        model,
+        conf_thr: float,
+        roi: bool = False,
+        roi_margin: float = 0.5,
+        roi_imgsz: int = 320,
+        roi_min_conf: float = 0.5,
+    ):
+        self.model = model
+        self.conf_thr = conf_thr
+        self.roi = roi
+        self.roi_margin = roi_margin
+        self.roi_imgsz = roi_imgsz
+        self.roi_min_conf = roi_min_conf
+        self.box: Optional[np.ndarray] = None
+        self.roi_frames = 0
+        self.fallbacks = 0
+
+    def _full(self, frames: list) -> list:
+        results = self.model.predict(frames, conf=self.conf_thr, verbose=False)
+        return [_best_person(r) for r in results]
+
+    def _window(self, shape) -> Tuple[int, int, int, int]:
+        h, w = shape[:2]
+        x1, y1, x2, y2 = self.box
+        mx = (x2 - x1) * self.roi_margin
+        my = (y2 - y1) * self.roi_margin
+        return (max(0, int(x1 - mx)), max(0, int(y1 - my)),
+                min(w, int(x2 + mx) + 1), min(h, int(y2 + my) + 1))
+
+    def _accept(self, best, window, shape) -> bool:
+        if best is None or float(np.mean(best[2])) < self.roi_min_conf:
+            return False
+        h, w = shape[:2]
+        wx1, wy1, wx2, wy2 = window
+        bx1, by1, bx2, by2 = best[0]
+        edge = 2.0
+        return not (
+            (wx1 > 0 and bx1 - wx1 < edge) or (wy1 > 0 and by1 - wy1 < edge)
+            or (wx2 < w and wx2 - bx2 < edge) or (wy2 < h and wy2 - by2 < edge)
+        )
+
+    def infer(self, frames: list) -> list:
+        """Frames → [(box, xy, conf) or None] in full‑frame pixel coordinates."""
+        if not self.roi or self.box is None:
+            picks = self._full(frames)
+        else:
+            window = self._window(frames[0].shape)
+            x1, y1, x2, y2 = window
+            crops = [np.ascontiguousarray(f[y1:y2, x1:x2]) for f in frames]
+            results = self.model.predict(
+                crops, conf=self.conf_thr, imgsz=self.roi_imgsz, verbose=False
+            )
+            offset = np.array([x1, y1], dtype=np.float32)
+            picks, retry = [], []
+            for i, r in enumerate(results):
+                best = _best_person(r)
+                if best is not None:
+                    box, kpts, confs = best
+                    best = (box + np.tile(offset, 2), kpts + offset, confs)
+                if not self._accept(best, window, frames[i].shape):
+                    retry.append(i)
+                    best = None
+                picks.append(best)
+            self.roi_frames += len(frames) - len(retry)
+            if retry:
+                self.fallbacks += len(retry)
+                for i, best in zip(retry, self._full([frames[i] for i in retry])):
+                    picks[i] = best
+
+        # the next batch is cropped around where this one ended
+        self.box = picks[-1][0] if picks and picks[-1] is not None else None
+        return picks
+
+
+_WRISTS = [KEYPOINTS.index("left_wrist"), KEYPOINTS.index("right_wrist")]
+
+
+class _Propagator:
+    """
+    Stage 2 in keyframe mode: the network runs on every *every*‑th frame and
+    the keypoints in between are carried forward with pyramidal Lucas–Kanade
+    optical flow.  A frame is inferred anyway when
+
+    • a wrist moved more than *motion* × the batter's box height since the
+      previous frame – the fast part of the swing is inferred densely, or
+    • fewer than *min_tracked* of the keyframe's keypoints are still tracked.
+
+    Flow drifts; at each inference the difference between the flowed and the
+    detected keypoints is kept in `drift` so the caller can spread it back
+    over the propagated frames (otherwise every keyframe shows up as a jump
+    in wrist speed).  While nobody is found, detection is retried every
+    *every* frames.
+    """
+
+    def __init__(self, detector: _Detector, every: int, motion: float = 0.02,
+                 min_tracked: float = 0.6):
+        self.detector = detector
+        self.every = every
+        self.motion = motion
+        self.min_tracked = min_tracked
+        self.prev_gray: Optional[np.ndarray] = None
+        self.xy: Optional[np.ndarray] = None          # last keypoints, NaN where lost
+        self.conf: Optional[np.ndarray] = None
+        self.height = 1.0
+        self.key_points = 0
+        self.since = every                            # frames since the last inference
+        self.drift: Optional[np.ndarray] = None       # detected − flowed, (17, 2)
+        self.counts = {"inferred": 0, "propagated": 0, "motion": 0, "lost": 0}
+
+    def _detect(self, frame: np.ndarray, gray: np.ndarray, flowed: Optional[np.ndarray]):
+        best = self.detector.infer([frame])[0]
+        self.counts["inferred"] += 1
+        self.since = 0
+        self.prev_gray = gray
+        self.drift = None
+        if best is None:
+            self.xy = None
+            return None
+        box, xy, conf = best
+        self.xy = np.where((conf >= self.detector.conf_thr)[:, None], xy, np.nan).astype(np.float32)
+        if flowed is not None:
+            self.drift = np.nan_to_num(self.xy - flowed)
+        self.conf = conf.astype(np.float32)
+        self.height = max(float(box[3] - box[1]), 1.0)
+        self.key_points = int(np.isfinite(self.xy[:, 0]).sum())
+        return xy, conf
+
+    def _track(self, gray: np.ndarray):
+        """Flow the current keypoints into *gray* → (xy, conf, motion) or None if lost."""
+        live = np.flatnonzero(np.isfinite(self.xy[:, 0]))
+        if len(live) == 0:
+            return None
+        p1, status, _ = cv2.calcOpticalFlowPyrLK(
+            self.prev_gray, gray, self.xy[live].reshape(-1, 1, 2), None,
+            winSize=(21, 21), maxLevel=3,
+        )
+        p1 = p1.reshape(-1, 2)
+        h, w = gray.shape[:2]
+        ok = status.ravel().astype(bool) & (p1 >= 0).all(1) & (p1[:, 0] < w) & (p1[:, 1] < h)
+        if ok.sum() < self.min_tracked * self.key_points:
+            return None
+
+        xy = np.full_like(self.xy, np.nan)
+        conf = np.zeros_like(self.conf)
+        kept = live[ok]
+        xy[kept] = p1[ok]
+        conf[kept] = self.conf[kept]
+        moved = [np.hypot(*(xy[i] - self.xy[i])) for i in _WRISTS if i in kept]
+        return xy, conf, (max(moved) / self.height if moved else 0.0)
+
+    def step(self, frame: np.ndarray) -> Tuple[Optional[Tuple[np.ndarray, np.ndarray]], bool]:
+        """One frame → ((xy, conf) or None, whether the network ran on it)."""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if self.xy is None and self.since + 1 < self.every:
+            self.since += 1                           # nobody in view yet
+            return None, False
+        tracked = self._track(gray) if self.xy is not None else None
+        if self.since + 1 < self.every:
+            if tracked is None:
+                self.counts["lost"] += 1
+            elif tracked[2] > self.motion:
+                self.counts["motion"] += 1
+            else:
+                self.xy, self.conf, _ = tracked
+                self.prev_gray = gray
+                self.since += 1
+                self.counts["propagated"] += 1
+                return (self.xy, self.conf), False
+        return self._detect(frame, gray, tracked[0] if tracked is not None else None), True
+
+
+def _peak_window(picks: list, conf_thr: float, half: int) -> Optional[Tuple[int, int]]:
+    """Frames [start, stop) within *half* frames of the fastest wrist motion."""
+    if len(picks) < 2:
+        return None
+    wrists = np.full((len(picks), len(_WRISTS), 2), np.nan)
+    for i, best in enumerate(picks):
+        if best is not None:
+            xy, conf = best
+            wrists[i] = np.where((conf[_WRISTS] >= conf_thr)[:, None], xy[_WRISTS], np.nan)
+    d = np.diff(wrists, axis=0)
+    speed = np.nan_to_num(np.hypot(d[..., 0], d[..., 1]), nan=-1.0).max(axis=1)
+    if speed.max() < 0:
+        return None
+    peak = int(speed.argmax()) + 1
+    return max(0, peak - half), min(len(picks), peak + half + 1)
+
+
+def _refine_peak(video: Path, picks: list, inferred: list, detector: _Detector,
+                 window: Tuple[int, int], batch_size: int, stats: "StageStats") -> int:
+    """
+    Re‑infer (full frame) every propagated frame in *window*, in place
+    → number of frames re‑inferred.  The clip is reopened and seeked, so no
+    frames have to be held back during the first pass.
+    """
+    todo = [i for i in range(*window) if not inferred[i]]
+    if not todo:
+        return 0
+    cap = cv2.VideoCapture(str(video))
+    try:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, todo[0])
+        wanted, batch = set(todo), []
+        for i in range(todo[0], todo[-1] + 1):
+            ok, frame = cap.read()
+            if not ok:
+                break
+            if i in wanted:
+                batch.append((i, frame))
+            if len(batch) == batch_size or (batch and i == todo[-1]):
+                t0 = time.perf_counter()
+                results = detector._full([f for _, f in batch])
+                stats.busy += time.perf_counter() - t0
+                stats.frames += len(batch)
+                for (j, _), best in zip(batch, results):
+                    picks[j] = None if best is None else best[1:]
+                    inferred[j] = True
+                batch = []
+    finally:
+        cap.release()
+    return sum(inferred[i] for i in todo)
+
+
+def _postprocess(post_q: queue.Queue, track: TrackBuilder, stats: StageStats, errors: list,
+                 on_frame: Optional[Callable] = None, total: Optional[int] = None):
+    """Drain detections from the inference stage into *track*."""
+    fps = 1.0 / track.dt
+    while True:
+        best = post_q.get()
+        if best is _DONE:
+            return
+        if errors:
+            continue                     # keep draining so inference never blocks
+        t0 = time.perf_counter()
         try:
-            print("Trying alternative loading method...")
-            # Try compatibility mode for ultralytics models
-            import torch
-            torch.hub._validate_not_a_forked_repo = lambda a, b, c: True
-            model = YOLO("yolov8m-pose.pt", task='pose')
-        except Exception as e2:
-            print(f"Alternative method also failed: {str(e2)}")
-            # Final fallback - try using the public model from Ultralytics
-            print("Using fallback to public model...")
-            model = YOLO("yolov8m-pose.yaml")  # Load model architecture
-            model = YOLO("https://github.com/ultralytics/assets/releases/download/v0.0.0/yolov8m-pose.pt")  # Download official weights
-    
-    # Use CPU if CUDA not available
-    device = "cuda" if torch.cuda.is_available() else "cpu"
-    print(f"Using device: {device}")
-    model.to(device)
+            track.add(best)
+        except Exception as e:
+            errors.append(e)
+        stats.busy += time.perf_counter() - t0
+        stats.frames += 1
+        if on_frame is not None and not errors:
+            try:
+                on_frame(stats.frames - 1, total, fps, track.kp_rows[-1],
+                         track.com_rows[-1], track.vel_rows[-1])
+            except Exception as e:
+                # a broken progress consumer must not fail the extraction
+                print(f"on_frame callback failed, disabled: {str(e)}")
+                on_frame = None
+
+
+def _infer_all(frames_q: queue.Queue, post_q: queue.Queue, detector: _Detector,
+               batch_size: int, stats: StageStats) -> None:
+    """Stage 2: batched inference on every frame."""
+    done = False
+    while not done:
+        batch = []
+        while len(batch) < batch_size:
+            item = frames_q.get()
+            if item is _DONE:
+                done = True
+                break
+            if isinstance(item, Exception):
+                raise item
+            batch.append(item)
+        if not batch:
+            break
+
+        t0 = time.perf_counter()
+        picks = detector.infer(batch)
+        stats.busy += time.perf_counter() - t0
+        stats.frames += len(batch)
+
+        for best in picks:
+            post_q.put(None if best is None else best[1:])
+
+
+def _propagate_all(frames_q: queue.Queue, propagator: _Propagator,
+                   stats: Dict[str, StageStats]) -> Tuple[list, list]:
+    """Stage 2, keyframe mode → (picks, inferred) for the whole clip."""
+    picks, inferred = [], []
+    last_key = None
+    while True:
+        item = frames_q.get()
+        if item is _DONE:
+            break
+        if isinstance(item, Exception):
+            raise item
+        t0 = time.perf_counter()
+        best, ran = propagator.step(item)
+        st = stats["infer" if ran else "track"]
+        st.busy += time.perf_counter() - t0
+        st.frames += 1
+        picks.append(best)
+        inferred.append(ran)
+        if ran:
+            i = len(picks) - 1
+            if propagator.drift is not None and last_key is not None and i - last_key > 1:
+                # spread the flow drift linearly over the frames since the last keyframe
+                span_ = i - last_key
+                for j in range(last_key + 1, i):
+                    if picks[j] is not None:
+                        xy, conf = picks[j]
+                        picks[j] = (xy + propagator.drift * ((j - last_key) / span_), conf)
+            last_key = i
+    return picks, inferred
+
+
+def extract_pose(
+    video: Path,
+    conf_thr: float = .6,
+    out_csv: Optional[Path] = None,
+    out_bin: Optional[Path] = None,
+    batch_size: int = 8,
+    queue_size: int = 64,
+    roi: bool = False,
+    roi_imgsz: int = 320,
+    keyframe_every: int = 1,
+    motion: float = 0.02,
+    dense_window_s: float = 0.15,
+    on_frame: Optional[Callable] = None,
+) -> Tuple[Dict[str, np.ndarray], dict]:
+    """
+    Run pose inference on *video* and return (arrays, meta) in memory –
+    the same typed arrays pose_store writes, plus a per‑frame `detected`
+    mask.  Feed them to com_velo_parser.frame_from_pose for the DataFrame.
+    Writing the CSV / .pose file is an optional side effect.
+
+    The video is opened once and processed as a three‑stage pipeline:
+    decode thread → bounded queue → batched inference (*batch_size* frames
+    per predict call) → post‑processing thread.  Per‑stage throughput is
+    printed and returned in meta["stages"].
+
+    *roi=True* enables tracking mode (see _Detector): after the batter is
+    first found, frames are cropped around them and inferred at *roi_imgsz*.
+
+    *keyframe_every > 1* enables keyframe mode (see _Propagator): inference
+    on every K‑th frame and on fast motion, optical flow in between, and
+    afterwards every propagated frame within *dense_window_s* of peak wrist
+    speed is re‑inferred.  The arrays then carry an `inferred` mask.
+
+    *on_frame(index, total, fps, keypoints, com, velocity)* is called from
+    the post‑processing thread as each frame is added to the track (in
+    keyframe mode only after the clip, once propagation is final); *total*
+    is the container's frame count or None, *fps* the rate the track is
+    timed with (meta["fps"]).
+    """
+    model = get_model()           # loaded once per process, see pose_model
 
     cap = cv2.VideoCapture(str(video))
     fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
     dt  = 1.0 / fps
 
-    out_csv.parent.mkdir(parents=True, exist_ok=True)
-    with open(out_csv, "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["frame", "keypoints", "COM", "velocity", "foot_contact", "time"])
-
-        prev_com = None
-        frame_idx = 0
-
-        # STREAMING inference: yields one Result per frame
-        for result in model.predict(source=str(video), conf=conf_thr, stream=True):
-            # pick the person with the largest bbox
-            best = None
-            max_area = 0
-            for box, kpts, confs in zip(
-                result.boxes.xyxy.cpu().numpy(),
-                result.keypoints.xy.cpu().numpy(),
-                result.keypoints.conf.cpu().numpy(),
-            ):
-                x1, y1, x2, y2 = box
-                area = (x2 - x1) * (y2 - y1)
-                if area > max_area:
-                    max_area = area
-                    best = (kpts, confs)
-
-            if best is None:
-                writer.writerow([frame_idx, "{}", "(None,None)", "(0.0,0.0)", "{}", ""])
-                frame_idx += 1
-                continue
-
-            kpts_xy, confs = best
-            named = {
-                name: [float(x), float(y)]
-                for name, (x, y), c in zip(KEYPOINTS, kpts_xy, confs)
-                if c >= conf_thr
-            }
-
-            # compute COM (midpoint of hips)
-            if {"left_hip", "right_hip"} <= named.keys():
-                x1, y1 = named["left_hip"]
-                x2, y2 = named["right_hip"]
-                com = ((x1 + x2) / 2.0, (y1 + y2) / 2.0)
-            else:
-                com = (None, None)
+    keyframes = keyframe_every > 1
+    stages = ("decode", "infer", "track", "post") if keyframes else ("decode", "infer", "post")
+    stats = {name: StageStats(name) for name in stages}
+    frames_q: queue.Queue = queue.Queue(maxsize=queue_size)
+    post_q: queue.Queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    errors: list = []
+    track = TrackBuilder(conf_thr, dt)
+    detector = _Detector(model, conf_thr, roi=roi, roi_imgsz=roi_imgsz)
 
-            # compute velocity ΔCOM / dt
-            if prev_com and None not in (*com, *prev_com):
-                vx = (com[0] - prev_com[0]) / dt
-                vy = (com[1] - prev_com[1]) / dt
+    decoder = threading.Thread(
+        target=_decode, args=(cap, frames_q, stats["decode"], stop), daemon=True
+    )
+    post = threading.Thread(
+        target=_postprocess, daemon=True,
+        args=(post_q, track, stats["post"], errors, on_frame,
+              int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or None),
+    )
+    decoder.start()
+    post.start()
+
+    try:
+        # The shared model is held for the whole clip so concurrent requests
+        # never interleave.
+        with inference_lock:
+            if not keyframes:
+                _infer_all(frames_q, post_q, detector, batch_size, stats["infer"])
             else:
-                vx, vy = 0.0, 0.0
-            prev_com = com
+                propagator = _Propagator(detector, keyframe_every, motion=motion)
+                picks, inferred = _propagate_all(frames_q, propagator, stats)
+                window = _peak_window(picks, conf_thr, max(1, round(dense_window_s * fps)))
+                refined = 0
+                if window is not None:
+                    refined = _refine_peak(video, picks, inferred, detector, window,
+                                           batch_size, stats["infer"])
+                for best in picks:
+                    post_q.put(best)
+    finally:
+        stop.set()
+        post_q.put(_DONE)
+        post.join()
+        decoder.join()
+        cap.release()
+
+    if errors:
+        raise errors[0]
+
+    arrays = track.arrays()
+    n = len(track.detected)
+    meta = dict(
+        fps=fps, conf_thr=conf_thr, source=Path(video).name,
+        stages={name: st.as_dict() for name, st in stats.items()},
+    )
+    if keyframes:
+        arrays["inferred"] = np.asarray(inferred, dtype=bool)
+        meta["keyframes"] = {
+            "every": keyframe_every,
+            **propagator.counts,
+            "refined": refined,
+            "dense_window": list(window) if window is not None else None,
+        }
+    if roi:
+        meta["roi"] = {"cropped_frames": detector.roi_frames, "fallbacks": detector.fallbacks}
+
+    telemetry.FRAMES.inc(n)
+    telemetry.FRAMES_INFERRED.inc(stats["infer"].frames)
+    for st in stats.values():
+        if st.busy > 0:
+            telemetry.PIPELINE_FPS.labels(st.name).set(st.fps)
+
+    slowest = min(stats.values(), key=lambda st: st.fps)
+    print(" | ".join(f"{st.name} {st.fps:.1f} fps" for st in stats.values())
+          + f" → bottleneck: {slowest.name}")
+
+    if out_csv is not None:
+        write_pose_csv(out_csv, arrays)
+        print(f"✅ Saved {n} frames → {Path(out_csv).resolve()}")
+    if out_bin is not None:
+        write_pose(out_bin, arrays, **meta)
+        print(f"✅ Saved {n} frames → {Path(out_bin).resolve()}")
 
-            writer.writerow([
-                frame_idx,
-                json.dumps(named, separators=(",", ":")),
-                json.dumps(com),
-                json.dumps((vx, vy)),
-                json.dumps({"front": False, "back": False}),
-                ""
-            ])
+    return arrays, meta
 
-            frame_idx += 1
 
-    cap.release()
-    print(f"✅ Saved {frame_idx} frames → {out_csv.resolve()}")
+def main(
+    video: Path,
+    out_csv: Path,
+    conf_thr: float = .6,
+    out_bin: Optional[Path] = None,
+    batch_size: int = 8,
+    roi: bool = False,
+    keyframe_every: int = 1,
+    backend: Optional[str] = None,
+):
+    if backend:
+        pose_model.configure(PoseBackend.parse(backend))
+    extract_pose(video, conf_thr=conf_thr, out_csv=out_csv, out_bin=out_bin,
+                 batch_size=batch_size, roi=roi, keyframe_every=keyframe_every)
 
 if __name__ == "__main__":
     p = argparse.ArgumentParser()
     p.add_argument("--video", required=True, type=Path)
     p.add_argument("--out",   required=True, type=Path)
     p.add_argument("--conf",  type=float, default=0.6)
+    p.add_argument("--bin",   type=Path, default=None, help="also write a binary .pose file")
+    p.add_argument("--batch", type=int, default=8, help="frames per inference call")
+    p.add_argument("--roi",   action="store_true", help="crop around the batter once found")
+    p.add_argument("--every", type=int, default=1, help="infer every K frames, optical flow in between")
+    p.add_argument("--backend", default=None,
+                   help="model variant, e.g. torch-m, onnx-s, openvino-n-int8 (default: POSE_BACKEND env)")
     args = p.parse_args()
-    main(args.video, args.out, conf_thr=args.conf)
+    main(args.video, args.out, conf_thr=args.conf, out_bin=args.bin,
+         batch_size=args.batch, roi=args.roi, keyframe_every=args.every, backend=args.backend)
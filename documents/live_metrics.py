@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+live_metrics.py
+~~~~~~~~~~~~~~~
+`metrics.enrich_and_measure`, computed online while frames arrive.
+
+`LiveSwingMetrics.push()` takes one frame at a time (keypoints, COM,
+velocity – what extract_pose's track builder produces) and keeps
+
+• the running peak lead‑wrist speed – the same Savitzky–Golay smoothing as
+  peak_wrist_speed, run over a 5‑frame ring buffer of position diffs, so
+  interior frames are final two frames after they arrive,
+• the contact candidate (peak COM speed so far) and the keypoints there,
+• hip / shoulder rotation, separation, lead‑elbow angle and bat lag at
+  that candidate.
+
+`snapshot()` is cheap and JSON‑safe (NaN → None); once the last frame is
+in it equals enrich_and_measure on the whole track.
+"""
+
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+from batch_metrics import _DEFAULT_SPEED_PX_S, _SG_COEFFS, _SG_EDGE, _SG_WINDOW
+from com_velo_parser import _KP_INDEX, px_s_to_mph
+from metrics import _angle
+
+_HALF = _SG_WINDOW // 2
+_FILTER = _SG_COEFFS[::-1]           # applied to the ring buffer, oldest first
+
+
+def _json_safe(value):
+    if isinstance(value, (np.integer, int)):
+        return int(value)
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+
+class LiveSwingMetrics:
+    """
+    Incremental swing metrics for one clip.
+
+    side / fps / shoulder_in as for enrich_and_measure; pass the clip's frame
+    rate, as analyse_video does, to get the numbers analyse_swing reports.
+    """
+
+    def __init__(self, side: str = "Right", fps: float = 30.0, shoulder_in: float = 16.0):
+        self.side = side
+        self.fps = fps
+        self.shoulder_in = shoulder_in
+        lefty = side.lower().startswith("l")
+        kp = _KP_INDEX
+        self.wrist = kp["left_wrist" if lefty else "right_wrist"]
+        self.trail_wrist = kp["right_wrist" if lefty else "left_wrist"]
+        self.lead_elbow = kp["left_elbow" if lefty else "right_elbow"]
+        self.lead_shoulder = kp["left_shoulder" if lefty else "right_shoulder"]
+
+        self.frames = 0
+        self.shoulder_px = np.nan                  # first frame, like SwingAnalysis
+        # wrist diffs: the first window (for the leading edge) and the latest one
+        self._head: list = []
+        self._ring: deque = deque(maxlen=_SG_WINDOW)
+        self._last_pos: Optional[np.ndarray] = None
+        self._seen_wrist = False
+        self._peak = (-np.inf, 0)                  # (px/frame, frame) over final frames
+        # contact candidate
+        self._contact_speed = -np.inf
+        self.contact_frame = 0
+        self._contact_kp: Optional[np.ndarray] = None
+
+    # ------------------------------------------------------------------ #
+    def push(self, keypoints: np.ndarray, com=None, velocity=None) -> None:
+        """
+        Add the next frame: keypoints (17, 2) with NaN where missing, the COM
+        velocity (vx, vy) in px/s (NaN → 0, as the `speed` column).
+        """
+        t = self.frames
+        keypoints = np.asarray(keypoints, dtype=float)
+        if t == 0:
+            self.shoulder_px = float(np.linalg.norm(
+                keypoints[_KP_INDEX["left_shoulder"]] - keypoints[_KP_INDEX["right_shoulder"]]))
+
+        # ---- contact candidate = peak COM speed (first one wins) -------- #
+        vx, vy = (0.0, 0.0) if velocity is None else np.nan_to_num(np.asarray(velocity, dtype=float))
+        speed = float(np.hypot(vx, vy))
+        if speed > self._contact_speed:
+            self._contact_speed = speed
+            self.contact_frame = t
+            self._contact_kp = keypoints.copy()
+
+        # ---- wrist diff (ffill; leading gaps count as no motion) -------- #
+        pos = keypoints[self.wrist]
+        if np.isfinite(pos).all():
+            d = pos - self._last_pos if self._last_pos is not None else np.zeros(2)
+            self._last_pos = pos
+            self._seen_wrist = True
+        else:
+            d = np.zeros(2)
+        self._ring.append(d)
+        if len(self._head) < _SG_WINDOW:
+            self._head.append(d)
+
+        self.frames += 1
+        n = self.frames
+        if n == _SG_WINDOW:
+            # the first half‑window is a polynomial fit of the first window
+            for j, v in enumerate(_SG_EDGE[:_HALF] @ np.array(self._head)):
+                self._offer(float(np.hypot(*v)), j)
+        if n >= _SG_WINDOW:
+            v = _FILTER @ np.array(self._ring)
+            self._offer(float(np.hypot(*v)), n - 1 - _HALF)
+
+    def _offer(self, speed: float, frame: int) -> None:
+        if speed > self._peak[0]:
+            self._peak = (speed, frame)
+
+    # ------------------------------------------------------------------ #
+    def peak_wrist(self) -> tuple:
+        """(frame, px/s) of peak lead‑wrist speed so far, as peak_wrist_speed."""
+        n = self.frames
+        if n < 2 or not self._seen_wrist:
+            return 0, _DEFAULT_SPEED_PX_S
+        if n < _SG_WINDOW:                        # too short to smooth
+            ring = np.array(self._ring)
+            speeds = np.hypot(ring[:, 0], ring[:, 1])
+            return int(speeds.argmax()), float(speeds.max()) * self.fps
+        best = self._peak
+        # the trailing half‑window isn't final yet – fit it from the latest window
+        for j, v in enumerate(_SG_EDGE[-_HALF:] @ np.array(self._ring)):
+            s = float(np.hypot(*v))
+            if s > best[0]:
+                best = (s, n - _HALF + j)
+        return best[1], best[0] * self.fps
+
+    def snapshot(self) -> dict:
+        """Current metrics – enrich_and_measure keys plus `frames`."""
+        contact_f = self.contact_frame
+        peak_f, speed_px_s = self.peak_wrist()
+        shoulder_px = self.shoulder_px
+        if np.isnan(shoulder_px):
+            hand_mph, peak_speed_f = 60.0, contact_f
+        elif shoulder_px > 0 and self.shoulder_in > 0:
+            hand_mph = px_s_to_mph(speed_px_s, shoulder_px / self.shoulder_in)
+            peak_speed_f = peak_f
+        else:
+            hand_mph, peak_speed_f = 65.0, contact_f
+        if np.isnan(hand_mph):
+            hand_mph = 55.0
+
+        out = dict(
+            frames=self.frames,
+            peak_hand_speed_mph=hand_mph,
+            peak_hand_speed_frame=peak_speed_f,
+            time_peak_to_contact_ms=abs(contact_f - peak_speed_f) / self.fps * 1000,
+            contact_frame=contact_f,
+        )
+
+        kp = self._contact_kp
+        if kp is None:
+            return {k: _json_safe(v) for k, v in out.items()}
+        at = lambda name: kp[_KP_INDEX[name]]
+        hip_vec = at("right_hip") - at("left_hip")
+        sh_vec = at("right_shoulder") - at("left_shoulder")
+        hip_rot = np.degrees(np.arctan2(hip_vec[1], hip_vec[0]))
+        sh_rot = np.degrees(np.arctan2(sh_vec[1], sh_vec[0]))
+        p_s = kp[self.lead_shoulder]
+        out.update(
+            hip_rot_deg=hip_rot,
+            shoulder_rot_deg=sh_rot,
+            hip_shoulder_separation_deg=abs(((sh_rot - hip_rot + 180) % 360) - 180),
+            lead_elbow_angle_deg=_angle(p_s, kp[self.lead_elbow], kp[self.wrist]),
+            bat_lag_deg=_angle(p_s, kp[self.trail_wrist], at("nose")),
+        )
+        return {k: _json_safe(v) for k, v in out.items()}
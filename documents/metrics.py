@@ -2,10 +2,14 @@
 #  metrics helpers – drop this at the end of com_velo_parser.py
 #  or place in metrics.py  (then:  from metrics import enrich_and_measure)
 # ---------------------------------------------------------------------------
+import logging
+
 import numpy as np
-from com_velo_parser import peak_wrist_speed, find_contact_frame
+from com_velo_parser import SwingAnalysis
 DEG = 180 / np.pi
 
+log = logging.getLogger(__name__)
+
 def _angle(a, b, c):
     """∠ABC in degrees (vectors BA and BC)."""
     ba = a - b
@@ -17,79 +21,54 @@ def _angle(a, b, c):
 def enrich_and_measure(df, side="Right", fps=30.0, shoulder_in=16.0):
     """
     Returns a dict of measured swing metrics suitable for ChatGPT prompts.
-    Works with YOUR existing DataFrame structure.
+    Works with YOUR existing DataFrame structure, or a SwingAnalysis built
+    from it (then its side / fps are used and nothing is recomputed).
     """
-    print(f"DEBUG: Starting enrich_and_measure with side={side}, shoulder_in={shoulder_in}")
-    
-    wrist_kp = "left_wrist" if side.lower().startswith("l") else "right_wrist"
-    trail_wrist = "right_wrist" if side.lower().startswith("l") else "left_wrist"
-    lead_elbow = "left_elbow" if side.lower().startswith("l") else "right_elbow"
-    lead_shldr = "left_shoulder" if side.lower().startswith("l") else "right_shoulder"
+    swing = SwingAnalysis.of(df, side=side, fps=fps)
+    side, fps = swing.side, swing.fps
+    log.debug("Starting enrich_and_measure with side=%s, shoulder_in=%s", side, shoulder_in)
+
+    wrist_kp = swing.wrist_kp
+    trail_wrist = swing.trail_wrist
+    lead_elbow = swing.lead_elbow
+    lead_shldr = swing.lead_shoulder
 
     # ------------------------------------------------------------------ #
     # 1. Peak hand speed  (px/s → mph via shoulder-width heuristic)
     # ------------------------------------------------------------------ #
     try:
-        # Get shoulder positions - use direct access to avoid Series subtraction issues
-        l_shoulder_x = float(df.loc[0, "left_shoulder_x"])
-        l_shoulder_y = float(df.loc[0, "left_shoulder_y"])
-        r_shoulder_x = float(df.loc[0, "right_shoulder_x"])
-        r_shoulder_y = float(df.loc[0, "right_shoulder_y"])
-        
-        print(f"DEBUG: Left shoulder: ({l_shoulder_x}, {l_shoulder_y})")
-        print(f"DEBUG: Right shoulder: ({r_shoulder_x}, {r_shoulder_y})")
-        
+        shoulder_px = swing.shoulder_px
+        log.debug("Shoulder width in pixels: %s", shoulder_px)
+        log.debug("User shoulder width in inches: %s", shoulder_in)
+
         # Check if any shoulder data is missing or NaN
-        if (np.isnan(l_shoulder_x) or np.isnan(l_shoulder_y) or 
-            np.isnan(r_shoulder_x) or np.isnan(r_shoulder_y)):
-            print("DEBUG: Warning - missing shoulder data, using default speed")
+        if np.isnan(shoulder_px):
+            log.warning("Missing shoulder data, using default speed")
             hand_speed_mph = 60.0  # Default value if shoulder data missing
-            peak_speed_f = find_contact_frame(df)  # Use contact frame as fallback
-        else:
-            # Calculate shoulder width using explicit coordinates
-            dx = l_shoulder_x - r_shoulder_x
-            dy = l_shoulder_y - r_shoulder_y
-            shoulder_px = np.sqrt(dx*dx + dy*dy)
-            
-            print(f"DEBUG: Shoulder width in pixels: {shoulder_px}")
-            print(f"DEBUG: User shoulder width in inches: {shoulder_in}")
-            
-            # Ensure we have valid values
-            if shoulder_px > 0 and shoulder_in > 0:
-                px_per_inch = shoulder_px / shoulder_in
-                print(f"DEBUG: Pixels per inch: {px_per_inch}")
-                
-                w = peak_wrist_speed(df, wrist=wrist_kp, fps=fps, px_per_inch=px_per_inch)
-                print(f"DEBUG: Wrist speed data: {w}")
-                
-            hand_speed_mph = w["speed_mph"]
+            peak_speed_f = swing.contact_frame  # Use contact frame as fallback
+        elif shoulder_px > 0 and shoulder_in > 0:
+            w = swing.wrist_speed
+            log.debug("Wrist speed data: %s", w)
+            hand_speed_mph = swing.wrist_mph(shoulder_in)
             peak_speed_f = w["frame_idx"]
-                
-                # Fallback if hand speed is None
-            if hand_speed_mph is None or np.isnan(hand_speed_mph):
-                print("DEBUG: Hand speed is None, calculating manually")
-                speed_px_s = w["speed_px_s"]
-                hand_speed_mph = speed_px_s / px_per_inch / 12 * 3600 / 5280
-            else:
-                print(f"DEBUG: Invalid values - shoulder_px={shoulder_px}, shoulder_in={shoulder_in}")
-                hand_speed_mph = 65.0  # Default fallback
-                peak_speed_f = find_contact_frame(df)
-    except Exception as e:
-        import traceback
-        print(f"DEBUG ERROR in hand speed calculation: {str(e)}")
-        print(traceback.format_exc())
+        else:
+            log.warning("Invalid values - shoulder_px=%s, shoulder_in=%s", shoulder_px, shoulder_in)
+            hand_speed_mph = 65.0  # Default fallback
+            peak_speed_f = swing.contact_frame
+    except Exception:
+        log.exception("Error in hand speed calculation")
         hand_speed_mph = 55.0  # Fallback default
         peak_speed_f = 0
         
     # Ensure hand_speed_mph is never NaN
     if hand_speed_mph is None or np.isnan(hand_speed_mph):
         hand_speed_mph = 55.0
-        print(f"DEBUG: Using default hand speed of {hand_speed_mph} mph")
+        log.warning("Using default hand speed of %s mph", hand_speed_mph)
 
     # ------------------------------------------------------------------ #
     # 2. Contact frame (heuristic) & timing delta
     # ------------------------------------------------------------------ #
-    contact_f = find_contact_frame(df)
+    contact_f = swing.contact_frame
     time_peak_to_contact_ms = abs(contact_f - peak_speed_f) / fps * 1000
 
     # ------------------------------------------------------------------ #
@@ -97,10 +76,10 @@ def enrich_and_measure(df, side="Right", fps=30.0, shoulder_in=16.0):
     #    measure as the angle of the segment in the XY plane
     # ------------------------------------------------------------------ #
     try:
-        l_hip = df.loc[contact_f, ["left_hip_x", "left_hip_y"]].to_numpy()
-        r_hip = df.loc[contact_f, ["right_hip_x", "right_hip_y"]].to_numpy()
-        l_sh = df.loc[contact_f, ["left_shoulder_x", "left_shoulder_y"]].to_numpy()
-        r_sh = df.loc[contact_f, ["right_shoulder_x", "right_shoulder_y"]].to_numpy()
+        l_hip = swing.point("left_hip")
+        r_hip = swing.point("right_hip")
+        l_sh = swing.point("left_shoulder")
+        r_sh = swing.point("right_shoulder")
 
         hip_vec = r_hip - l_hip
         sh_vec = r_sh - l_sh
@@ -108,7 +87,7 @@ def enrich_and_measure(df, side="Right", fps=30.0, shoulder_in=16.0):
         shoulder_rot_deg = np.degrees(np.arctan2(sh_vec[1], sh_vec[0]))
         hip_sep_deg = abs(((shoulder_rot_deg - hip_rot_deg + 180) % 360) - 180)
     except Exception as e:
-        print(f"DEBUG ERROR in rotation calculation: {str(e)}")
+        log.warning("Error in rotation calculation: %s", e)
         hip_rot_deg = 30.0  # Default values
         shoulder_rot_deg = 45.0
         hip_sep_deg = 15.0
@@ -117,23 +96,23 @@ def enrich_and_measure(df, side="Right", fps=30.0, shoulder_in=16.0):
     # 4. Lead-elbow extension
     # ------------------------------------------------------------------ #
     try:
-        p_s = df.loc[contact_f, [f"{lead_shldr}_x", f"{lead_shldr}_y"]].to_numpy()
-        p_e = df.loc[contact_f, [f"{lead_elbow}_x", f"{lead_elbow}_y"]].to_numpy()
-        p_w = df.loc[contact_f, [f"{wrist_kp}_x", f"{wrist_kp}_y"]].to_numpy()
+        p_s = swing.point(lead_shldr)
+        p_e = swing.point(lead_elbow)
+        p_w = swing.point(wrist_kp)
         lead_elbow_deg = _angle(p_s, p_e, p_w)
     except Exception as e:
-        print(f"DEBUG ERROR in elbow angle calculation: {str(e)}")
+        log.warning("Error in elbow angle calculation: %s", e)
         lead_elbow_deg = 120.0  # Default value
 
     # ------------------------------------------------------------------ #
     # 5. Bat-lag (rough proxy using wrists & nose)
     # ------------------------------------------------------------------ #
     try:
-        nose = df.loc[contact_f, ["nose_x", "nose_y"]].to_numpy()
-        p_t = df.loc[contact_f, [f"{trail_wrist}_x", f"{trail_wrist}_y"]].to_numpy()
+        nose = swing.point("nose")
+        p_t = swing.point(trail_wrist)
         bat_lag_deg = _angle(p_s, p_t, nose)
     except Exception as e:
-        print(f"DEBUG ERROR in bat lag calculation: {str(e)}")
+        log.warning("Error in bat lag calculation: %s", e)
         bat_lag_deg = 90.0  # Default value
 
     result = dict(
@@ -148,5 +127,5 @@ def enrich_and_measure(df, side="Right", fps=30.0, shoulder_in=16.0):
         contact_frame=contact_f,
     )
     
-    print(f"DEBUG: Final metrics result: {result}")
+    log.debug("Final metrics result: %s", result)
     return result
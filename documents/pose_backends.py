@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+pose_backends.py
+~~~~~~~~~~~~~~~~
+Which YOLO‑v8 Pose variant a worker runs, how to build it and how it
+compares with the PyTorch reference.
+
+Workers are CPU‑only, so besides PyTorch (`torch`) the model can run from an
+exported ONNX Runtime (`onnx`) or OpenVINO (`openvino`) artifact, in size
+n / s / m, optionally INT8‑quantised.  A `PoseBackend` names one variant –
+"torch-m", "onnx-s", "openvino-n-int8" – and ultralytics loads every one of
+them behind the same `predict()`, so extract_pose never knows which it got.
+
+Selection (`backend_from_env`, used by pose_model)
+• POSE_BACKEND=torch|onnx|openvino, POSE_MODEL_SIZE=n|s|m, POSE_INT8=1 pin
+  a variant;
+• otherwise POSE_LATENCY_BUDGET_MS picks the most accurate variant whose
+  measured ms/frame fits, from the profile `compare --save-profile` wrote;
+• otherwise torch-m, as before.  POSE_MODEL_WEIGHTS still overrides the
+  PyTorch weights file.
+
+Artifacts live in POSE_MODELS_DIR (default: working directory).  INT8
+OpenVINO export needs `nncf`, INT8 ONNX needs `onnxruntime`; both calibrate
+on frames sampled from --calib clips.
+
+Usage
+------
+python pose_backends.py export  --variants onnx-s-int8 openvino-m-int8 --calib swing1.mp4
+python pose_backends.py compare --clips swing1.mp4 swing2.mp4 --save-profile
+"""
+import os
+os.environ["KMP_DUPLICATE_LIB_OK"] = "TRUE"
+
+import argparse
+import json
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+RUNTIMES = ("torch", "onnx", "openvino")
+SIZES = ("n", "s", "m")
+REFERENCE = "torch-m"
+
+MODELS_DIR = Path(os.environ.get("POSE_MODELS_DIR", "."))
+PROFILE_NAME = "pose_backends.json"
+
+# every variant, most accurate first – compare's default list
+VARIANTS = [f"{rt}-{size}{q}" for size in ("m", "s", "n") for rt in RUNTIMES
+            for q in ("", "-int8") if not (rt == "torch" and q)]
+
+
+class PoseBackend:
+    """One model variant: runtime × size × (INT8 or not)."""
+
+    __slots__ = ("runtime", "size", "int8")
+
+    def __init__(self, runtime: str = "torch", size: str = "m", int8: bool = False):
+        if runtime not in RUNTIMES:
+            raise ValueError(f"unknown pose backend {runtime!r} (one of {', '.join(RUNTIMES)})")
+        if size not in SIZES:
+            raise ValueError(f"unknown model size {size!r} (one of {', '.join(SIZES)})")
+        if int8 and runtime == "torch":
+            raise ValueError("INT8 weights need the onnx or openvino backend")
+        self.runtime = runtime
+        self.size = size
+        self.int8 = int8
+
+    @classmethod
+    def parse(cls, name: str) -> "PoseBackend":
+        """'openvino-s-int8' → PoseBackend('openvino', 's', True)."""
+        parts = name.lower().split("-")
+        int8 = parts[-1] == "int8"
+        if int8:
+            parts = parts[:-1]
+        if len(parts) != 2:
+            raise ValueError(f"bad pose backend name {name!r} (e.g. onnx-s or openvino-m-int8)")
+        return cls(parts[0], parts[1], int8)
+
+    @property
+    def name(self) -> str:
+        return f"{self.runtime}-{self.size}" + ("-int8" if self.int8 else "")
+
+    @property
+    def stem(self) -> str:
+        return f"yolov8{self.size}-pose"
+
+    def __repr__(self) -> str:
+        return f"PoseBackend({self.name!r})"
+
+    def path(self, models_dir: Optional[Path] = None) -> Path:
+        """Where this variant's weights / exported model live."""
+        root = Path(models_dir or MODELS_DIR)
+        if self.runtime == "torch":
+            return root / f"{self.stem}.pt"
+        if self.runtime == "onnx":
+            return root / f"{self.stem}{'-int8' if self.int8 else ''}.onnx"
+        # ultralytics' own naming for OpenVINO export directories
+        return root / f"{self.stem}{'_int8' if self.int8 else ''}_openvino_model"
+
+    def load(self, models_dir: Optional[Path] = None):
+        """Exported variants only – torch weights go through pose_model._load."""
+        from ultralytics import YOLO
+
+        path = self.path(models_dir)
+        if not path.exists():
+            raise FileNotFoundError(
+                f"{path} missing – run: python pose_backends.py export --variants {self.name}"
+            )
+        return YOLO(str(path), task="pose")
+
+
+# ---- selection ----------------------------------------------------------- #
+def load_profile(models_dir: Optional[Path] = None) -> Dict[str, dict]:
+    """The {variant: {ms_per_frame, drift_rel, …}} table written by compare()."""
+    path = Path(models_dir or MODELS_DIR) / PROFILE_NAME
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def choose(budget_ms: float, profile: Dict[str, dict]) -> PoseBackend:
+    """
+    Most accurate profiled variant (lowest keypoint drift) with ms/frame
+    within *budget_ms*; the fastest one if none fits.
+    """
+    if not profile:
+        raise ValueError("no backend profile – run pose_backends.py compare --save-profile")
+    fits = {n: p for n, p in profile.items() if p["ms_per_frame"] <= budget_ms}
+    if fits:
+        name = min(fits, key=lambda n: (fits[n]["drift_rel"], fits[n]["ms_per_frame"]))
+    else:
+        name = min(profile, key=lambda n: profile[n]["ms_per_frame"])
+        print(f"No pose backend fits {budget_ms:.1f} ms/frame, using the fastest: {name}")
+    return PoseBackend.parse(name)
+
+
+def backend_from_env() -> PoseBackend:
+    """POSE_BACKEND / POSE_MODEL_SIZE / POSE_INT8, else POSE_LATENCY_BUDGET_MS, else torch-m."""
+    runtime = os.environ.get("POSE_BACKEND")
+    budget = os.environ.get("POSE_LATENCY_BUDGET_MS")
+    if runtime is None and budget:
+        profile = load_profile()
+        if profile:
+            return choose(float(budget), profile)
+        print("POSE_LATENCY_BUDGET_MS set but no backend profile found, using the default backend")
+    return PoseBackend(
+        (runtime or "torch").lower(),
+        os.environ.get("POSE_MODEL_SIZE", "m").lower(),
+        os.environ.get("POSE_INT8", "0").lower() in ("1", "true", "yes"),
+    )
+
+
+# ---- export -------------------------------------------------------------- #
+def _sample_frames(clips: Sequence[Path], count: int) -> List[np.ndarray]:
+    """Up to *count* BGR frames spread evenly over *clips*."""
+    import cv2
+
+    frames: List[np.ndarray] = []
+    per_clip = max(1, count // max(1, len(clips)))
+    for clip in clips:
+        cap = cv2.VideoCapture(str(clip))
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or per_clip
+        for idx in np.linspace(0, total - 1, min(per_clip, total)).astype(int):
+            cap.set(cv2.CAP_PROP_POS_FRAMES, int(idx))
+            ok, frame = cap.read()
+            if ok:
+                frames.append(frame)
+        cap.release()
+    return frames
+
+
+def _letterbox(frame: np.ndarray, imgsz: int) -> np.ndarray:
+    """BGR frame → (1, 3, imgsz, imgsz) float32 RGB in [0, 1], grey padding."""
+    import cv2
+
+    h, w = frame.shape[:2]
+    r = imgsz / max(h, w)
+    nw, nh = round(w * r), round(h * r)
+    canvas = np.full((imgsz, imgsz, 3), 114, dtype=np.uint8)
+    top, left = (imgsz - nh) // 2, (imgsz - nw) // 2
+    canvas[top:top + nh, left:left + nw] = cv2.resize(frame, (nw, nh), interpolation=cv2.INTER_LINEAR)
+    return np.ascontiguousarray(canvas[:, :, ::-1].transpose(2, 0, 1))[None].astype(np.float32) / 255.0
+
+
+def _calibration_yaml(frames: List[np.ndarray], root: Path) -> Path:
+    """A one‑split ultralytics dataset of *frames* (OpenVINO INT8 calibration)."""
+    import cv2
+
+    images = root / "images"
+    images.mkdir(parents=True, exist_ok=True)
+    for i, frame in enumerate(frames):
+        cv2.imwrite(str(images / f"{i:05d}.jpg"), frame)
+    data = root / "calib.yaml"
+    data.write_text(
+        f"path: {root}\ntrain: images\nval: images\n"
+        "kpt_shape: [17, 3]\nflip_idx: [0, 2, 1, 4, 3, 6, 5, 8, 7, 10, 9, 12, 11, 14, 13, 16, 15]\n"
+        "names:\n  0: person\n"
+    )
+    return data
+
+
+def _quantize_onnx(src: Path, dst: Path, frames: List[np.ndarray], imgsz: int) -> None:
+    """Static INT8 (QDQ, per‑channel weights) calibrated on *frames*."""
+    import onnxruntime
+    from onnxruntime.quantization import (
+        CalibrationDataReader, QuantFormat, QuantType, quantize_static,
+    )
+
+    input_name = onnxruntime.InferenceSession(
+        str(src), providers=["CPUExecutionProvider"]).get_inputs()[0].name
+
+    class _Reader(CalibrationDataReader):
+        def __init__(self):
+            self._it = iter(frames)
+
+        def get_next(self):
+            frame = next(self._it, None)
+            return None if frame is None else {input_name: _letterbox(frame, imgsz)}
+
+    quantize_static(
+        str(src), str(dst), _Reader(),
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+    )
+
+
+def export(
+    backend: PoseBackend,
+    models_dir: Optional[Path] = None,
+    calib: Sequence[Path] = (),
+    calib_frames: int = 128,
+    imgsz: int = 640,
+) -> Path:
+    """Build *backend*'s artifact from the PyTorch weights → its path."""
+    from ultralytics import YOLO
+
+    root = Path(models_dir or MODELS_DIR)
+    root.mkdir(parents=True, exist_ok=True)
+    target = backend.path(root)
+    pt = PoseBackend("torch", backend.size).path(root)
+    # ultralytics downloads the official weights by bare name
+    model = YOLO(str(pt) if pt.exists() else pt.name, task="pose")
+    if backend.runtime == "torch":
+        if not pt.exists():
+            shutil.copy(model.ckpt_path, pt)
+        return pt
+
+    frames = _sample_frames(calib, calib_frames) if calib else []
+    if backend.int8 and backend.runtime == "onnx" and not frames:
+        raise ValueError("INT8 ONNX export needs calibration clips (--calib)")
+
+    with tempfile.TemporaryDirectory() as td:
+        # dynamic input shapes: ROI crops run at a smaller imgsz than full frames
+        if backend.runtime == "onnx":
+            out = Path(model.export(format="onnx", imgsz=imgsz, dynamic=True, simplify=True))
+            if backend.int8:
+                _quantize_onnx(out, target, frames, imgsz)
+                out.unlink()
+                return target
+        else:
+            kw = {}
+            if backend.int8:
+                kw["data"] = str(_calibration_yaml(frames, Path(td))) if frames else "coco8-pose.yaml"
+            out = Path(model.export(format="openvino", imgsz=imgsz, dynamic=True,
+                                    int8=backend.int8, **kw))
+        if out.resolve() != target.resolve():
+            if target.is_dir():
+                shutil.rmtree(target)
+            elif target.exists():
+                target.unlink()
+            shutil.move(str(out), str(target))
+    return target
+
+
+# ---- accuracy vs speed --------------------------------------------------- #
+def _load_variant(backend: PoseBackend, models_dir: Optional[Path]):
+    if backend.runtime == "torch":
+        from ultralytics import YOLO
+        pt = backend.path(models_dir)
+        return YOLO(str(pt) if pt.exists() else pt.name, task="pose")
+    return backend.load(models_dir)
+
+
+def _run(model, frames: List[np.ndarray], conf_thr: float, batch: int):
+    """Detections for *frames* plus seconds spent in predict (after a warm batch)."""
+    from extract_pose_csv import _Detector
+
+    detector = _Detector(model, conf_thr)
+    detector.infer(frames[:batch])
+    picks, busy = [], 0.0
+    for i in range(0, len(frames), batch):
+        t0 = time.perf_counter()
+        picks.extend(detector.infer(frames[i:i + batch]))
+        busy += time.perf_counter() - t0
+    return picks, busy
+
+
+def _drift(reference: list, picks: list, conf_thr: float) -> dict:
+    """Keypoint distance to the reference where both are confident."""
+    dists, rels, missed = [], [], 0
+    for ref, got in zip(reference, picks):
+        if ref is None:
+            continue
+        if got is None:
+            missed += 1
+            continue
+        (box, ref_xy, ref_conf), (_, xy, conf) = ref, got
+        ok = (ref_conf >= conf_thr) & (conf >= conf_thr)
+        d = np.linalg.norm(xy[ok] - ref_xy[ok], axis=1)
+        height = max(float(box[3] - box[1]), 1.0)
+        dists.extend(d.tolist())
+        rels.extend((d / height).tolist())
+    seen = sum(r is not None for r in reference)
+    return {
+        "drift_px": float(np.mean(dists)) if dists else float("nan"),
+        "drift_p95_px": float(np.percentile(dists, 95)) if dists else float("nan"),
+        "drift_rel": float(np.mean(rels)) if rels else float("inf"),
+        "missed": missed / seen if seen else 0.0,
+    }
+
+
+def compare(
+    clips: Sequence[Path],
+    variants: Sequence[str] = VARIANTS,
+    frames: int = 120,
+    batch: int = 8,
+    conf_thr: float = 0.6,
+    models_dir: Optional[Path] = None,
+) -> Dict[str, dict]:
+    """
+    Run each variant on *frames* frames sampled from *clips* → {variant:
+    ms_per_frame, drift_px / drift_p95_px (pixels) and drift_rel (fraction
+    of the person's box height) against torch-m, missed (person lost)}.
+    Variants whose artifact is missing are skipped.
+    """
+    sample = _sample_frames(clips, frames)
+    if not sample:
+        raise ValueError("no frames could be read from the clips")
+
+    ref_model = _load_variant(PoseBackend.parse(REFERENCE), models_dir)
+    reference, _ = _run(ref_model, sample, conf_thr, batch)
+    report = {}
+    for name in variants:
+        backend = PoseBackend.parse(name)
+        try:
+            model = ref_model if backend.name == REFERENCE else _load_variant(backend, models_dir)
+        except FileNotFoundError as e:
+            print(f"skip {name}: {str(e)}")
+            continue
+        picks, busy = _run(model, sample, conf_thr, batch)
+        report[name] = {"ms_per_frame": busy / len(sample) * 1000,
+                        **_drift(reference, picks, conf_thr)}
+    return report
+
+
+def _print_report(report: Dict[str, dict]) -> None:
+    print(f"{'variant':<18}{'ms/frame':>10}{'drift px':>10}{'p95 px':>9}{'drift %h':>10}{'missed':>8}")
+    for name, r in sorted(report.items(), key=lambda kv: kv[1]["ms_per_frame"]):
+        print(f"{name:<18}{r['ms_per_frame']:>10.1f}{r['drift_px']:>10.2f}"
+              f"{r['drift_p95_px']:>9.2f}{r['drift_rel'] * 100:>9.2f}%{r['missed'] * 100:>7.1f}%")
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    sub = p.add_subparsers(dest="cmd", required=True)
+
+    e = sub.add_parser("export", help="build exported / INT8 variants")
+    e.add_argument("--variants", nargs="+", required=True)
+    e.add_argument("--calib", nargs="*", type=Path, default=[], help="clips for INT8 calibration")
+    e.add_argument("--calib-frames", type=int, default=128)
+    e.add_argument("--imgsz", type=int, default=640)
+    e.add_argument("--models-dir", type=Path, default=None)
+
+    c = sub.add_parser("compare", help="speed and keypoint drift vs torch-m")
+    c.add_argument("--clips", nargs="+", required=True, type=Path)
+    c.add_argument("--variants", nargs="+", default=VARIANTS)
+    c.add_argument("--frames", type=int, default=120, help="frames sampled across the clips")
+    c.add_argument("--batch", type=int, default=8)
+    c.add_argument("--conf", type=float, default=0.6)
+    c.add_argument("--models-dir", type=Path, default=None)
+    c.add_argument("--save-profile", action="store_true",
+                   help=f"write {PROFILE_NAME} for POSE_LATENCY_BUDGET_MS selection")
+    c.add_argument("--json", type=Path, default=None)
+
+    args = p.parse_args()
+    if args.cmd == "export":
+        for name in args.variants:
+            path = export(PoseBackend.parse(name), args.models_dir, args.calib,
+                          args.calib_frames, args.imgsz)
+            print(f"{name}: {path}")
+    else:
+        report = compare(args.clips, args.variants, args.frames, args.batch,
+                         args.conf, args.models_dir)
+        _print_report(report)
+        if args.json:
+            args.json.write_text(json.dumps(report, indent=2))
+        if args.save_profile:
+            path = Path(args.models_dir or MODELS_DIR) / PROFILE_NAME
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps({**load_profile(args.models_dir), **report}, indent=2))
+            print(f"profile → {path}")
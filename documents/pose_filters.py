@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+pose_filters.py
+~~~~~~~~~~~~~~~
+One pre‑processing pass over a whole swing: gap filling and smoothing of all
+17 keypoints and the COM at once, plus cached per‑point kinematics.
+
+• The 18 tracked points are one (frames, 36) array, so every step below is a
+  single array operation instead of a per‑column loop.
+• `interpolate_gaps` bridges NaN runs of up to *max_gap* frames linearly;
+  longer gaps stay missing.
+• `smooth_points` applies Savitzky–Golay (`savgol`, zero‑phase, good for
+  offline clips) or One‑Euro (`one_euro`, causal and adaptive: heavy
+  smoothing at rest, little lag on fast hands).
+• `smooth_frame` does both on a load_com_velo_csv DataFrame in place of the
+  raw columns and re‑derives COM velocity / speed; `df.attrs["smoothing"]`
+  records the method so it is never applied twice.
+• `Kinematics` holds velocity (px/s) and speed for every point, computed
+  once; SwingAnalysis reads wrist speed from it for smoothed frames.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from com_velo_parser import KEYPOINT_COLUMNS, KEYPOINTS
+
+POINTS = KEYPOINTS + ["com"]
+POINT_COLUMNS = KEYPOINT_COLUMNS + ["com_x", "com_y"]
+_POINT_INDEX = {name: i for i, name in enumerate(POINTS)}
+
+SMOOTHERS = ("savgol", "one_euro")
+
+
+def _neighbours(valid: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Per cell: index of the previous / next valid row (−1 / n if none)."""
+    n = len(valid)
+    rows = np.arange(n)[:, None]
+    prev = np.maximum.accumulate(np.where(valid, rows, -1), axis=0)
+    nxt = np.minimum.accumulate(np.where(valid, rows, n)[::-1], axis=0)[::-1]
+    return prev, nxt
+
+
+def interpolate_gaps(x: np.ndarray, max_gap: int = 3) -> np.ndarray:
+    """
+    Linear interpolation of NaN runs ≤ *max_gap* frames that have a valid
+    sample on both sides, for every column of *x* (frames, …) at once.
+    """
+    shape = x.shape
+    out = np.array(x, dtype=np.float64).reshape(len(x), -1)
+    if out.size == 0 or max_gap <= 0:
+        return out.reshape(shape)
+    valid = np.isfinite(out)
+    prev, nxt = _neighbours(valid)
+    fill = ~valid & (prev >= 0) & (nxt < len(out)) & (nxt - prev - 1 <= max_gap)
+    if fill.any():
+        rows, cols = np.nonzero(fill)
+        p, q = prev[fill], nxt[fill]
+        t = (rows - p) / (q - p)
+        out[rows, cols] = out[p, cols] * (1 - t) + out[q, cols] * t
+    return out.reshape(shape)
+
+
+def _savgol(x: np.ndarray, window: int, order: int) -> np.ndarray:
+    from scipy.signal import savgol_filter
+
+    n = len(x)
+    if window % 2 == 0:
+        window += 1
+    if n < window:
+        return x
+    valid = np.isfinite(x)
+    if valid.all():
+        return savgol_filter(x, window, order, axis=0, mode="interp")
+    # hold the edges of long gaps so they don't spread NaN, then put it back
+    prev, nxt = _neighbours(valid)
+    src = np.where(prev >= 0, prev, np.minimum(nxt, n - 1))
+    held = np.take_along_axis(x, src, axis=0)
+    held = np.where(np.isfinite(held), held, 0.0)            # all‑NaN columns
+    return np.where(valid, savgol_filter(held, window, order, axis=0, mode="interp"), np.nan)
+
+
+def _alpha(cutoff, fps: float):
+    tau = 1.0 / (2 * np.pi * cutoff)
+    return 1.0 / (1.0 + tau * fps)
+
+
+def _one_euro(x: np.ndarray, fps: float, min_cutoff: float, beta: float,
+              d_cutoff: float) -> np.ndarray:
+    """One‑Euro filter along axis 0, vectorised over columns; restarts after a gap."""
+    out = np.full_like(x, np.nan)
+    a_d = _alpha(d_cutoff, fps)
+    x_prev = np.zeros(x.shape[1])
+    dx_prev = np.zeros(x.shape[1])
+    was_ok = np.zeros(x.shape[1], dtype=bool)
+    for t, xt in enumerate(x):
+        ok = np.isfinite(xt)
+        cont = ok & was_ok
+        dx = np.where(cont, (xt - x_prev) * fps, 0.0)
+        dx_hat = np.where(cont, a_d * dx + (1 - a_d) * dx_prev, 0.0)
+        a = _alpha(min_cutoff + beta * np.abs(dx_hat), fps)
+        x_hat = np.where(cont, a * xt + (1 - a) * x_prev, xt)
+        out[t] = x_hat
+        x_prev = np.where(ok, x_hat, x_prev)
+        dx_prev = np.where(ok, dx_hat, dx_prev)
+        was_ok = ok
+    return out
+
+
+def smooth_points(
+    x: np.ndarray,
+    method: str = "savgol",
+    fps: float = 30.0,
+    window: int = 5,
+    order: int = 2,
+    min_cutoff: float = 1.0,
+    beta: float = 0.007,
+    d_cutoff: float = 1.0,
+) -> np.ndarray:
+    """
+    Smooth every column of *x* (frames, …) along time.
+    savgol: *window* / *order*; one_euro: *min_cutoff* Hz, *beta*, *d_cutoff* Hz.
+    """
+    shape = x.shape
+    flat = np.asarray(x, dtype=np.float64).reshape(len(x), -1)
+    if method == "savgol":
+        out = _savgol(flat, window, order)
+    elif method == "one_euro":
+        out = _one_euro(flat, fps, min_cutoff, beta, d_cutoff)
+    else:
+        raise ValueError(f"unknown smoothing {method!r} (one of {', '.join(SMOOTHERS)})")
+    return out.reshape(shape)
+
+
+def smooth_frame(
+    df: pd.DataFrame,
+    method: Optional[str] = "savgol",
+    fps: float = 30.0,
+    max_gap: int = 3,
+    **kw,
+) -> pd.DataFrame:
+    """
+    Gap‑fill and smooth the keypoint and COM columns of a load_com_velo_csv
+    DataFrame, then recompute vel_x / vel_y / speed (px/s) from the smoothed
+    COM.  Returns *df*; a no‑op for method None or an already smoothed frame.
+    """
+    if not method or method == "none" or df.attrs.get("smoothing"):
+        return df
+    xy = interpolate_gaps(df[POINT_COLUMNS].to_numpy(dtype=np.float64), max_gap)
+    xy = smooth_points(xy, method, fps=fps, **kw)
+    df[POINT_COLUMNS] = xy
+
+    vel = np.zeros((len(xy), 2))
+    vel[1:] = np.diff(xy[:, -2:], axis=0) * fps
+    vel = np.nan_to_num(vel, nan=0.0)
+    df["vel_x"], df["vel_y"] = vel[:, 0], vel[:, 1]
+    df["speed"] = np.hypot(vel[:, 0], vel[:, 1])
+    df.attrs["smoothing"] = method
+    return df
+
+
+class Kinematics:
+    """
+    Position, velocity (px/s) and speed of the 17 keypoints + COM, computed
+    once from a DataFrame; index by point name instead of re‑deriving.
+    Velocity is the backward difference (frame 0 → 0), NaN where missing.
+    """
+
+    __slots__ = ("fps", "xy", "velocity", "speed")
+
+    def __init__(self, xy: np.ndarray, fps: float = 30.0):
+        self.fps = fps
+        self.xy = xy                                          # (frames, 18, 2)
+        self.velocity = np.zeros_like(xy)
+        self.velocity[1:] = np.diff(xy, axis=0) * fps
+        self.speed = np.hypot(self.velocity[..., 0], self.velocity[..., 1])
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, fps: float = 30.0) -> "Kinematics":
+        xy = df[POINT_COLUMNS].to_numpy(dtype=np.float64).reshape(len(df), len(POINTS), 2)
+        return cls(xy, fps)
+
+    def speed_of(self, point: str) -> np.ndarray:
+        return self.speed[:, _POINT_INDEX[point]]
+
+    def peak(self, point: str) -> Tuple[int, float]:
+        """(frame, px/s) of the fastest finite sample of *point*; (0, NaN) if none."""
+        s = self.speed_of(point)
+        finite = np.isfinite(s)
+        if not finite.any():
+            return 0, float("nan")
+        i = int(np.argmax(np.where(finite, s, -np.inf)))
+        return i, float(s[i])
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+pose_model.py
+~~~~~~~~~~~~~
+Process‑wide registry for the YOLO‑v8 Pose model.
+
+• `get_model()` loads the weights once per process (thread‑safe) and moves
+  them to CUDA when available, otherwise CPU.  Which variant – PyTorch or
+  an exported ONNX / OpenVINO (INT8) model, size n/s/m – comes from
+  `configure()` or the environment (see pose_backends).
+• `warmup()` runs one inference on a blank frame so the first real request
+  doesn't pay for lazy initialisation, then flips the readiness flag.
+• `inference_lock` serialises predict calls – an ultralytics model keeps
+  per‑call predictor state and is not safe to share between threads.
+"""
+import os
+os.environ["KMP_DUPLICATE_LIB_OK"] = "TRUE"
+
+import threading
+from typing import Optional
+
+import numpy as np
+import torch
+from ultralytics import YOLO
+
+import telemetry
+from pose_backends import PoseBackend, backend_from_env
+
+MODEL_WEIGHTS = os.environ.get("POSE_MODEL_WEIGHTS")     # explicit .pt, overrides the size
+_FALLBACK_URL = "https://github.com/ultralytics/assets/releases/download/v0.0.0/yolov8{}-pose.pt"
+
+_model = None
+_backend: Optional[PoseBackend] = None
+_load_lock = threading.Lock()
+_ready = threading.Event()
+_load_error: Optional[str] = None
+
+inference_lock = threading.Lock()
+
+
+def _load(backend: PoseBackend):
+    if backend.runtime != "torch":
+        print(f"Loading exported pose model {backend.name}...")
+        return backend.load()              # runs on the CPU through its own runtime
+
+    weights = MODEL_WEIGHTS or str(backend.path())
+    if not MODEL_WEIGHTS and not os.path.exists(weights):
+        weights = os.path.basename(weights)          # ultralytics downloads it by name
+    # Load model with weights_only=True to avoid pickle compatibility issues
+    try:
+        print("Attempting to load model with weights_only=True...")
+        model = YOLO(weights, task='pose', weights_only=True)
+    except Exception as e:
+        print(f"Failed with weights_only=True: {str(e)}")
+        try:
+            print("Trying alternative loading method...")
+            # Try compatibility mode for ultralytics models
+            torch.hub._validate_not_a_forked_repo = lambda a, b, c: True
+            model = YOLO(weights, task='pose')
+        except Exception as e2:
+            print(f"Alternative method also failed: {str(e2)}")
+            # Final fallback - try using the public model from Ultralytics
+            print("Using fallback to public model...")
+            model = YOLO(_FALLBACK_URL.format(backend.size))  # Download official weights
+
+    # Use CPU if CUDA not available
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    print(f"Using device: {device}")
+    model.to(device)
+    return model
+
+
+def configure(backend: PoseBackend) -> None:
+    """Pick the model variant; call before the first get_model()."""
+    global _backend
+    if _model is not None:
+        raise RuntimeError(f"pose model already loaded ({_backend.name})")
+    _backend = backend
+
+
+def backend() -> PoseBackend:
+    """The configured variant (from the environment unless configure()d)."""
+    global _backend
+    if _backend is None:
+        _backend = backend_from_env()
+    return _backend
+
+
+def get_model():
+    """Return the shared pose model, loading it on first use."""
+    global _model, _load_error
+    if _model is None:
+        with _load_lock:
+            if _model is None:
+                try:
+                    with telemetry.span("model_load"):
+                        _model = _load(backend())
+                except Exception as e:
+                    _load_error = str(e)
+                    raise
+    return _model
+
+
+def warmup(imgsz: int = 640) -> bool:
+    """
+    Load the model (if needed) and run one inference on a black frame.
+    Returns True when the model is ready; errors are kept for `load_error()`.
+    """
+    global _load_error
+    try:
+        model = get_model()
+        with inference_lock:
+            model.predict(np.zeros((imgsz, imgsz, 3), dtype=np.uint8), verbose=False)
+    except Exception as e:
+        _load_error = str(e)
+        print(f"Pose model warmup failed: {_load_error}")
+        return False
+    _load_error = None
+    _ready.set()
+    return True
+
+
+def is_ready() -> bool:
+    """True once the model is loaded and has completed a warmup inference."""
+    return _ready.is_set()
+
+
+def load_error() -> Optional[str]:
+    """Last load / warmup error, or None."""
+    return _load_error
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+pose_store.py
+~~~~~~~~~~~~~
+Binary, memory‑mappable container for pose tracks – the typed sibling of the
+frame,keypoints,COM,velocity,foot_contact,time CSV.
+
+Layout
+------
+    MAGIC (8 bytes) | header length (uint32 LE) | JSON header | pad | arrays …
+
+• The JSON header lists every array as {dtype, shape, offset} plus free‑form
+  metadata (fps, conf_thr, source …).
+• Each array starts on a 64‑byte boundary, so reading is one `np.memmap` of
+  the file and a zero‑copy `.view()` per array – no parsing at all.
+
+Arrays written by extract_pose_csv
+----------------------------------
+keypoints     (frames, 17, 2) float32   NaN where below conf_thr / missing
+conf          (frames, 17)    float32   raw per‑keypoint confidence
+com           (frames, 2)     float64   hip midpoint, NaN if hips missing
+velocity      (frames, 2)     float64   ΔCOM / dt
+time          (frames,)       float64   seconds from the first frame
+foot_contact  (frames, 2)     bool      [front, back]
+detected      (frames,)       bool      a person was found in the frame
+inferred      (frames,)       bool      keyframe mode only: network ran (else optical flow)
+
+On‑device clients (/process_keypoints) send the same container with just
+keypoints, conf and time – any float dtype, float16 halves the upload;
+com_velo_parser.load_keypoint_payload derives the rest.
+"""
+
+import json
+import struct
+from pathlib import Path
+from typing import BinaryIO, Dict, Tuple, Union
+
+import numpy as np
+
+MAGIC = b"MCPPOSE1"
+POSE_SUFFIX = ".pose"
+_ALIGN = 64
+_HEADER_LEN = struct.Struct("<I")
+
+
+def _pad(n: int) -> int:
+    return (-n) % _ALIGN
+
+
+def dump_pose(fh: BinaryIO, arrays: Dict[str, np.ndarray], **meta) -> None:
+    """Serialise *arrays* (name → ndarray) and *meta* into an open binary file."""
+    arrays = {name: np.ascontiguousarray(a) for name, a in arrays.items()}
+
+    # offsets depend on the header length, which depends on the offsets –
+    # lay the arrays out relative to the data start and fix up once
+    specs, pos = {}, 0
+    for name, a in arrays.items():
+        specs[name] = {"dtype": a.dtype.str, "shape": list(a.shape), "offset": pos}
+        pos += a.nbytes + _pad(a.nbytes)
+
+    header = {"version": 1, "meta": meta, "arrays": specs}
+    prefix = len(MAGIC) + _HEADER_LEN.size
+    blob = json.dumps(header).encode()
+    data_start = prefix + len(blob) + _pad(prefix + len(blob))
+    for spec in specs.values():
+        spec["offset"] += data_start
+    blob = json.dumps(header).encode()
+    # offsets grew by a few digits – keep padding until the header fits
+    while prefix + len(blob) > data_start:
+        data_start += _ALIGN
+        for spec in specs.values():
+            spec["offset"] += _ALIGN
+        blob = json.dumps(header).encode()
+
+    fh.write(MAGIC)
+    fh.write(_HEADER_LEN.pack(len(blob)))
+    fh.write(blob)
+    fh.write(b"\0" * (data_start - prefix - len(blob)))
+    for a in arrays.values():
+        fh.write(a.tobytes())
+        fh.write(b"\0" * _pad(a.nbytes))
+
+
+def write_pose(path: Union[str, Path], arrays: Dict[str, np.ndarray], **meta) -> Path:
+    """Write a .pose file and return its path."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as fh:
+        dump_pose(fh, arrays, **meta)
+    return path
+
+
+def _unpack(raw: np.ndarray) -> Tuple[Dict[str, np.ndarray], dict]:
+    """Split a uint8 buffer (memmap or bytes) into zero‑copy array views."""
+    if bytes(raw[:len(MAGIC)]) != MAGIC:
+        raise ValueError("not a pose file (bad magic)")
+    prefix = len(MAGIC) + _HEADER_LEN.size
+    if len(raw) < prefix:
+        raise ValueError("truncated pose file")
+    (n,) = _HEADER_LEN.unpack(bytes(raw[len(MAGIC):prefix]))
+    header = json.loads(bytes(raw[prefix:prefix + n]))
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        shape = tuple(spec["shape"])
+        size = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+        start = spec["offset"]
+        if start < 0 or start + size > len(raw):
+            raise ValueError(f"truncated pose file (array {name!r})")
+        arrays[name] = raw[start:start + size].view(dtype).reshape(shape)
+    return arrays, header.get("meta", {})
+
+
+def read_pose(path: Union[str, Path], mmap: bool = True) -> Tuple[Dict[str, np.ndarray], dict]:
+    """
+    Open a .pose file → (arrays, meta).
+    With *mmap=True* (default) the arrays are views onto the file mapped
+    copy‑on‑write: still zero‑copy to read, and writes land in private pages
+    of this process – the file never changes.  Pass mmap=False to load
+    everything into memory instead.
+    """
+    if mmap:
+        raw = np.memmap(path, dtype=np.uint8, mode="c")
+    else:
+        raw = np.fromfile(path, dtype=np.uint8)
+    return _unpack(raw)
+
+
+def loads_pose(data: bytes) -> Tuple[Dict[str, np.ndarray], dict]:
+    """
+    Parse a pose container held in memory (e.g. a request body) → (arrays, meta).
+    The arrays are writable views onto one private copy of *data*.
+    """
+    return _unpack(np.frombuffer(bytearray(data), dtype=np.uint8))
+
+
+def is_pose_file(path: Union[str, Path]) -> bool:
+    """True if *path* starts with the pose‑file magic bytes."""
+    try:
+        with open(path, "rb") as fh:
+            return fh.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+pose_track.py
+~~~~~~~~~~~~~
+Build a pose track frame by frame and write it as the
+frame,keypoints,COM,velocity,foot_contact,time CSV.
+
+• `TrackBuilder` turns per‑frame detections into the arrays extract_pose
+  writes (see pose_store for the layout).
+• `write_pose_csv` writes those arrays in the CSV format com_velo_parser
+  loads.
+
+Only numpy – no torch, pandas or pose model – so extract_pose_csv and
+swing_bench (synthetic tracks) share the real COM / velocity logic.
+"""
+
+import csv
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# COCO‑17 order, as the pose model emits them
+KEYPOINTS: List[str] = [
+    "nose", "left_eye", "right_eye", "left_ear", "right_ear",
+    "left_shoulder", "right_shoulder", "left_elbow", "right_elbow",
+    "left_wrist", "right_wrist", "left_hip", "right_hip",
+    "left_knee", "right_knee", "left_ankle", "right_ankle",
+]
+
+
+class TrackBuilder:
+    """
+    Per‑frame detections → the pose arrays extract_pose writes (stage 3 of
+    its pipeline): keypoints below *conf_thr* → NaN, COM = hip midpoint,
+    velocity = ΔCOM / dt.  Frame by frame counterpart of track_from_keypoints.
+    """
+
+    def __init__(self, conf_thr: float, dt: float):
+        self.conf_thr = conf_thr
+        self.dt = dt
+        self.prev_com = None
+        self.kp_rows, self.conf_rows, self.com_rows, self.vel_rows = [], [], [], []
+        self.detected = []
+
+    def add(self, best: Optional[Tuple[np.ndarray, np.ndarray]]) -> None:
+        if best is None:
+            self.kp_rows.append(np.full((len(KEYPOINTS), 2), np.nan))
+            self.conf_rows.append(np.zeros(len(KEYPOINTS)))
+            self.com_rows.append((np.nan, np.nan))
+            self.vel_rows.append((0.0, 0.0))
+            self.detected.append(False)
+            return
+
+        kpts_xy, confs = best
+        self.kp_rows.append(np.where((confs >= self.conf_thr)[:, None], kpts_xy, np.nan))
+        self.conf_rows.append(confs)
+        self.detected.append(True)
+        named = {
+            name: (float(x), float(y))
+            for name, (x, y), c in zip(KEYPOINTS, kpts_xy, confs)
+            if c >= self.conf_thr
+        }
+
+        # compute COM (midpoint of hips)
+        if {"left_hip", "right_hip"} <= named.keys():
+            x1, y1 = named["left_hip"]
+            x2, y2 = named["right_hip"]
+            com = ((x1 + x2) / 2.0, (y1 + y2) / 2.0)
+        else:
+            com = (None, None)
+
+        # compute velocity ΔCOM / dt
+        prev_com = self.prev_com
+        if prev_com and None not in (*com, *prev_com):
+            vx = (com[0] - prev_com[0]) / self.dt
+            vy = (com[1] - prev_com[1]) / self.dt
+        else:
+            vx, vy = 0.0, 0.0
+        self.prev_com = com
+        self.com_rows.append(tuple(np.nan if v is None else v for v in com))
+        self.vel_rows.append((vx, vy))
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        n, k = len(self.detected), len(KEYPOINTS)
+        return dict(
+            keypoints=np.asarray(self.kp_rows, dtype=np.float32).reshape(n, k, 2),
+            conf=np.asarray(self.conf_rows, dtype=np.float32).reshape(n, k),
+            com=np.asarray(self.com_rows, dtype=np.float64).reshape(n, 2),
+            velocity=np.asarray(self.vel_rows, dtype=np.float64).reshape(n, 2),
+            time=np.arange(n) * self.dt,
+            foot_contact=np.zeros((n, 2), dtype=bool),
+            detected=np.asarray(self.detected, dtype=bool),
+        )
+
+
+def _csv_rows(arrays: Dict[str, np.ndarray]):
+    """Yield CSV rows (frame,keypoints,COM,velocity,foot_contact,time) from pose arrays."""
+    for frame_idx, (kpts, com, vel, found) in enumerate(zip(
+        arrays["keypoints"], arrays["com"], arrays["velocity"], arrays["detected"],
+    )):
+        if not found:
+            yield [frame_idx, "{}", "(None,None)", "(0.0,0.0)", "{}", ""]
+            continue
+
+        named = {
+            name: [float(x), float(y)]
+            for name, (x, y) in zip(KEYPOINTS, kpts)
+            if not np.isnan(x)
+        }
+        com = (None, None) if np.isnan(com).any() else (float(com[0]), float(com[1]))
+        yield [
+            frame_idx,
+            json.dumps(named, separators=(",", ":")),
+            json.dumps(com),
+            json.dumps((float(vel[0]), float(vel[1]))),
+            json.dumps({"front": False, "back": False}),
+            ""
+        ]
+
+
+def write_pose_csv(out_csv: Path, arrays: Dict[str, np.ndarray]) -> None:
+    """Write pose arrays (as returned by extract_pose) in the frame,keypoints,… CSV format."""
+    out_csv = Path(out_csv)
+    out_csv.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_csv, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["frame", "keypoints", "COM", "velocity", "foot_contact", "time"])
+        writer.writerows(_csv_rows(arrays))
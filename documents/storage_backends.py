@@ -0,0 +1,217 @@
+# storage_backends.py
+# ---------------------------------------------------------------------------
+# Blob storage behind one small interface, plus a background uploader.
+#
+#   BlobStorage       – public_url / upload_file / upload_bytes / download
+#   FirebaseStorage   – Firebase (Google Cloud Storage) bucket
+#   LocalStorage      – a directory on disk; stand‑in for tests and dev
+#   Uploader          – thread pool that writes to a BlobStorage with retries
+#
+# Public URLs are a pure function of the blob name, so the API can return
+# them straight away and let the upload finish after the response is sent.
+# ---------------------------------------------------------------------------
+
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Union
+from urllib.parse import quote
+
+import telemetry
+
+log = logging.getLogger(__name__)
+
+
+class BlobStorage:
+    """Minimal blob store interface used by the API."""
+
+    def public_url(self, name: str) -> str:
+        raise NotImplementedError
+
+    def upload_file(self, name: str, path: Union[str, Path],
+                    content_type: Optional[str] = None) -> None:
+        raise NotImplementedError
+
+    def upload_bytes(self, name: str, data: bytes,
+                     content_type: Optional[str] = None) -> None:
+        raise NotImplementedError
+
+    def download(self, name: str, path: Union[str, Path]) -> bool:
+        """Copy blob *name* to *path* → False if it does not exist."""
+        raise NotImplementedError
+
+
+class FirebaseStorage(BlobStorage):
+    def __init__(self, bucket_name: Optional[str] = None,
+                 credentials_path: str = "firebase-credentials.json"):
+        import firebase_admin                         # optional: only this backend needs it
+        from firebase_admin import credentials, storage
+
+        if not firebase_admin._apps:
+            cred = credentials.Certificate(credentials_path)
+            firebase_admin.initialize_app(cred, {
+                'storageBucket': bucket_name or os.environ.get('FIREBASE_STORAGE_BUCKET')
+            })
+        self._bucket = storage.bucket()
+
+    def public_url(self, name: str) -> str:
+        # computed locally by the client library – no request is made
+        return self._bucket.blob(name).public_url
+
+    def upload_file(self, name, path, content_type=None):
+        self._bucket.blob(name).upload_from_filename(str(path), content_type=content_type)
+
+    def upload_bytes(self, name, data, content_type=None):
+        self._bucket.blob(name).upload_from_string(data, content_type=content_type)
+
+    def download(self, name, path):
+        blob = self._bucket.blob(name)
+        if not blob.exists():
+            return False
+        blob.download_to_filename(str(path))
+        return True
+
+
+class LocalStorage(BlobStorage):
+    """Blobs as files under *root*; URLs are *base_url* + name."""
+
+    def __init__(self, root: Union[str, Path], base_url: Optional[str] = None):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.base_url = (base_url or self.root.resolve().as_uri()).rstrip("/")
+
+    def _path(self, name: str) -> Path:
+        path = (self.root / name).resolve()
+        if self.root.resolve() not in path.parents:
+            raise ValueError(f"blob name escapes storage root: {name!r}")
+        return path
+
+    def public_url(self, name):
+        return f"{self.base_url}/{quote(name)}"
+
+    def _write(self, name: str, fill) -> None:
+        path = self._path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".")
+        with os.fdopen(fd, "wb") as f:
+            fill(f)
+        os.replace(tmp, path)
+
+    def upload_file(self, name, path, content_type=None):
+        with open(path, "rb") as src:
+            self._write(name, lambda f: shutil.copyfileobj(src, f))
+
+    def upload_bytes(self, name, data, content_type=None):
+        self._write(name, lambda f: f.write(data))
+
+    def download(self, name, path):
+        src = self._path(name)
+        if not src.exists():
+            return False
+        shutil.copyfile(src, path)
+        return True
+
+
+def storage_from_env() -> BlobStorage:
+    """SWING_STORAGE=firebase (default) | local (root: SWING_STORAGE_DIR)."""
+    kind = os.environ.get("SWING_STORAGE", "firebase").lower()
+    if kind == "local":
+        return LocalStorage(
+            os.environ.get("SWING_STORAGE_DIR", Path(tempfile.gettempdir(), "swing_storage")),
+            base_url=os.environ.get("SWING_STORAGE_URL"),
+        )
+    if kind == "firebase":
+        return FirebaseStorage()
+    raise ValueError(f"unknown SWING_STORAGE backend: {kind!r}")
+
+
+class Uploader:
+    """
+    Background writer for a BlobStorage.
+
+    upload_file / upload_bytes return the blob's public URL immediately and
+    do the write on a small thread pool, retrying with exponential backoff.
+    Files are hard‑linked (or copied) into a spool directory first, so the
+    caller may delete its copy as soon as the call returns.
+    """
+
+    def __init__(self, storage: BlobStorage, workers: int = 4, retries: int = 3,
+                 backoff: float = 0.5, spool_dir: Optional[Union[str, Path]] = None):
+        self.storage = storage
+        self.retries = retries
+        self.backoff = backoff
+        self.spool = Path(spool_dir or tempfile.mkdtemp(prefix="swing_spool_"))
+        self.spool.mkdir(parents=True, exist_ok=True)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="upload")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.failed = 0
+
+    def _spool(self, path: Path) -> Path:
+        dst = self.spool / f"{uuid.uuid4().hex}{path.suffix}"
+        try:
+            os.link(path, dst)
+        except OSError:
+            shutil.copyfile(path, dst)              # other filesystem / no hard links
+        return dst
+
+    def _run(self, name: str, write) -> None:
+        try:
+            for attempt in range(self.retries + 1):
+                try:
+                    with telemetry.span("storage_upload"):
+                        write()
+                    return
+                except Exception as e:
+                    if attempt == self.retries:
+                        with self._lock:
+                            self.failed += 1
+                        telemetry.UPLOAD_FAILURES.inc()
+                        log.warning("Upload of %s failed after %d attempts: %s", name, attempt + 1, e)
+                        raise
+                    log.warning("Upload of %s failed (%s), retrying", name, e)
+                    time.sleep(self.backoff * 2 ** attempt)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _queue(self, name: str, write, cleanup=None) -> Future:
+        def job():
+            try:
+                self._run(name, write)
+            finally:
+                if cleanup is not None:
+                    cleanup()
+        with self._lock:
+            self._pending += 1
+        return self._pool.submit(job)
+
+    def upload_file(self, name: str, path: Union[str, Path],
+                    content_type: Optional[str] = None) -> str:
+        """Queue *path* for upload as *name* → public URL."""
+        spooled = self._spool(Path(path))
+        self._queue(
+            name,
+            lambda: self.storage.upload_file(name, spooled, content_type),
+            cleanup=lambda: spooled.unlink(missing_ok=True),
+        )
+        return self.storage.public_url(name)
+
+    def upload_bytes(self, name: str, data: bytes,
+                     content_type: Optional[str] = None) -> str:
+        """Queue *data* for upload as *name* → public URL."""
+        self._queue(name, lambda: self.storage.upload_bytes(name, data, content_type))
+        return self.storage.public_url(name)
+
+    def pending(self) -> int:
+        return self._pending
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting uploads; by default let queued ones finish."""
+        self._pool.shutdown(wait=wait)
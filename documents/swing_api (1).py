@@ -2,34 +2,33 @@
 # ---------------------------------------------------------------------------
 
 import os
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException
-from fastapi.responses import JSONResponse
-import tempfile, pathlib, uvicorn
+import asyncio
+import time
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+import tempfile, pathlib, shutil, hashlib, uvicorn
 from typing import Optional
 import json
 import openai
-from extract_pose_csv import main as extract_csv            # step‑2
-from com_velo_parser import (                               # step‑3
-    load_com_velo_csv,
-    simple_swing_tips,
-    peak_wrist_speed,
-    mph_from_px_speed,
-    px_per_inch_from_pose,
+from swing_pipeline import (                                # steps 2‑3
+    analyse_video,
+    analyse_pose_file,
+    analyse_keypoints,
 )
-import numpy as np
-from metrics import enrich_and_measure
-import firebase_admin
-from firebase_admin import credentials, storage
+from ai_coach import AICoach                                # step 4
+from swing_jobs import JobQueue, QueueFull
+from analysis_cache import AnalysisCache, video_key
+from storage_backends import Uploader, storage_from_env
+from swing_index import SwingIndex
+import telemetry
 import uuid
 
-# Initialize Firebase Admin
-cred = credentials.Certificate("firebase-credentials.json")
-firebase_admin.initialize_app(cred, {
-    'storageBucket': os.environ.get('FIREBASE_STORAGE_BUCKET')
-})
-
 app = FastAPI(title="Perfect Swing API")
 
+# Log level from SWING_LOG_LEVEL; per‑stage timings, frame counts and queue
+# depth are exported on /metrics (see telemetry).
+telemetry.setup_logging()
+
 # Set your OpenAI API key
 openai_api_key = os.environ.get("OPENAI_API_KEY", "")
 if not openai_api_key:
@@ -39,6 +38,296 @@ else:
     
 openai.api_key = openai_api_key
 
+# ---------------------------------------------------------------------------
+# Pose inference + metrics run on a pool of worker processes, each holding a
+# warm model, so the event loop only does I/O.
+jobs: Optional[JobQueue] = None
+_job_tasks: set = set()
+
+# Re‑uploads of the same clip are answered from a content‑addressed cache:
+# full results per (video, side, shoulder width), pose tracks per video.
+cache: Optional[AnalysisCache] = None
+
+# Uploads are streamed to disk in fixed chunks and capped while streaming,
+# so memory per request stays flat whatever the video size.  Request bodies
+# are capped too (see BodySizeLimit) before the form is parsed and spooled;
+# FORM_OVERHEAD_BYTES leaves room for the other fields and part headers.
+UPLOAD_CHUNK = 1 << 20
+MAX_UPLOAD_BYTES = int(os.environ.get("SWING_MAX_UPLOAD_MB", 200)) << 20
+FORM_OVERHEAD_BYTES = 64 << 10
+
+# High‑frame‑rate deployments can set SWING_KEYFRAME_EVERY=K: the pose model
+# then runs on every K‑th frame (densely around the swing) and optical flow
+# fills in the rest – see extract_pose_csv.
+KEYFRAME_EVERY = int(os.environ.get("SWING_KEYFRAME_EVERY", 1))
+
+# /process_keypoints takes keypoints detected on the phone instead of video.
+MAX_KEYPOINT_BYTES = int(os.environ.get("SWING_MAX_KEYPOINTS_MB", 8)) << 20
+
+# /jobs/{id}/events streams progress (frames done, running metrics) as
+# server‑sent events; a comment line keeps idle proxies from closing it.
+SSE_POLL_S = 0.1
+SSE_KEEPALIVE_S = 15.0
+
+# Blob writes (Firebase by default, SWING_STORAGE=local for tests) go through
+# a background uploader: responses carry the public URLs right away and the
+# uploads finish after the response is sent.
+storage = storage_from_env()
+uploader: Optional[Uploader] = None
+
+# OpenAI tips are async, cached and time‑boxed (AI_BUDGET_S); answers that
+# miss the budget are written to the results blob when they arrive.
+coach = AICoach.from_env()
+
+# Optional reference library (SWING_INDEX_PATH, built with swing_index.py):
+# /process then also returns the closest reference swings and percentiles.
+# It is read‑only here – analysed swings are never inserted; extend it
+# offline with `swing_index.py add` and restart.
+reference: Optional[SwingIndex] = None
+
+
+@app.on_event("startup")
+def start_workers():
+    global jobs, cache, uploader, reference
+    workers = int(os.environ["SWING_WORKERS"]) if os.environ.get("SWING_WORKERS") else None
+    depth = int(os.environ["SWING_QUEUE_DEPTH"]) if os.environ.get("SWING_QUEUE_DEPTH") else None
+    jobs = JobQueue(workers=workers, max_depth=depth)
+    # spawn the workers and start warming them; /ready reports once one is usable
+    jobs.start()
+
+    cache = AnalysisCache(
+        os.environ.get("SWING_CACHE_DIR", pathlib.Path(tempfile.gettempdir(), "swing_cache")),
+        max_bytes=int(os.environ.get("SWING_CACHE_MAX_MB", 2048)) << 20,
+    )
+    uploader = Uploader(storage, workers=int(os.environ.get("SWING_UPLOAD_WORKERS", 4)))
+
+    telemetry.QUEUE_DEPTH.set_function(jobs.depth)
+    telemetry.UPLOADS_PENDING.set_function(uploader.pending)
+
+    index_path = os.environ.get("SWING_INDEX_PATH")
+    if index_path and os.path.exists(index_path):
+        reference = SwingIndex.load(index_path)
+        print(f"Loaded reference index with {len(reference)} swings")
+
+
+@app.on_event("shutdown")
+def stop_workers():
+    if jobs is not None:
+        jobs.shutdown()
+    if uploader is not None:
+        uploader.shutdown(wait=True)            # don't drop queued uploads
+
+
+class BodySizeLimit:
+    """
+    ASGI middleware: refuse request bodies over the route's limit while they
+    stream in – up front from Content‑Length, otherwise as soon as the bytes
+    received pass it – so an oversized upload is never spooled to disk.
+    """
+
+    def __init__(self, app, default: int, limits: Optional[dict] = None):
+        self.app = app
+        self.default = default
+        self.limits = limits or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        limit = self.limits.get(scope["path"], self.default)
+        too_large = HTTPException(status_code=413,
+                                  detail=f"request body larger than {limit >> 20} MB")
+
+        length = dict(scope["headers"]).get(b"content-length", b"")
+        if length.isdigit() and int(length) > limit:
+            response = JSONResponse(status_code=413, content={"detail": too_large.detail})
+            return await response(scope, receive, send)
+
+        received = 0
+
+        async def limited():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise too_large            # → 413 from the route's exception handling
+            return message
+
+        await self.app(scope, limited, send)
+
+
+# registered before time_requests so it sits inside it: the 413 raised from
+# receive() reaches the route's exception handling directly
+app.add_middleware(
+    BodySizeLimit,
+    default=MAX_UPLOAD_BYTES + FORM_OVERHEAD_BYTES,
+    limits={"/process_keypoints": MAX_KEYPOINT_BYTES + FORM_OVERHEAD_BYTES},
+)
+
+
+@app.middleware("http")
+async def time_requests(request: Request, call_next):
+    t0 = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    telemetry.HTTP_SECONDS.labels(
+        route.path if route is not None else "unmatched", response.status_code
+    ).observe(time.perf_counter() - t0)
+    return response
+
+
+@app.get("/metrics")
+def metrics():
+    return PlainTextResponse(telemetry.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/ready")
+def ready():
+    if jobs is None:
+        return JSONResponse(status_code=503, content={"ready": False, "error": None})
+    # ready = at least one worker answered with a warm model
+    ok, error = jobs.ready()
+    if ok:
+        return {"ready": True, "workers": jobs.workers, "warm_workers": jobs.warm_workers()}
+    return JSONResponse(status_code=503, content={"ready": False, "error": error})
+
+
+def _queue_full(e: QueueFull) -> JSONResponse:
+    telemetry.JOBS_REJECTED.inc()
+    return JSONResponse(
+        status_code=429,
+        content={"error": "analysis queue is full, try again shortly"},
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
+async def _save_upload(video: UploadFile, td: str):
+    """
+    Copy the (already spooled) upload into *td* chunk by chunk, hashing as it
+    goes → (local path, sha256).  BodySizeLimit has capped the request body
+    while it streamed; this raises 413 if the video part alone passes
+    MAX_UPLOAD_BYTES.
+    """
+    too_large = HTTPException(
+        status_code=413, detail=f"video larger than {MAX_UPLOAD_BYTES >> 20} MB"
+    )
+    if video.size is not None and video.size > MAX_UPLOAD_BYTES:
+        raise too_large
+
+    tmp_vid = pathlib.Path(td, f"upload{pathlib.Path(video.filename).suffix}")
+    digest = hashlib.sha256()
+    received = 0
+    with telemetry.span("upload_receive"), tmp_vid.open("wb") as f:
+        while chunk := await video.read(UPLOAD_CHUNK):
+            received += len(chunk)
+            if received > MAX_UPLOAD_BYTES:
+                raise too_large
+            digest.update(chunk)
+            f.write(chunk)
+    return tmp_vid, digest.hexdigest()
+
+
+def _submit(tmp_vid: pathlib.Path, video_hash: str, td: str, side: str,
+            shoulder_width: Optional[float], progress: bool = False) -> str:
+    """Queue the cheapest job that answers this request → job id."""
+    pose = cache.get_pose(video_hash)
+    if pose is not None:
+        # seen this clip before – skip inference, recompute metrics only
+        return jobs.submit(analyse_pose_file, str(pose), side, shoulder_width,
+                           progress=progress)
+    return jobs.submit(analyse_video, str(tmp_vid), side, shoulder_width,
+                       progress=progress,
+                       out_bin=str(pathlib.Path(td, "pose.pose")),
+                       keyframe_every=KEYFRAME_EVERY)
+
+
+def _upload_results(session_id: str, response: dict, error_ai: Optional[str]) -> str:
+    # Save results to storage (in the background)
+    return uploader.upload_bytes(
+        f"results/{session_id}/analysis.json",
+        json.dumps({
+            "tips": response["tips"],
+            "metrics": response["metrics"],
+            "drills": response.get("drills", []),
+            "ai_tips": response["ai_tips"],
+            "ai_pending": response.get("ai_pending", False),
+            "error_ai": error_ai
+        }).encode(),
+        content_type="application/json",
+    )
+
+
+async def _finish(session_id: str, analysis: dict, side: str,
+                  shoulder_width: Optional[float], video_url: str):
+    """
+    Parent‑side tail of a job: AI tips, results upload, response payload.
+    → (response, late) where *late* is the AI task if it missed the budget.
+    """
+    # ---- 4. Send data to OpenAI for analysis ----------------------
+    ai_tips, error_ai, late = await coach.tips_within_budget(
+        analysis["swing"], side, shoulder_width
+    )
+
+    response = {
+        "session_id": session_id,
+        "video_url": video_url,
+        "results_url": None,
+        "tips": analysis["tips"],
+        "metrics": analysis["metrics"],
+        "faults": analysis["faults"],
+        "drills": analysis["drills"],
+        "ai_tips": ai_tips
+    }
+    if reference is not None:
+        response["reference_swings"] = reference.query(analysis["swing"], analysis["trajectory"])
+        response["percentiles"] = reference.percentiles(analysis["swing"])
+    if late is not None:
+        # simple tips now, AI tips in the results blob once they arrive
+        response["ai_pending"] = True
+    response["results_url"] = _upload_results(session_id, response, error_ai)
+    return response, late
+
+
+async def _deliver_ai(late: asyncio.Task, job_id: Optional[str], video_hash: str,
+                      side: str, shoulder_width: Optional[float], response: dict):
+    """Publish AI tips that missed the request budget."""
+    ai_tips, error_ai = await late
+    response = {**response, "ai_tips": ai_tips}
+    response.pop("ai_pending", None)
+    _upload_results(response["session_id"], response, error_ai)
+    if job_id is not None:
+        jobs.complete(job_id, response)
+    if error_ai is None:
+        cache.put_result(video_hash, video_key(side, shoulder_width), response)
+
+
+def _pose_blob_name(session_id: str) -> str:
+    return f"poses/{session_id}/pose.pose"
+
+
+async def _complete(job_id: str, td: str, video_hash: str, session_id: str,
+                    side: str, shoulder_width: Optional[float], video_url: str) -> dict:
+    """Await the worker, finish the job and remember pose + result."""
+    analysis = await jobs.wait(job_id)
+    response, late = await _finish(session_id, analysis, side, shoulder_width, video_url)
+    jobs.complete(job_id, response)
+
+    new_pose = pathlib.Path(td, "pose.pose")
+    if new_pose.exists():
+        cache.put_pose_file(video_hash, new_pose)
+    if late is None:
+        cache.put_result(video_hash, video_key(side, shoulder_width), response)
+    else:
+        _background(_deliver_ai(late, job_id, video_hash, side, shoulder_width, response))
+
+    # keep the pose track with the session so /reanalyze never re‑infers
+    cache.put_session(session_id, {"video_hash": video_hash, "video_url": response["video_url"]})
+    pose = cache.get_pose(video_hash)
+    if pose is not None:
+        uploader.upload_file(_pose_blob_name(session_id), pose)
+    return response
+
+
 # ---------------------------------------------------------------------------
 @app.post("/process")
 async def process_video(
@@ -49,210 +338,245 @@ async def process_video(
 ):
     # Generate unique ID for this processing session
     session_id = str(uuid.uuid4())
-    
-    # Upload video to Firebase Storage
-    bucket = storage.bucket()
-    video_blob = bucket.blob(f"videos/{session_id}/{video.filename}")
-    
+
     # Save video temporarily
     with tempfile.TemporaryDirectory() as td:
-        tmp_vid = pathlib.Path(td, f"upload{pathlib.Path(video.filename).suffix}")
-        tmp_csv = pathlib.Path(td, "pose_com_velo.csv")
-        
-        # Save uploaded video
-        with tmp_vid.open("wb") as f:
-            f.write(await video.read())
-
-        # Upload to Firebase
-        video_blob.upload_from_filename(str(tmp_vid))
-        
+        tmp_vid, video_hash = await _save_upload(video, td)
+
+        cached = cache.get_result(video_hash, video_key(side, shoulder_width))
+        if cached is not None:
+            telemetry.CACHE_HITS.inc()
+            return {**cached, "cached": True}
+
+        try:
+            job_id = _submit(tmp_vid, video_hash, td, side, shoulder_width)
+        except QueueFull as e:
+            return _queue_full(e)
+
+        # storage upload runs concurrently with pose extraction
+        video_url = uploader.upload_file(f"videos/{session_id}/{video.filename}", tmp_vid)
+
         try:
-            # Process video
-            extract_csv(tmp_vid, tmp_csv)
-
-            # Load and process CSV
-            df = load_com_velo_csv(tmp_csv)
-            tips = simple_swing_tips(df, side=side)
-            
-            user_shoulder_width = shoulder_width if shoulder_width is not None else 16.0
-            swing = enrich_and_measure(df, side=side, shoulder_in=user_shoulder_width)
-
-            hand_speed_mph          = swing["peak_hand_speed_mph"]
-            time_peak_to_contact_ms = swing["time_peak_to_contact_ms"]
-            hip_rot_deg             = swing["hip_rot_deg"]
-            shoulder_rot_deg        = swing["shoulder_rot_deg"]
-            hip_sep_deg             = swing["hip_shoulder_separation_deg"]
-            lead_elbow_deg          = swing["lead_elbow_angle_deg"]
-            bat_lag_deg             = swing["bat_lag_deg"]
-            
-            # Ensure no NaN values in metrics
-            if np.isnan(hand_speed_mph):
-                hand_speed_mph = 55.0  # Default reasonable value
-            if np.isnan(time_peak_to_contact_ms):
-                time_peak_to_contact_ms = 120.0  # Default ms
-            if np.isnan(hip_rot_deg):
-                hip_rot_deg = 30.0  # Default degrees
-            if np.isnan(shoulder_rot_deg):
-                shoulder_rot_deg = 45.0  # Default degrees
-            if np.isnan(hip_sep_deg):
-                hip_sep_deg = 15.0  # Default degrees
-            if np.isnan(lead_elbow_deg):
-                lead_elbow_deg = 120.0  # Default degrees
-            if np.isnan(bat_lag_deg):
-                bat_lag_deg = 90.0  # Default degrees
-            
-            # Get additional metrics
-            contact_frame = df['speed'].idxmax()
-            wrist_kp = "left_wrist" if side.lower().startswith("l") else "right_wrist"
-            wrist_speed_data = peak_wrist_speed(df, wrist=wrist_kp, fps=30.0)
-            
-            # Calculate MPH using shoulder width as reference
-            # If user provided shoulder width, use it; otherwise use default
-            # Note: Now using the same shoulder width as in enrich_and_measure
-            
-            # Measure shoulder width in pixels from the first frame
-            left = df.iloc[0][["left_shoulder_x", "left_shoulder_y"]].to_numpy()
-            right = df.iloc[0][["right_shoulder_x", "right_shoulder_y"]].to_numpy()
-            shoulder_px = float(np.linalg.norm(left - right))
-            
-            # Calculate px per inch using user-provided shoulder width
-            px_per_inch = shoulder_px / user_shoulder_width
-            
-            # Calculate MPH using the px_per_inch
-            mph = wrist_speed_data["speed_px_s"] / px_per_inch / 12 * 3600 / 5280
-            
-            # Get positions at contact
-            contact_data = df.iloc[contact_frame]
-            hip_rotation = abs(contact_data["left_hip_x"] - contact_data["right_hip_x"])
-            shoulder_rotation = abs(contact_data["left_shoulder_x"] - contact_data["right_shoulder_x"])
-            
-            # Prepare detailed metrics
-            detailed_metrics = {
-                "peak_speed": float(df['speed'].max()),
-                "contact_frame": int(contact_frame),
-                "wrist_speed": {
-                    "px_per_second": float(wrist_speed_data["speed_px_s"]),
-                    "mph": float(mph) if mph is not None else None,
-                    "frame_of_max": int(wrist_speed_data["frame_idx"])
-                },
-                "body_metrics": {
-                    "hip_rotation_px": float(hip_rotation),
-                    "shoulder_rotation_px": float(shoulder_rotation),
-                    "shoulder_width_px": float(shoulder_px),
-                    "user_shoulder_width_in": float(user_shoulder_width),
-                    "head_position": {
-                        "x": float(contact_data["nose_x"]),
-                        "y": float(contact_data["nose_y"])
-                    }
-                },
-                "contact_position": {
-                    "hands": {
-                        "lead": {
-                            "x": float(contact_data[f"{wrist_kp}_x"]),
-                            "y": float(contact_data[f"{wrist_kp}_y"])
-                        }
-                    },
-                    "hips": {
-                        "x": float(contact_data["com_x"]),
-                        "y": float(contact_data["com_y"])
-                    }
-                }
-            }
-            
-            # ---- 4. Send data to OpenAI for analysis ----------------------
-            ai_tips = []
-            error_ai = None
-            
-            if openai.api_key:
-                try:
-                    print(f"Attempting OpenAI API call with key of length: {len(openai.api_key)}")
-                    # Prepare data for OpenAI
-                    # Extract key metrics for analysis
-                    contact_frame = df.iloc[df['speed'].idxmax()]
-                    keypoints_at_contact = {col: float(contact_frame[col]) 
-                                          for col in df.columns 
-                                          if col.endswith('_x') or col.endswith('_y')}
-                    
-                    # Create analysis prompt with relevant data
-                    prompt = f"""
-                    You are analysing a {side.lower()}-handed amateur baseball swing.
-                    Below are the key measurements **at contact** and through the swing.
-                    Use them to give simple, specific coaching advice.  
-
-                    Swing measurements
-                    ------------------
-                    • Peak wrist speed ............... {hand_speed_mph:.1f} mph (using {user_shoulder_width} inch shoulder width) 
-                    • Time between peak speed and contact ..... {time_peak_to_contact_ms:.0f} ms  
-
-                    Body rotation (separation angles)
-                    • Hip rotation at contact ....... {hip_rot_deg:.1f}°  
-                    • Shoulder rotation at contact .. {shoulder_rot_deg:.1f}°  
-                    • Hip-to-shoulder separation ..... {hip_sep_deg:.1f}°  
-
-                    Bat & arm position
-                    • Lead-arm elbow angle .......... {lead_elbow_deg:.1f}°  
-                    • Bat-lag (forearm↔bat) ......... {bat_lag_deg:.1f}°  
-
-                    Instructions
-                    ------------
-                    1. **Return 3 – 4 bullet points** (≤ 20 words each) that an average 12-year-old can try today.  
-                    2. Reference the *measurements* above in plain language (mph, degrees, milliseconds).   
-                    3. **Do NOT** mention "pixels," raw keypoint names, or data collection details.  
-                    4. Be encouraging and prioritise the single biggest gain first.
-                    """
-
-                    
-                    # Call OpenAI API
-                    response = openai.chat.completions.create(
-                        model="gpt-4",
-                        messages=[
-                            {"role": "system", "content": """You are a professional baseball swing coach with expertise in biomechanics and swing analysis.
-                            Focus on providing specific, actionable advice based on the measured metrics.
-                            Explain how each metric indicates a potential improvement area and what specific adjustments would help."""},
-                            {"role": "user", "content": prompt}
-                        ],
-                        max_tokens=750  # Increased to allow for more detailed analysis
-                    )
-                    
-                    # Extract AI tips and add to regular tips
-                    print("OpenAI API call successful")
-                    ai_analysis = response.choices[0].message.content.strip()
-                    ai_tips = [tip.strip() for tip in ai_analysis.split('\n') if tip.strip()]
-                    print(f"AI tips count: {len(ai_tips)}")
-                    
-                except Exception as e:
-                    error_ai = str(e)
-                    print(f"OpenAI API error: {error_ai}")
-            else:
-                error_ai = "OpenAI API key not configured"
-                print("No OpenAI API key provided")
-            
-            # Save results to Firebase
-            results_blob = bucket.blob(f"results/{session_id}/analysis.json")
-            results_blob.upload_from_string(
-                json.dumps({
-                    "tips": tips,
-                    "metrics": detailed_metrics,
-                    "ai_tips": ai_tips if 'ai_tips' in locals() else None,
-                    "error_ai": error_ai if 'error_ai' in locals() else None
-                })
-            )
-            
-            return {
-                "session_id": session_id,
-                "video_url": video_blob.public_url,
-                "results_url": results_blob.public_url,
-                "tips": tips,
-                "metrics": detailed_metrics,
-                "ai_tips": ai_tips if 'ai_tips' in locals() else None
-            }
-                
+            return await _complete(job_id, td, video_hash, session_id,
+                                   side, shoulder_width, video_url)
+
         except Exception as e:
             import traceback
             traceback_str = traceback.format_exc()
             print(f"Error in processing: {str(e)}\n{traceback_str}")
+            jobs.fail(job_id, str(e))
+            return JSONResponse(status_code=500, content={"error": f"processing-error: {str(e)}"})
+
+
+@app.post("/process_keypoints")
+async def process_keypoints(
+    keypoints: UploadFile = File(...),        # pose container, see pose_store
+    side: str = Form("Right"),
+    shoulder_width: Optional[float] = Form(None),
+):
+    """
+    /process for clients that ran pose detection on the device: the upload
+    is a pose container with keypoints (frames, 17, 2), conf (frames, 17)
+    and time (frames,) – a few tens of KB per swing instead of the video.
+    Skips the job queue and inference; same response as /process.
+    """
+    session_id = str(uuid.uuid4())
+    with telemetry.span("upload_receive"):
+        data = await keypoints.read(MAX_KEYPOINT_BYTES + 1)
+    if len(data) > MAX_KEYPOINT_BYTES:
+        raise HTTPException(
+            status_code=413, detail=f"keypoints larger than {MAX_KEYPOINT_BYTES >> 20} MB"
+        )
+    payload_hash = hashlib.sha256(data).hexdigest()
+
+    cached = cache.get_result(payload_hash, video_key(side, shoulder_width))
+    if cached is not None:
+        telemetry.CACHE_HITS.inc()
+        return {**cached, "cached": True}
+
+    with tempfile.TemporaryDirectory() as td:
+        pose = pathlib.Path(td, "pose.pose")
+        try:
+            analysis = await asyncio.to_thread(analyse_keypoints, data, side, shoulder_width, pose)
+        except (ValueError, KeyError) as e:
+            raise HTTPException(status_code=400, detail=f"bad keypoint payload: {str(e)}")
+        except Exception as e:
+            print(f"Error in keypoint processing: {str(e)}")
+            return JSONResponse(status_code=500, content={"error": f"processing-error: {str(e)}"})
+        cache.put_pose_file(payload_hash, pose)
+
+    response, late = await _finish(session_id, analysis, side, shoulder_width, None)
+    if late is None:
+        cache.put_result(payload_hash, video_key(side, shoulder_width), response)
+    else:
+        _background(_deliver_ai(late, None, payload_hash, side, shoulder_width, response))
+
+    # same session record as a video upload, so /reanalyze works on it
+    cache.put_session(session_id, {"video_hash": payload_hash, "video_url": None})
+    pose = cache.get_pose(payload_hash)
+    if pose is not None:
+        uploader.upload_file(_pose_blob_name(session_id), pose)
+    return response
+
+
+# ---------------------------------------------------------------------------
+def _download_pose(session_id: str, td: str) -> Optional[pathlib.Path]:
+    path = pathlib.Path(td, "pose.pose")
+    return path if storage.download(_pose_blob_name(session_id), path) else None
+
+
+@app.post("/reanalyze/{session_id}")
+async def reanalyze(
+    session_id: str,
+    side: str = Form("Right"),
+    shoulder_width: Optional[float] = Form(None),
+    ai: bool = Form(False),                   # also ask OpenAI for new tips
+):
+    """
+    Recompute tips / metrics for an earlier session with new parameters,
+    from its stored pose track – no upload, no inference.
+    """
+    try:
+        uuid.UUID(session_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="unknown session")
+
+    record = cache.get_session(session_id) or {}
+    pose = cache.get_pose(record["video_hash"]) if "video_hash" in record else None
+
+    with tempfile.TemporaryDirectory() as td:
+        if pose is None:
+            # not on this instance – fall back to the copy in storage
+            pose = await asyncio.to_thread(_download_pose, session_id, td)
+            if pose is None:
+                raise HTTPException(status_code=404, detail="no stored pose data for this session")
+        try:
+            analysis = await asyncio.to_thread(analyse_pose_file, pose, side, shoulder_width)
+        except Exception as e:
+            print(f"Error in reanalysis: {str(e)}")
             return JSONResponse(status_code=500, content={"error": f"processing-error: {str(e)}"})
 
+    ai_tips = None
+    if ai:
+        ai_tips, _, _ = await coach.tips_within_budget(analysis["swing"], side, shoulder_width)
+
+    return {
+        "session_id": session_id,
+        "video_url": record.get("video_url"),
+        "results_url": None,
+        "tips": analysis["tips"],
+        "metrics": analysis["metrics"],
+        "faults": analysis["faults"],
+        "drills": analysis["drills"],
+        "ai_tips": ai_tips
+    }
+
+
+# ---------------------------------------------------------------------------
+def _background(coro) -> None:
+    """Run *coro* after the response, keeping a reference until it ends."""
+    task = asyncio.create_task(coro)
+    _job_tasks.add(task)
+    task.add_done_callback(_job_tasks.discard)
+
+
+async def _run_job(job_id: str, td: str, video_hash: str, session_id: str,
+                   side: str, shoulder_width: Optional[float], video_url: str):
+    try:
+        await _complete(job_id, td, video_hash, session_id, side, shoulder_width, video_url)
+    except Exception as e:
+        print(f"Error in job {job_id}: {str(e)}")
+        jobs.fail(job_id, f"processing-error: {str(e)}")
+    finally:
+        shutil.rmtree(td, ignore_errors=True)
+
+
+@app.post("/jobs", status_code=202)
+async def submit_job(
+    video: UploadFile = File(...),
+    side: str = Form("Right"),
+    shoulder_width: Optional[float] = Form(None),
+):
+    """Queue a video for analysis and return its job id immediately."""
+    session_id = str(uuid.uuid4())
+    td = tempfile.mkdtemp()
+    try:
+        tmp_vid, video_hash = await _save_upload(video, td)
+        cached = cache.get_result(video_hash, video_key(side, shoulder_width))
+        if cached is not None:
+            telemetry.CACHE_HITS.inc()
+            shutil.rmtree(td, ignore_errors=True)
+            job_id = jobs.add_done({**cached, "cached": True})
+            return {"job_id": job_id, "session_id": cached["session_id"],
+                    "status_url": f"/jobs/{job_id}", "events_url": f"/jobs/{job_id}/events"}
+
+        job_id = _submit(tmp_vid, video_hash, td, side, shoulder_width, progress=True)
+    except QueueFull as e:
+        shutil.rmtree(td, ignore_errors=True)
+        return _queue_full(e)
+    except Exception:
+        shutil.rmtree(td, ignore_errors=True)
+        raise
+
+    # storage upload runs concurrently with pose extraction
+    video_url = uploader.upload_file(f"videos/{session_id}/{video.filename}", tmp_vid)
+    _background(_run_job(job_id, td, video_hash, session_id, side, shoulder_width, video_url))
+    return {"job_id": job_id, "session_id": session_id, "status_url": f"/jobs/{job_id}",
+            "events_url": f"/jobs/{job_id}/events"}
+
+
+@app.get("/jobs/{job_id}")
+def job_status(job_id: str):
+    """Status of a submitted job; includes the /process payload once done."""
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="unknown job id")
+    return job
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """
+    Server‑sent events for a job: `progress` with frame counts and running
+    metrics while it runs, then one `done` (the /process payload) or `error`.
+    """
+    if jobs.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="unknown job id")
+
+    async def stream():
+        seen, idle = -1, 0.0
+        while True:
+            job = jobs.get(job_id)
+            if job is None:                       # evicted while we were watching
+                yield _sse("error", {"error": "unknown job id"})
+                return
+            if job["status"] == "done":
+                yield _sse("done", job["result"])
+                return
+            if job["status"] == "failed":
+                yield _sse("error", {"error": job.get("error")})
+                return
+            state = jobs.progress(job_id)
+            if state is None:
+                yield _sse("error", {"error": "unknown job id"})
+                return
+            count, update = state
+            if count != seen:
+                seen, idle = count, 0.0
+                yield _sse("progress", {"status": job["status"], **(update or {})})
+            elif idle >= SSE_KEEPALIVE_S:
+                idle = 0.0
+                yield ": keepalive\n\n"
+            await asyncio.sleep(SSE_POLL_S)
+            idle += SSE_POLL_S
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
 # ---------------------------------------------------------------------------
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8080))
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+swing_bench.py
+~~~~~~~~~~~~~~
+Benchmarks for the parsing and metrics hot paths.
+
+• `synth_swing()` generates a plausible swing (stance → load → rotation →
+  contact → follow‑through, with jitter, low‑confidence points and dropped
+  frames) and writes it exactly as extract_pose_csv does – CSV and .pose.
+• Every stage is timed on each clip length (median of repeated runs) and
+  run once more under tracemalloc for peak memory.
+• Results go to JSON; with --baseline they are compared against an earlier
+  run and regressions beyond --threshold are flagged (exit code 1).
+
+Usage
+------
+python swing_bench.py --out bench.json
+python swing_bench.py --baseline bench_baseline.json --threshold 0.15
+python swing_bench.py --lengths 30 300 --save-baseline bench_baseline.json
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from com_velo_parser import load_com_velo_csv, peak_wrist_speed, simple_swing_tips
+from metrics import enrich_and_measure
+from pose_store import write_pose
+from pose_track import KEYPOINTS, TrackBuilder, write_pose_csv
+from swing_pipeline import analyse_swing
+
+DEFAULT_LENGTHS = [30, 120, 300, 1200, 7200]
+FPS = 30.0
+
+# standing right‑handed batter, pixels in a 1920×1080 frame
+_STANCE = {
+    "nose": (960, 330), "left_eye": (950, 320), "right_eye": (970, 320),
+    "left_ear": (935, 325), "right_ear": (985, 325),
+    "left_shoulder": (900, 420), "right_shoulder": (1020, 420),
+    "left_elbow": (880, 520), "right_elbow": (1050, 500),
+    "left_wrist": (930, 470), "right_wrist": (980, 460),
+    "left_hip": (920, 640), "right_hip": (1000, 640),
+    "left_knee": (900, 780), "right_knee": (1020, 780),
+    "left_ankle": (880, 920), "right_ankle": (1050, 920),
+}
+
+
+# ---- synthetic data --------------------------------------------------------- #
+def synth_swing(frames: int, seed: int = 0, swing_frames: int = 30) -> Dict[str, np.ndarray]:
+    """
+    Pose arrays (extract_pose layout) for *frames* frames containing one
+    swing every ~3 s: the torso rotates about the hips while the hands travel
+    an accelerating arc that peaks at contact.
+    """
+    rng = np.random.default_rng(seed)
+    base = np.array([_STANCE[k] for k in KEYPOINTS], dtype=float)
+    hip_c = base[[KEYPOINTS.index("left_hip"), KEYPOINTS.index("right_hip")]].mean(0)
+    upper = [KEYPOINTS.index(k) for k in KEYPOINTS
+             if k.split("_")[-1] in {"shoulder", "elbow", "wrist", "eye", "ear", "nose"}]
+    hips = [KEYPOINTS.index("left_hip"), KEYPOINTS.index("right_hip")]
+    hands = [KEYPOINTS.index("left_wrist"), KEYPOINTS.index("right_wrist")]
+
+    def rotate(pts, ang):
+        rot = np.array([[np.cos(ang), -np.sin(ang)], [np.sin(ang), np.cos(ang)]])
+        return (pts - hip_c) @ rot.T + hip_c
+
+    period = max(int(3 * FPS), swing_frames + 10)
+    track = TrackBuilder(conf_thr=.6, dt=1 / FPS)      # the real COM / velocity logic
+    for t in range(frames):
+        phase = (t % period) / swing_frames              # 0‥1 during the swing
+        xy = base.copy()
+        if phase <= 1.0:
+            s = phase ** 6                               # slow load, explosive finish
+        else:                                            # ease back into the stance
+            back = (t % period - swing_frames) / (period - swing_frames)
+            s = 0.5 * (1 + np.cos(np.pi * back))
+        if s > 0:
+            xy[hips] = rotate(xy[hips], 0.4 * s)         # hips lead …
+            xy[upper] = rotate(xy[upper], 1.2 * s)       # … shoulders follow further
+            xy[hands] += [-700 * s, -80 * np.sin(np.pi * s)]
+            xy[:, 0] -= 25 * s                           # stride / weight shift
+        xy += rng.normal(0, 1.5, xy.shape)
+
+        if rng.random() < 0.02:                          # batter lost for a frame
+            track.add(None)
+            continue
+        conf = rng.uniform(0.65, 0.99, len(KEYPOINTS))
+        conf[rng.random(len(KEYPOINTS)) < 0.04] = rng.uniform(0.1, 0.5)
+        track.add((xy, conf))
+    return track.arrays()
+
+
+def write_fixtures(root: Path, lengths: List[int], seed: int = 0) -> Dict[int, Dict[str, Path]]:
+    """CSV + .pose for each length under *root* (reused if present)."""
+    out = {}
+    for n in lengths:
+        csv_path, pose_path = root / f"swing_{n}.csv", root / f"swing_{n}.pose"
+        if not (csv_path.exists() and pose_path.exists()):
+            arrays = synth_swing(n, seed=seed + n)
+            write_pose_csv(csv_path, arrays)
+            write_pose(pose_path, arrays, fps=FPS, synthetic=True)
+        out[n] = {"csv": csv_path, "pose": pose_path}
+    return out
+
+
+# ---- measurement ------------------------------------------------------------ #
+def _quiet():
+    # the analysis code prints a lot – keep it out of timings and output
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def measure(fn: Callable[[], object], min_time: float = 0.2, min_runs: int = 3,
+            max_runs: int = 200) -> dict:
+    """Median / min wall time over repeated runs, plus tracemalloc peak of one run."""
+    times = []
+    start = time.perf_counter()
+    with _quiet():
+        fn()                                              # warm‑up (imports, caches)
+        while len(times) < min_runs or (time.perf_counter() - start < min_time and len(times) < max_runs):
+            t0 = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - t0)
+
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {
+        "median_ms": round(statistics.median(times) * 1000, 4),
+        "min_ms": round(min(times) * 1000, 4),
+        "runs": len(times),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def stages(files: Dict[str, Path]) -> Dict[str, Callable[[], object]]:
+    """The benchmarked stages for one clip; each call starts from scratch."""
+    df = load_com_velo_csv(files["csv"])
+    return {
+        "load_com_velo_csv": lambda: load_com_velo_csv(files["csv"]),
+        "load_pose_file": lambda: load_com_velo_csv(files["pose"]),
+        "peak_wrist_speed": lambda: peak_wrist_speed(df, wrist="right_wrist", fps=FPS),
+        "simple_swing_tips": lambda: simple_swing_tips(df),
+        "enrich_and_measure": lambda: enrich_and_measure(df),
+        "analyse_swing": lambda: analyse_swing(df),
+    }
+
+
+def run(lengths: List[int], workdir: Path, only: Optional[List[str]] = None,
+        min_time: float = 0.2) -> dict:
+    fixtures = write_fixtures(workdir, lengths)
+    results = {}
+    for n in lengths:
+        for name, fn in stages(fixtures[n]).items():
+            if only and name not in only:
+                continue
+            r = measure(fn, min_time=min_time)
+            results[f"{name}@{n}"] = r
+            print(f"{name:20s} {n:6d} frames  {r['median_ms']:10.3f} ms  "
+                  f"(min {r['min_ms']:.3f}, {r['runs']} runs)  peak {r['peak_kb']:9.1f} KiB")
+    return {
+        "meta": {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = 0.15) -> List[str]:
+    """Regressions of *current* vs *baseline*: slower or hungrier by > threshold."""
+    problems = []
+    for key, new in current["results"].items():
+        old = baseline.get("results", {}).get(key)
+        if old is None:
+            continue
+        for field, label in (("median_ms", "time"), ("peak_kb", "memory")):
+            if old[field] > 0 and new[field] > old[field] * (1 + threshold):
+                problems.append(
+                    f"{key}: {label} {old[field]:.3f} → {new[field]:.3f} "
+                    f"(+{(new[field] / old[field] - 1) * 100:.0f}%)"
+                )
+    return problems
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark parsing + metrics stages")
+    p.add_argument("--lengths", type=int, nargs="+", default=DEFAULT_LENGTHS, help="clip lengths in frames")
+    p.add_argument("--stages", nargs="+", default=None, help="only these stages")
+    p.add_argument("--out", type=Path, default=None, help="write results JSON here")
+    p.add_argument("--baseline", type=Path, default=None, help="compare against this results JSON")
+    p.add_argument("--save-baseline", type=Path, default=None, help="also write results as a new baseline")
+    p.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown before flagging")
+    p.add_argument("--min-time", type=float, default=0.2, help="seconds of timing per stage")
+    p.add_argument("--workdir", type=Path, default=Path(tempfile.gettempdir(), "swing_bench"),
+                   help="where the synthetic clips are kept")
+    args = p.parse_args()
+
+    args.workdir.mkdir(parents=True, exist_ok=True)
+    current = run(args.lengths, args.workdir, only=args.stages, min_time=args.min_time)
+
+    for path in (args.out, args.save_baseline):
+        if path is not None:
+            path.write_text(json.dumps(current, indent=2))
+            print(f"results written to {path}")
+
+    if args.baseline is not None:
+        problems = compare(current, json.loads(args.baseline.read_text()), args.threshold)
+        if problems:
+            print(f"\n{len(problems)} regression(s) beyond {args.threshold:.0%}:")
+            for line in problems:
+                print(f"  ✗ {line}")
+            sys.exit(1)
+        print(f"\nno regressions beyond {args.threshold:.0%} vs {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+swing_index.py
+~~~~~~~~~~~~~~
+Reference library of swings (MLB, peers …) with fast "closest swings" and
+percentile lookups for a new swing.
+
+Each swing is described by
+• its enrich_and_measure metrics (z‑scored against the library), and
+• a resampled trajectory of the lead/trail shoulders, elbows, wrists and
+  hips around contact – centred on the hips, scaled by shoulder width and
+  mirrored for lefties – reduced with PCA.
+
+The combined vectors (7 metrics + up to 16 PCA scores) are searched by
+brute force – one matrix‑vector product per query; at this many dimensions
+a k‑d tree prunes almost nothing and is no faster than the scan.  Inserts
+append a row and are searchable at once; percentiles come from per‑metric
+sorted arrays.  The whole index round‑trips through one .npz file.
+
+    python swing_index.py build poses/ --label MLB --out reference.npz
+    python swing_index.py add reference.npz more_poses/ --label peer
+    python swing_index.py query reference.npz my_swing.pose
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from com_velo_parser import SwingAnalysis
+
+METRIC_KEYS = [
+    "peak_hand_speed_mph",
+    "time_peak_to_contact_ms",
+    "hip_rot_deg",
+    "shoulder_rot_deg",
+    "hip_shoulder_separation_deg",
+    "lead_elbow_angle_deg",
+    "bat_lag_deg",
+]
+
+# trajectory: these joints, from PRE_S before contact to POST_S after,
+# resampled to TRAJ_SAMPLES points
+TRAJ_JOINTS = ["shoulder", "elbow", "wrist", "hip"]
+PRE_S, POST_S = 0.8, 0.27
+TRAJ_SAMPLES = 32
+TRAJ_DIM = len(TRAJ_JOINTS) * 2 * TRAJ_SAMPLES * 2
+
+
+def trajectory_vector(swing: SwingAnalysis) -> np.ndarray:
+    """Normalised lead/trail joint paths around contact → (TRAJ_DIM,) float32."""
+    df, fps = swing.df, swing.fps
+    lefty = swing.side.lower().startswith("l")
+    lead, trail = ("left", "right") if lefty else ("right", "left")
+
+    n = len(df)
+    c = swing.contact_frame
+    t = np.linspace(c - PRE_S * fps, c + POST_S * fps, TRAJ_SAMPLES).clip(0, n - 1)
+    frames = np.arange(n)
+
+    centre = 0.5 * (swing.point("left_hip") + swing.point("right_hip"))
+    scale = swing.shoulder_px if swing.shoulder_px > 0 else 1.0
+
+    out = []
+    for joint in TRAJ_JOINTS:
+        for who in (lead, trail):
+            for axis, ctr in zip(("x", "y"), centre):
+                v = df[f"{who}_{joint}_{axis}"].to_numpy(dtype=float)
+                ok = np.isfinite(v)
+                path = np.interp(t, frames[ok], v[ok]) if ok.any() else np.full(TRAJ_SAMPLES, ctr)
+                path = (path - ctr) / scale
+                if axis == "x" and lefty:
+                    path = -path                    # lefties mirrored onto righties
+                out.append(path)
+    vec = np.concatenate(out)
+    return np.nan_to_num(vec).astype(np.float32)
+
+
+def metric_vector(metrics: Dict[str, float]) -> np.ndarray:
+    return np.array([float(metrics[k]) for k in METRIC_KEYS], dtype=np.float64)
+
+
+class SwingIndex:
+    """
+    k‑NN + percentile index over reference swings.
+
+    The PCA basis and metric scaling are fixed when the index is built (or
+    refit by `rebuild(refit=True)`); inserts are projected with them.
+    """
+
+    def __init__(self, n_components: int = 16):
+        self.n_components = n_components
+        self.ids: List[str] = []
+        self.labels: List[str] = []
+        self.metrics = np.empty((0, len(METRIC_KEYS)))
+        self.traj = np.empty((0, TRAJ_DIM), dtype=np.float32)
+        self._sorted = np.empty((len(METRIC_KEYS), 0))
+        self._embedded: np.ndarray          # (swings, dims) search vectors
+        self._sq: np.ndarray                # their squared norms
+        self.rebuild(refit=True)
+
+    # ---- model ------------------------------------------------------------- #
+    def _fit(self, metrics: np.ndarray, traj: np.ndarray) -> None:
+        if len(metrics) >= 2:
+            self.m_mean = metrics.mean(0)
+            self.m_std = metrics.std(0)
+            self.m_std[self.m_std == 0] = 1.0
+            self.t_mean = traj.mean(0).astype(np.float64)
+            _, sv, vt = np.linalg.svd(traj - self.t_mean, full_matrices=False)
+            k = min(self.n_components, len(sv))
+            self.components = vt[:k]
+            var = (sv[:k] ** 2).mean() / (len(traj) - 1)
+            # PCA scores scaled to unit average variance, like the z‑scores
+            self.t_scale = float(np.sqrt(var)) or 1.0
+        else:
+            self.m_mean = np.zeros(len(METRIC_KEYS))
+            self.m_std = np.ones(len(METRIC_KEYS))
+            self.t_mean = np.zeros(TRAJ_DIM)
+            self.components = np.empty((0, TRAJ_DIM))
+            self.t_scale = 1.0
+
+    def _embed(self, metrics: np.ndarray, traj: np.ndarray) -> np.ndarray:
+        z = (np.atleast_2d(metrics) - self.m_mean) / self.m_std
+        scores = (np.atleast_2d(traj) - self.t_mean) @ self.components.T / self.t_scale
+        return np.hstack([z, scores])
+
+    def rebuild(self, refit: bool = False) -> None:
+        """Re‑embed every swing (optionally refitting the PCA / scaling first)."""
+        if refit:
+            self._fit(self.metrics, self.traj)
+        self._embedded = self._embed(self.metrics, self.traj)
+        self._sq = np.einsum("ij,ij->i", self._embedded, self._embedded)
+
+    # ---- building ---------------------------------------------------------- #
+    @classmethod
+    def build(cls, ids: Sequence[str], metrics: np.ndarray, traj: np.ndarray,
+              labels: Optional[Sequence[str]] = None, n_components: int = 16) -> "SwingIndex":
+        index = cls(n_components=n_components)
+        index.ids = list(ids)
+        index.labels = list(labels) if labels is not None else [""] * len(index.ids)
+        index.metrics = np.asarray(metrics, dtype=np.float64).reshape(-1, len(METRIC_KEYS))
+        index.traj = np.asarray(traj, dtype=np.float32).reshape(-1, TRAJ_DIM)
+        index._sorted = np.sort(index.metrics.T, axis=1)
+        index.rebuild(refit=True)
+        return index
+
+    def add(self, swing_id: str, metrics: Union[Dict[str, float], np.ndarray],
+            traj: np.ndarray, label: str = "") -> None:
+        """Insert one swing; it is searchable immediately."""
+        m = metric_vector(metrics) if isinstance(metrics, dict) else np.asarray(metrics, dtype=np.float64)
+        self.ids.append(swing_id)
+        self.labels.append(label)
+        self.metrics = np.vstack([self.metrics, m])
+        self.traj = np.vstack([self.traj, np.asarray(traj, dtype=np.float32)])
+        pos = [np.searchsorted(col, v) for col, v in zip(self._sorted, m)]
+        self._sorted = np.stack([np.insert(col, p, v) for col, p, v in zip(self._sorted, pos, m)])
+        if len(self) <= 2:
+            self.rebuild(refit=True)             # scaling needs two swings
+        else:
+            row = self._embed(m, traj)
+            self._embedded = np.vstack([self._embedded, row])
+            self._sq = np.append(self._sq, row @ row[0])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # ---- lookups ----------------------------------------------------------- #
+    def query(self, metrics: Union[Dict[str, float], np.ndarray], traj: np.ndarray,
+              k: int = 5) -> List[dict]:
+        """The *k* closest reference swings → [{"id", "label", "distance"}, …]."""
+        if not len(self) or k <= 0:
+            return []
+        m = metric_vector(metrics) if isinstance(metrics, dict) else metrics
+        q = self._embed(m, traj)[0]
+
+        # |e − q|² = |e|² − 2 e·q + |q|² for every swing at once
+        d2 = np.maximum(self._sq - 2 * (self._embedded @ q) + q @ q, 0.0)
+        k = min(k, len(d2))
+        top = np.argpartition(d2, k - 1)[:k]
+        top = top[np.argsort(d2[top], kind="stable")]
+        return [
+            {"id": self.ids[i], "label": self.labels[i], "distance": round(float(np.sqrt(d2[i])), 4)}
+            for i in top
+        ]
+
+    def percentiles(self, metrics: Union[Dict[str, float], np.ndarray]) -> Dict[str, float]:
+        """Share of reference swings (0–100) at or below each metric."""
+        if not len(self):
+            return {}
+        m = metric_vector(metrics) if isinstance(metrics, dict) else metrics
+        n = self._sorted.shape[1]
+        return {
+            key: round(100.0 * float(np.searchsorted(col, v, side="right")) / n, 1)
+            for key, col, v in zip(METRIC_KEYS, self._sorted, m)
+        }
+
+    # ---- persistence ------------------------------------------------------- #
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the index (buffer included) to one .npz file at *path*."""
+        header = {"n_components": self.n_components, "ids": self.ids, "labels": self.labels,
+                  "t_scale": self.t_scale}
+        with open(path, "wb") as fh:
+            np.savez(
+                fh, header=np.array(json.dumps(header)), metrics=self.metrics, traj=self.traj,
+                m_mean=self.m_mean, m_std=self.m_std, t_mean=self.t_mean, components=self.components,
+            )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "SwingIndex":
+        with np.load(path) as z:
+            header = json.loads(str(z["header"]))
+            index = cls(n_components=header["n_components"])
+            index.ids, index.labels = header["ids"], header["labels"]
+            index.metrics, index.traj = z["metrics"], z["traj"]
+            index.m_mean, index.m_std = z["m_mean"], z["m_std"]
+            index.t_mean, index.components = z["t_mean"], z["components"]
+            index.t_scale = header["t_scale"]
+        index._sorted = np.sort(index.metrics.T, axis=1)
+        index.rebuild()
+        return index
+
+
+# ----------------------------- CLI wrapper ---------------------------------- #
+def _features(paths: List[Path], side: str):
+    from swing_pipeline import analyse_pose_file
+
+    for path in paths:
+        try:
+            result = analyse_pose_file(path, side)
+        except Exception as e:
+            print(f"skipping {path}: {e}")
+            continue
+        yield str(path), metric_vector(result["swing"]), result["trajectory"]
+
+
+def main():
+    from batch_swings import POSE_SUFFIXES, find_inputs
+
+    p = argparse.ArgumentParser(description="Build / extend / query a reference swing index")
+    sub = p.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="new index from pose tracks")
+    b.add_argument("inputs", nargs="+")
+    b.add_argument("--out", type=Path, required=True)
+    b.add_argument("--components", type=int, default=16)
+    a = sub.add_parser("add", help="insert pose tracks into an index")
+    a.add_argument("index", type=Path)
+    a.add_argument("inputs", nargs="+")
+    q = sub.add_parser("query", help="closest swings + percentiles for one pose track")
+    q.add_argument("index", type=Path)
+    q.add_argument("swing", type=Path)
+    q.add_argument("-k", type=int, default=5)
+    for s in (b, a, q):
+        s.add_argument("--side", default="Right")
+    for s in (b, a):
+        s.add_argument("--label", default="", help="e.g. MLB, peer")
+    args = p.parse_args()
+
+    if args.cmd == "query":
+        index = SwingIndex.load(args.index)
+        _, m, traj = next(_features([args.swing], args.side))
+        print(json.dumps({"closest": index.query(m, traj, k=args.k),
+                          "percentiles": index.percentiles(m)}, indent=2))
+        return
+
+    paths = [f for f in find_inputs(args.inputs) if f.suffix.lower() in POSE_SUFFIXES]
+    rows = list(_features(paths, args.side))
+    if args.cmd == "build":
+        ids, metrics, traj = zip(*rows) if rows else ((), (), ())
+        index = SwingIndex.build(ids, np.array(metrics), np.array(traj),
+                                 labels=[args.label] * len(rows), n_components=args.components)
+        out = args.out
+    else:
+        index = SwingIndex.load(args.index)
+        for swing_id, m, traj in rows:
+            index.add(swing_id, m, traj, label=args.label)
+        out = args.index
+    index.save(out)
+    print(f"{len(index)} swings in {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+# swing_jobs.py
+# ---------------------------------------------------------------------------
+# Background job queue for swing analysis.
+#
+# • A process pool runs the CPU‑heavy part (pose inference + metrics); each
+#   worker loads and warms its own copy of the pose model on start‑up.
+# • Depth is bounded: once `max_depth` jobs are queued or running, submit()
+#   raises QueueFull with a Retry‑After estimate instead of piling up work.
+# • Jobs are tracked by id so an API can hand out the id immediately and
+#   report status / result later.
+# • Workers buffer their telemetry (model load, inference, parse, metrics
+#   spans, frame counts) and ship it back with each result; `wait()` replays
+#   it into the parent so /metrics sees every stage.
+# • submit(..., progress=True) hands the job a `progress(update)` callback;
+#   updates travel back over a queue and `progress(job_id)` returns the
+#   latest one, so an API can stream partial metrics while a clip runs.
+# ---------------------------------------------------------------------------
+
+import asyncio
+import functools
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+import pose_model
+import telemetry
+
+# finished jobs kept around for status polling
+_KEEP_FINISHED = 1000
+
+
+class QueueFull(Exception):
+    """Raised by JobQueue.submit when the queue is at capacity."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"job queue full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+_progress_q = None                       # worker side: where progress updates go
+
+
+def _init_worker(threads: int, progress_q=None) -> None:
+    # split the cores between workers instead of every worker grabbing all
+    import torch
+    global _progress_q
+    _progress_q = progress_q
+    telemetry.setup_logging()
+    telemetry.buffer_events()
+    torch.set_num_threads(threads)
+    pose_model.warmup()
+
+
+def _send_progress(job_id: str, update: dict) -> None:
+    _progress_q.put((job_id, update))
+
+
+def _run(submitted: float, job_id: str, stream: bool, fn: Callable, args: tuple, kwargs: dict):
+    """Worker side of a job → (result, telemetry events since the last job)."""
+    telemetry.STAGE_SECONDS.labels("queue_wait").observe(time.time() - submitted)
+    if stream and _progress_q is not None:
+        kwargs = dict(kwargs, progress=functools.partial(_send_progress, job_id))
+    try:
+        result = fn(*args, **kwargs)
+    except Exception as e:
+        e.telemetry = telemetry.drain()
+        raise
+    return result, telemetry.drain()
+
+
+def _ping() -> Tuple[int, bool, Optional[str]]:
+    """(worker pid, model ready, load error); retries a failed warmup."""
+    if not pose_model.is_ready():
+        pose_model.warmup()
+    return os.getpid(), pose_model.is_ready(), pose_model.load_error()
+
+
+class Job:
+    __slots__ = ("id", "status", "result", "error", "submitted", "finished", "future",
+                 "progress", "updates")
+
+    def __init__(self, job_id: str, future: Future):
+        self.id = job_id
+        self.status = "queued"
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.submitted = time.time()
+        self.finished: Optional[float] = None
+        self.future = future
+        self.progress: Optional[dict] = None     # latest update from the worker
+        self.updates = 0                         # bumped on every update
+
+    def as_dict(self) -> dict:
+        status = self.status
+        if status == "queued" and self.future.running():
+            status = "running"
+        out = {"job_id": self.id, "status": status, "submitted": self.submitted}
+        if self.finished is not None:
+            out["finished"] = self.finished
+        if self.progress is not None and self.status != "done":
+            out["progress"] = self.progress
+        if self.status == "done":
+            out["result"] = self.result
+        if self.error is not None:
+            out["error"] = self.error
+        return out
+
+
+class JobQueue:
+    """
+    Bounded queue in front of a ProcessPoolExecutor.
+
+    The worker result is only the first half of a job: callers await it with
+    `wait()`, do any parent‑side work (AI tips, storage) and then publish the
+    final payload with `complete()` / `fail()`.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_depth: Optional[int] = None):
+        cores = os.cpu_count() or 1
+        self.workers = workers or max(1, cores // 2)
+        self.max_depth = max_depth or self.workers * 4
+        ctx = multiprocessing.get_context("spawn")            # torch is not fork‑safe
+        self._progress_q = ctx.Queue()
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(max(1, cores // self.workers), self._progress_q),
+        )
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._active = 0
+        self._avg_seconds = 10.0         # running mean of submit → result seconds
+        self._warm: list = []                  # outstanding _ping futures
+        self._warm_pids: set = set()           # workers seen with a warm model
+        self._load_error: Optional[str] = None
+        self._pump: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------ #
+    def start(self) -> None:
+        """Spawn the workers and start their warmup now rather than on the first request."""
+        self._warm = [self._pool.submit(_ping) for _ in range(self.workers)]
+        self._pump = threading.Thread(target=self._pump_progress, name="job-progress", daemon=True)
+        self._pump.start()
+
+    def _pump_progress(self) -> None:
+        while True:
+            item = self._progress_q.get()
+            if item is None:
+                return
+            job_id, update = item
+            job = self._job(job_id)
+            if job is not None and job.finished is None:
+                job.progress = update
+                job.updates += 1
+
+    def ready(self) -> Tuple[bool, Optional[str]]:
+        """
+        (at least one warm worker, last load error).  Pings go to whichever
+        worker is free, so this can't prove every worker is warm – see
+        warm_workers().  While none is, a failed ping is re‑sent, which
+        retries that worker's warmup.
+        """
+        with self._lock:
+            pending = []
+            for f in self._warm:
+                if not f.done():
+                    pending.append(f)
+                elif f.exception() is not None:
+                    self._load_error = str(f.exception())
+                else:
+                    pid, warm, error = f.result()
+                    if warm:
+                        self._warm_pids.add(pid)
+                    else:
+                        self._load_error = error
+            if self._warm_pids:
+                self._load_error = None
+            elif not pending:
+                try:
+                    pending.append(self._pool.submit(_ping))
+                except Exception as e:                  # pool broken / shut down
+                    self._load_error = str(e)
+            self._warm = pending
+            return bool(self._warm_pids), self._load_error
+
+    def warm_workers(self) -> int:
+        """Distinct worker processes that have answered a ping with a warm model."""
+        return len(self._warm_pids)
+
+    def depth(self) -> int:
+        return self._active
+
+    def retry_after(self) -> int:
+        backlog = self._active - self.workers + 1
+        return max(1, int(self._avg_seconds * max(1, backlog) / self.workers))
+
+    # ------------------------------------------------------------------ #
+    def submit(self, fn: Callable, *args, progress: bool = False, **kwargs) -> str:
+        """
+        Queue fn(*args, **kwargs) on a worker process → job id.
+        With *progress* fn also gets `progress=callback` for partial updates.
+        """
+        with self._lock:
+            if self._active >= self.max_depth:
+                raise QueueFull(self.retry_after())
+            self._active += 1
+            job_id = str(uuid.uuid4())
+            future = self._pool.submit(_run, time.time(), job_id, progress, fn, args, kwargs)
+            job = self._jobs[job_id] = Job(job_id, future)
+            while len(self._jobs) > self.max_depth + _KEEP_FINISHED:
+                oldest = next(iter(self._jobs.values()))
+                if oldest.finished is None:
+                    break
+                self._jobs.popitem(last=False)
+        future.add_done_callback(lambda f, job=job: self._worker_done(job))
+        return job_id
+
+    def add_done(self, result: Any) -> str:
+        """Record an already‑answered job (e.g. a cache hit) → job id."""
+        future: Future = Future()
+        future.set_result(result)
+        job_id = str(uuid.uuid4())
+        job = Job(job_id, future)
+        job.result, job.status, job.finished = result, "done", time.time()
+        with self._lock:
+            self._jobs[job_id] = job
+        return job_id
+
+    def _worker_done(self, job: Job) -> None:
+        elapsed = time.time() - job.submitted
+        with self._lock:
+            self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * elapsed
+            self._active -= 1
+        if job.status == "queued":
+            job.status = "finishing"
+
+    def _job(self, job_id: str) -> Optional[Job]:
+        """The Job for *job_id*, or None once it is unknown / evicted."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    async def wait(self, job_id: str) -> Any:
+        """Await the worker result for *job_id* (re‑raises worker errors)."""
+        job = self._job(job_id)
+        if job is None:
+            raise KeyError(f"unknown job {job_id}")
+        future = job.future
+        try:
+            result, events = await asyncio.wrap_future(future)
+        except Exception as e:
+            telemetry.replay(getattr(e, "telemetry", ()))
+            raise
+        telemetry.replay(events)
+        return result
+
+    def complete(self, job_id: str, result: Any) -> bool:
+        """Record *result*; False (and nothing kept) if the job was evicted."""
+        job = self._job(job_id)
+        if job is None:
+            return False
+        job.result, job.status, job.finished = result, "done", time.time()
+        return True
+
+    def fail(self, job_id: str, error: str) -> bool:
+        """Record *error*; False (and nothing kept) if the job was evicted."""
+        job = self._job(job_id)
+        if job is None:
+            return False
+        job.error, job.status, job.finished = error, "failed", time.time()
+        return True
+
+    def get(self, job_id: str) -> Optional[dict]:
+        job = self._job(job_id)
+        return job.as_dict() if job is not None else None
+
+    def progress(self, job_id: str) -> Optional[tuple]:
+        """(update count, latest progress update or None), None for an unknown job."""
+        job = self._job(job_id)
+        return (job.updates, job.progress) if job is not None else None
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if self._pump is not None:
+            self._progress_q.put(None)
@@ -0,0 +1,235 @@
+# swing_pipeline.py
+# ---------------------------------------------------------------------------
+# The /process analysis steps as plain, importable functions so they can run
+# outside the request handler (worker processes, batch jobs):
+#
+#   video ─ extract_pose ─ frame_from_pose ─ analyse_swing
+#   device keypoints ─ load_keypoint_payload ─ analyse_swing
+#
+# Coaching tips from OpenAI live in ai_coach.
+# ---------------------------------------------------------------------------
+
+import os
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from live_metrics import LiveSwingMetrics
+from com_velo_parser import (
+    SwingAnalysis,
+    frame_from_pose,
+    load_com_velo_csv,
+    load_keypoint_payload,
+    simple_swing_tips,
+)
+from metrics import enrich_and_measure
+from pose_filters import smooth_frame
+from pose_store import is_pose_file, read_pose, write_pose
+from swing_index import trajectory_vector
+from swing_rules import recommend, tip_features
+from telemetry import span
+
+DEFAULT_SHOULDER_WIDTH_IN = 16.0
+
+# SWING_SMOOTHING=savgol|one_euro gap‑fills and smooths every keypoint and
+# the COM once before any metric (see pose_filters); unset = raw keypoints.
+SMOOTHING = os.environ.get("SWING_SMOOTHING") or None
+
+# at most this often a progress callback gets partial metrics (seconds)
+PROGRESS_INTERVAL_S = 0.25
+
+# reasonable values substituted for NaN metrics
+SWING_DEFAULTS = {
+    "peak_hand_speed_mph": 55.0,
+    "time_peak_to_contact_ms": 120.0,
+    "hip_rot_deg": 30.0,
+    "shoulder_rot_deg": 45.0,
+    "hip_shoulder_separation_deg": 15.0,
+    "lead_elbow_angle_deg": 120.0,
+    "bat_lag_deg": 90.0,
+}
+
+
+def analyse_swing(
+    df: pd.DataFrame,
+    side: str = "Right",
+    shoulder_width: Optional[float] = None,
+    fps: float = 30.0,
+) -> dict:
+    """
+    Tips + metrics for one swing DataFrame.
+    Returns {"tips", "metrics" (the /process `metrics` payload), "swing"
+    (enrich_and_measure output with NaNs replaced by SWING_DEFAULTS),
+    "trajectory" (swing_index feature vector), "faults" / "drills" (from
+    the swing_rules table)}.
+    """
+    if SMOOTHING:
+        df = smooth_frame(df, SMOOTHING, fps=fps)
+    # every derived quantity below is computed once and shared
+    analysis = SwingAnalysis(df, side=side, fps=fps)
+
+    user_shoulder_width = shoulder_width if shoulder_width is not None else DEFAULT_SHOULDER_WIDTH_IN
+    swing = enrich_and_measure(analysis, shoulder_in=user_shoulder_width)
+
+    # rules see the measured values, before defaults stand in for NaNs
+    advice = recommend({**swing, **tip_features(analysis)})
+    tips = simple_swing_tips(analysis, advice=advice)
+
+    # Ensure no NaN values in metrics
+    for key, default in SWING_DEFAULTS.items():
+        if np.isnan(swing[key]):
+            swing[key] = default
+
+    # Get additional metrics
+    contact_frame = analysis.contact_frame
+    wrist_kp = analysis.wrist_kp
+    wrist_speed_data = analysis.wrist_speed
+
+    # Calculate MPH using shoulder width as reference
+    # If user provided shoulder width, use it; otherwise use default
+    # Note: Now using the same shoulder width as in enrich_and_measure
+    shoulder_px = analysis.shoulder_px
+    mph = analysis.wrist_mph(user_shoulder_width)
+
+    # Get positions at contact
+    contact_data = analysis.contact
+    hip_rotation = abs(contact_data["left_hip_x"] - contact_data["right_hip_x"])
+    shoulder_rotation = abs(contact_data["left_shoulder_x"] - contact_data["right_shoulder_x"])
+
+    # Prepare detailed metrics
+    detailed_metrics = {
+        "peak_speed": analysis.peak_speed,
+        "contact_frame": int(contact_frame),
+        "wrist_speed": {
+            "px_per_second": float(wrist_speed_data["speed_px_s"]),
+            "mph": float(mph) if mph is not None else None,
+            "frame_of_max": int(wrist_speed_data["frame_idx"])
+        },
+        "body_metrics": {
+            "hip_rotation_px": float(hip_rotation),
+            "shoulder_rotation_px": float(shoulder_rotation),
+            "shoulder_width_px": float(shoulder_px),
+            "user_shoulder_width_in": float(user_shoulder_width),
+            "head_position": {
+                "x": float(contact_data["nose_x"]),
+                "y": float(contact_data["nose_y"])
+            }
+        },
+        "contact_position": {
+            "hands": {
+                "lead": {
+                    "x": float(contact_data[f"{wrist_kp}_x"]),
+                    "y": float(contact_data[f"{wrist_kp}_y"])
+                }
+            },
+            "hips": {
+                "x": float(contact_data["com_x"]),
+                "y": float(contact_data["com_y"])
+            }
+        }
+    }
+
+    return {"tips": tips, "metrics": detailed_metrics, "swing": swing,
+            "trajectory": trajectory_vector(analysis),
+            "faults": advice["faults"], "drills": advice["drills"]}
+
+
+def _live_progress(progress: Callable[[dict], None], side: str,
+                   shoulder_width: Optional[float]) -> Callable:
+    """extract_pose on_frame callback: feed LiveSwingMetrics, report partials."""
+    live = None                       # built on the first frame, at the clip's fps
+    last = 0.0
+
+    def on_frame(index, total, fps, keypoints, com, velocity):
+        nonlocal live, last
+        if live is None:
+            live = LiveSwingMetrics(
+                side=side,
+                fps=fps,
+                shoulder_in=shoulder_width if shoulder_width is not None else DEFAULT_SHOULDER_WIDTH_IN,
+            )
+        live.push(keypoints, com, velocity)
+        now = time.monotonic()
+        if now - last >= PROGRESS_INTERVAL_S or (total and index + 1 >= total):
+            last = now
+            progress({"stage": "inference", "frames": index + 1, "total": total,
+                      "metrics": live.snapshot()})
+
+    return on_frame
+
+
+def analyse_video(
+    video: Path,
+    side: str = "Right",
+    shoulder_width: Optional[float] = None,
+    progress: Optional[Callable[[dict], None]] = None,
+    **extract_kw,
+) -> dict:
+    """
+    Pose extraction + analyse_swing for one video file (worker entry point).
+    Metrics use the clip's own frame rate (high‑speed clips included);
+    *out_bin* keeps the track as a .pose file that records it.
+    *progress(update)* – if given – receives frame counts and running metrics
+    while inference is still going (see live_metrics).
+    """
+    from extract_pose_csv import extract_pose       # heavy: torch / ultralytics
+
+    out_bin = extract_kw.pop("out_bin", None)
+    if progress is not None:
+        extract_kw["on_frame"] = _live_progress(progress, side, shoulder_width)
+    with span("inference"):
+        pose, meta = extract_pose(Path(video), **extract_kw)
+    fps = float(meta["fps"])
+    if out_bin is not None:
+        write_pose(out_bin, pose, analysis_fps=fps, **meta)
+    if progress is not None:
+        progress({"stage": "metrics"})
+    with span("parse"):
+        df = frame_from_pose(pose)
+    with span("metrics"):
+        return analyse_swing(df, side=side, shoulder_width=shoulder_width, fps=fps)
+
+
+def analyse_pose_file(
+    path: Path,
+    side: str = "Right",
+    shoulder_width: Optional[float] = None,
+    progress: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """analyse_swing for a stored pose track (.pose or CSV) – no inference."""
+    if progress is not None:
+        progress({"stage": "metrics"})
+    fps = 30.0
+    with span("parse"):
+        if is_pose_file(path):
+            arrays, meta = read_pose(path)
+            # the frame rate the track's metrics were taken at (older video
+            # tracks without it were analysed at 30 fps)
+            fps = float(meta.get("analysis_fps", fps))
+            df = frame_from_pose(arrays)
+        else:
+            df = load_com_velo_csv(path)
+    with span("metrics"):
+        return analyse_swing(df, side=side, shoulder_width=shoulder_width, fps=fps)
+
+
+def analyse_keypoints(
+    data: bytes,
+    side: str = "Right",
+    shoulder_width: Optional[float] = None,
+    out_bin: Optional[Path] = None,
+) -> dict:
+    """
+    analyse_swing for keypoints detected on the device (a pose container as
+    bytes, see pose_store) – no inference.  Wrist speed uses the payload's
+    own frame rate.  *out_bin* keeps the completed track as a .pose file.
+    """
+    with span("parse"):
+        df, arrays, fps = load_keypoint_payload(data)
+    if out_bin is not None:
+        write_pose(out_bin, arrays, fps=fps, analysis_fps=fps, source="device")
+    with span("metrics"):
+        return analyse_swing(df, side=side, shoulder_width=shoulder_width, fps=fps)
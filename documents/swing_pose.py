@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+swing_pose.py
+~~~~~~~~~~~~~
+Compact in‑memory form of one swing, for keeping many swings resident.
+
+`load_com_velo_csv` gives a wide DataFrame: the original string columns,
+~40 float64 columns and a few bool / object ones.  `SwingPose` keeps just
+the typed arrays –
+
+keypoints     (frames, 17, 2) float32   NaN where missing
+conf          (frames, 17)    float32   per‑keypoint confidence
+com           (frames, 2)     float64   hip midpoint
+velocity      (frames, 2)     float64   ΔCOM / dt (drives contact detection)
+foot_contact  (frames, 2)     bool
+
+– in contiguous arrays on a slotted object, and builds the DataFrame only
+when a caller asks for it (`to_frame()`, keypoint block without a copy).
+
+Keypoints are float32, as extract_pose and .pose files store them; from a
+CSV (float64) that rounds each coordinate by ≈ 1e‑4 px at 1080p, so
+metrics from `to_frame()` can differ from the source frame's in the last
+digits (test_swing_pose bounds the drift).  COM and velocity stay float64
+and match exactly.
+
+    python swing_pose.py swing.csv other.pose      # footprint report
+"""
+
+import argparse
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from com_velo_parser import KEYPOINT_COLUMNS, KEYPOINTS, _KP_INDEX, frame_from_pose, load_com_velo_csv
+from pose_store import is_pose_file, read_pose, write_pose
+
+
+class SwingPose:
+    __slots__ = ("keypoints", "conf", "com", "velocity", "foot_contact", "fps", "source")
+
+    def __init__(
+        self,
+        keypoints: np.ndarray,
+        conf: Optional[np.ndarray] = None,
+        com: Optional[np.ndarray] = None,
+        velocity: Optional[np.ndarray] = None,
+        foot_contact: Optional[np.ndarray] = None,
+        fps: float = 30.0,
+        source: Optional[str] = None,
+    ):
+        n = len(keypoints)
+        self.keypoints = np.ascontiguousarray(keypoints, dtype=np.float32).reshape(n, len(KEYPOINTS), 2)
+        if conf is None:
+            # no confidences in the source (old CSVs): 1 where a point exists
+            conf = np.isfinite(self.keypoints).all(-1)
+        self.conf = np.ascontiguousarray(conf, dtype=np.float32)
+        if com is None:
+            hips = self.keypoints[:, [_KP_INDEX["left_hip"], _KP_INDEX["right_hip"]]]
+            com = hips.astype(np.float64).mean(axis=1)
+        self.com = np.ascontiguousarray(com, dtype=np.float64)
+        if velocity is None:
+            velocity = np.zeros((n, 2))
+            velocity[1:] = np.nan_to_num(np.diff(self.com, axis=0)) * fps
+        self.velocity = np.ascontiguousarray(velocity, dtype=np.float64)
+        if foot_contact is None:
+            foot_contact = np.zeros((n, 2), dtype=bool)
+        self.foot_contact = np.ascontiguousarray(foot_contact, dtype=bool)
+        self.fps = float(fps)
+        self.source = source
+
+    # ---- constructors ------------------------------------------------------ #
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], fps: float = 30.0,
+                    source: Optional[str] = None) -> "SwingPose":
+        """From pose_store / extract_pose arrays."""
+        return cls(arrays["keypoints"], arrays.get("conf"), arrays.get("com"),
+                   arrays.get("velocity"), arrays.get("foot_contact"), fps=fps, source=source)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, fps: float = 30.0,
+                   source: Optional[str] = None) -> "SwingPose":
+        """From a load_com_velo_csv DataFrame (string columns are dropped)."""
+        n = len(df)
+        return cls(
+            df[KEYPOINT_COLUMNS].to_numpy(dtype=np.float32).reshape(n, len(KEYPOINTS), 2),
+            com=df[["com_x", "com_y"]].to_numpy(),
+            velocity=df[["vel_x", "vel_y"]].to_numpy(),
+            foot_contact=df[["contact_front", "contact_back"]].to_numpy(dtype=bool),
+            fps=fps, source=source,
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "SwingPose":
+        """Read a .pose file or a com_velo CSV."""
+        if is_pose_file(path):
+            arrays, meta = read_pose(path, mmap=False)
+            return cls.from_arrays(arrays, fps=meta.get("fps") or 30.0, source=str(path))
+        return cls.from_frame(load_com_velo_csv(path), source=str(path))
+
+    # ---- views ------------------------------------------------------------- #
+    def __len__(self) -> int:
+        return len(self.keypoints)
+
+    @property
+    def time(self) -> np.ndarray:
+        return np.arange(len(self)) / self.fps
+
+    @property
+    def speed(self) -> np.ndarray:
+        return np.hypot(np.nan_to_num(self.velocity[:, 0]), np.nan_to_num(self.velocity[:, 1]))
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """name → array, as pose_store / frame_from_pose expect (no copies)."""
+        return dict(keypoints=self.keypoints, conf=self.conf, com=self.com,
+                    velocity=self.velocity, time=self.time, foot_contact=self.foot_contact)
+
+    def to_frame(self) -> pd.DataFrame:
+        """The numeric load_com_velo_csv columns; keypoints are not copied."""
+        return frame_from_pose(self.arrays())
+
+    def save(self, path: Union[str, Path]) -> Path:
+        return write_pose(path, self.arrays(), fps=self.fps, source=self.source)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes
+                   for name in ("keypoints", "conf", "com", "velocity", "foot_contact"))
+
+
+def footprint(path: Union[str, Path]) -> Dict[str, int]:
+    """Resident bytes of one swing: today's DataFrame vs SwingPose."""
+    df = load_com_velo_csv(path)
+    pose = SwingPose.from_frame(df) if not is_pose_file(path) else SwingPose.load(path)
+    return {
+        "frames": len(df),
+        "dataframe_bytes": int(df.memory_usage(index=True, deep=True).sum()),
+        "swing_pose_bytes": pose.nbytes,
+    }
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Per‑swing memory: DataFrame vs SwingPose")
+    p.add_argument("files", nargs="+", type=Path)
+    args = p.parse_args()
+
+    print(f"{'file':30s} {'frames':>7s} {'DataFrame':>12s} {'SwingPose':>12s} {'ratio':>7s}")
+    for f in args.files:
+        fp = footprint(f)
+        ratio = fp["dataframe_bytes"] / max(fp["swing_pose_bytes"], 1)
+        print(f"{f.name:30s} {fp['frames']:7d} {fp['dataframe_bytes']:12,d} "
+              f"{fp['swing_pose_bytes']:12,d} {ratio:6.1f}x")
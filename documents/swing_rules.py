@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+swing_rules.py
+~~~~~~~~~~~~~~
+Fault detection as data: a rule table maps metric thresholds to fault ids,
+and faults map to drills through an index built once from drills.DRILLS.
+
+• `RULES` is the table – per fault, the conditions that must all hold
+  (metric, op, threshold) and the tip shown to the hitter.  Metrics are the
+  contact‑phase features of `tip_features()`, and a rule may also name any
+  enrich_and_measure key; a missing or NaN metric never fires a rule.
+• `RuleSet` compiles the table into flat condition arrays, so one call
+  evaluates a single swing or a whole batch (e.g. measure_swings output) as
+  a (swings, conditions) comparison and an AND per rule.
+• `DRILLS_FOR` (fault → drill ids) and the fault × drill incidence matrix
+  are precomputed; `recommend()` turns one swing's metrics into tips,
+  faults and drills without touching an LLM.
+"""
+
+from typing import Dict, List, Mapping, Union
+
+import numpy as np
+import pandas as pd
+
+from drills import DRILLS
+
+# fault id → {"when": [(metric, op, threshold), …] (all must hold), "tip"}
+# Tips are format strings over the swing's metrics.  These are the checks
+# simple_swing_tips always made; a new rule needs a stated source for its
+# threshold, and speeds must use the mph figure the hitter is shown.
+RULES: Dict[str, dict] = {
+    "bat_speed_low": {
+        "when": [("contact_speed", "<", 0.005)],
+        "tip": "Bat speed low: {contact_speed:.3f} px/frame at contact.",
+    },
+    "weak_hip_fire": {
+        "when": [("hip_open_px", "<", 5.0)],
+        "tip": "Open hips earlier – limited rotation before contact.",
+    },
+    "late_weight_shift": {
+        "when": [("weight_shift_px", "<", 0.0)],
+        "tip": "Weight still back at contact – shift onto front leg.",
+    },
+}
+
+_OPS = {
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+}
+
+
+def _drill_index(drills: Mapping[str, dict]) -> Dict[str, tuple]:
+    """Inverted DRILLS: fault id → drill ids that fix it, in library order."""
+    index: Dict[str, list] = {}
+    for drill_id, drill in drills.items():
+        for fault in drill.get("fixes", ()):
+            index.setdefault(fault, []).append(drill_id)
+    return {fault: tuple(ids) for fault, ids in index.items()}
+
+
+DRILLS_FOR: Dict[str, tuple] = _drill_index(DRILLS)
+
+
+class RuleSet:
+    """
+    A rule table compiled for array evaluation.
+
+    `metrics` is the column order evaluate() expects; conditions are stored
+    as (metric column, op, threshold) arrays sorted by rule, so a rule is a
+    contiguous run that `np.logical_and.reduceat` collapses.
+    """
+
+    def __init__(self, rules: Mapping[str, dict] = RULES, drills: Mapping[str, dict] = DRILLS):
+        self.faults: List[str] = list(rules)
+        self.tips: List[str] = [rules[f]["tip"] for f in self.faults]
+        for fault in self.faults:
+            if not rules[fault]["when"]:
+                raise ValueError(f"rule {fault!r} has no conditions")
+        conds = [(r, m, op, float(t)) for r, f in enumerate(self.faults)
+                 for m, op, t in rules[f]["when"]]
+        for _, m, op, _ in conds:
+            if op not in _OPS:
+                raise ValueError(f"unknown operator {op!r} in rule on {m!r}")
+        self.metrics: List[str] = sorted({m for _, m, _, _ in conds})
+        col = {m: i for i, m in enumerate(self.metrics)}
+        self._column = np.array([col[m] for _, m, _, _ in conds], dtype=np.intp)
+        self._threshold = np.array([t for *_, t in conds])
+        self._by_op = {op: np.array([i for i, c in enumerate(conds) if c[2] == op], dtype=np.intp)
+                       for op in _OPS}
+        rule_of = np.array([r for r, *_ in conds], dtype=np.intp)
+        self._starts = np.searchsorted(rule_of, np.arange(len(self.faults)))
+
+        self._library = drills
+        self.drills: List[str] = list(drills)
+        drill_col = {d: j for j, d in enumerate(self.drills)}
+        drills_for = DRILLS_FOR if drills is DRILLS else _drill_index(drills)
+        # fault × drill incidence: batch drill lookup is one matrix product
+        self.incidence = np.zeros((len(self.faults), len(self.drills)), dtype=np.int32)
+        for i, fault in enumerate(self.faults):
+            for d in drills_for.get(fault, ()):
+                self.incidence[i, drill_col[d]] = 1
+
+    # ------------------------------------------------------------------ #
+    def matrix(self, data: Union[Mapping[str, object], pd.DataFrame]) -> np.ndarray:
+        """Metrics → (swings, len(metrics)) float array; absent metrics are NaN."""
+        if not isinstance(data, pd.DataFrame):
+            values = [data.get(m, np.nan) for m in self.metrics]
+            if all(np.ndim(v) == 0 for v in values):           # one swing
+                return np.array([values], dtype=float)
+        columns = [np.atleast_1d(np.asarray(data[m] if m in data else np.nan, dtype=float))
+                   for m in self.metrics]
+        n = max(len(c) for c in columns)
+        return np.column_stack([np.broadcast_to(c, (n,)) for c in columns])
+
+    def evaluate(self, data: Union[Mapping[str, object], pd.DataFrame]) -> np.ndarray:
+        """(swings, faults) bool – which rules fire for each swing."""
+        x = self.matrix(data)
+        vals = x[:, self._column]
+        hold = np.zeros(vals.shape, dtype=bool)
+        with np.errstate(invalid="ignore"):
+            for op, idx in self._by_op.items():
+                if len(idx):
+                    hold[:, idx] = _OPS[op](vals[:, idx], self._threshold[idx])
+        return np.logical_and.reduceat(hold, self._starts, axis=1)
+
+    def drill_scores(self, hits: np.ndarray) -> np.ndarray:
+        """(swings, drills) – how many detected faults each drill addresses."""
+        return hits.astype(np.int32) @ self.incidence
+
+    # ------------------------------------------------------------------ #
+    def recommend(self, metrics: Mapping[str, object]) -> dict:
+        """One swing → {"faults", "tips", "drills"} (drills ranked by faults fixed)."""
+        hits = self.evaluate(metrics)[0]
+        faults = [f for f, hit in zip(self.faults, hits) if hit]
+        values = {k: v for k, v in metrics.items() if k in self.metrics}
+        tips = [self.tips[i].format(**values) for i in np.flatnonzero(hits)]
+        scores = self.drill_scores(hits[None])[0]
+        order = np.argsort(-scores, kind="stable")
+        drills = [self._library[self.drills[j]] for j in order if scores[j] > 0]
+        return {"faults": faults, "tips": tips, "drills": drills}
+
+    def evaluate_batch(self, metrics: pd.DataFrame) -> pd.DataFrame:
+        """A metrics table (e.g. measure_swings) → per‑swing faults and drill ids."""
+        hits = self.evaluate(metrics)
+        scores = self.drill_scores(hits)
+        faults = np.array(self.faults, dtype=object)
+        drills = np.array(self.drills, dtype=object)
+        out = pd.DataFrame(hits, columns=self.faults, index=metrics.index)
+        out["faults"] = [list(faults[h]) for h in hits]
+        out["drills"] = [list(drills[np.argsort(-s, kind="stable")][:int((s > 0).sum())])
+                         for s in scores]
+        return out
+
+
+def tip_features(analysis) -> Dict[str, float]:
+    """
+    Contact‑phase features of a SwingAnalysis the RULES read (pixels; speed
+    as in the DataFrame `speed` column).
+    """
+    df, contact = analysis.df, analysis.contact
+    start = df.loc[0]
+    start_sep = abs(start["left_hip_x"] - start["right_hip_x"])
+    contact_sep = abs(contact["left_hip_x"] - contact["right_hip_x"])
+    ankle_mid_x = (contact["left_ankle_x"] + contact["right_ankle_x"]) * 0.5
+    return {
+        "contact_speed": float(contact["speed"]),
+        "hip_open_px": float(contact_sep - start_sep),
+        "weight_shift_px": float(contact["com_x"] - ankle_mid_x),
+    }
+
+
+RULESET = RuleSet()
+
+
+def recommend(metrics: Mapping[str, object]) -> dict:
+    """RULESET.recommend – tips, faults and drills for one swing's metrics."""
+    return RULESET.recommend(metrics)
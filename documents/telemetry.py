@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+telemetry.py
+~~~~~~~~~~~~
+Process‑wide counters, gauges and histograms in Prometheus text format.
+
+• `span("inference")` times a block into `swing_stage_seconds{stage=…}`.
+• Worker processes (swing_jobs) call `buffer_events()`: their metric
+  updates are kept as events, shipped back with each job result and
+  `replay()`ed into the API process, so /metrics covers every stage no
+  matter which process ran it.
+• `render()` is the /metrics body; `setup_logging()` applies
+  SWING_LOG_LEVEL (default WARNING) to the analysis loggers.
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+Event = Tuple[str, Tuple[str, ...], str, float]      # (metric, label values, op, value)
+
+_buffer: Optional[List[Event]] = None                  # set in worker processes
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+        if not self.labelnames and self.kind != "histogram":
+            self._values[()] = 0.0               # scrapes see 0 before the first update
+
+    def labels(self, *values: str) -> "_Child":
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        return _Child(self, tuple(str(v) for v in values))
+
+    def _update(self, key: Tuple[str, ...], op: str, value: float) -> None:
+        if _buffer is not None:
+            _buffer.append((self.name, key, op, value))
+            return
+        with self._lock:
+            self._apply(key, op, value)
+
+    # unlabelled shortcuts
+    def inc(self, amount: float = 1.0) -> None:
+        self._update((), "inc", amount)
+
+    def set(self, value: float) -> None:
+        self._update((), "set", value)
+
+    def observe(self, value: float) -> None:
+        self._update((), "observe", value)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class _Child:
+    __slots__ = ("metric", "key")
+
+    def __init__(self, metric: _Metric, key: Tuple[str, ...]):
+        self.metric = metric
+        self.key = key
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.metric._update(self.key, "inc", amount)
+
+    def set(self, value: float) -> None:
+        self.metric._update(self.key, "set", value)
+
+    def observe(self, value: float) -> None:
+        self.metric._update(self.key, "observe", value)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _apply(self, key, op, value):
+        self._values[key] = self._values.get(key, 0.0) + value
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for key, v in items:
+            yield f"{self.name}{_labels(self.labelnames, key)} {_fmt(v)}"
+
+
+class Gauge(_Metric):
+    """A gauge; `set_function()` makes it read a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name, help, labelnames=()):
+        super().__init__(name, help, labelnames)
+        self._fn: Optional[Callable[[], float]] = None
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        self._fn = fn
+
+    def _apply(self, key, op, value):
+        self._values[key] = value if op == "set" else self._values.get(key, 0.0) + value
+
+    def samples(self):
+        if self._fn is not None:
+            try:
+                yield f"{self.name} {_fmt(float(self._fn()))}"
+            except Exception:
+                pass
+            return
+        with self._lock:
+            items = list(self._values.items())
+        for key, v in items:
+            yield f"{self.name}{_labels(self.labelnames, key)} {_fmt(v)}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets: Sequence[float] = ()):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def _apply(self, key, op, value):
+        counts, total = self._values.get(key) or ([0] * len(self.buckets), 0.0)
+        for i, upper in enumerate(self.buckets):
+            if value <= upper:
+                counts[i] += 1
+                break
+        self._values[key] = (counts, total + value)
+
+    def samples(self):
+        with self._lock:
+            items = [(k, (list(c), s)) for k, (c, s) in self._values.items()]
+        for key, (counts, total) in items:
+            running = 0
+            for upper, c in zip(self.buckets, counts):
+                running += c
+                le = 'le="' + _fmt(upper) + '"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, key, le)} {running}"
+            yield f"{self.name}_sum{_labels(self.labelnames, key)} {_fmt(total)}"
+            yield f"{self.name}_count{_labels(self.labelnames, key)} {running}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines = []
+        for m in self._metrics.values():
+            lines.append(f"# HELP {m.name} {m.help}")
+            lines.append(f"# TYPE {m.name} {m.kind}")
+            lines.extend(m.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+_SECONDS = (.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "swing_stage_seconds", "Time spent per analysis stage", ["stage"], _SECONDS))
+HTTP_SECONDS = REGISTRY.register(Histogram(
+    "swing_http_request_seconds", "HTTP request latency", ["route", "status"], _SECONDS))
+FRAMES = REGISTRY.register(Counter(
+    "swing_frames_processed_total", "Video frames run through pose inference"))
+FRAMES_INFERRED = REGISTRY.register(Counter(
+    "swing_frames_inferred_total", "Frames the pose network actually ran on"))
+PIPELINE_FPS = REGISTRY.register(Gauge(
+    "swing_pipeline_fps", "Throughput of the last clip per extraction stage", ["stage"]))
+QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "swing_queue_depth", "Analysis jobs queued or running"))
+UPLOADS_PENDING = REGISTRY.register(Gauge(
+    "swing_uploads_pending", "Storage uploads waiting or in progress"))
+UPLOAD_FAILURES = REGISTRY.register(Counter(
+    "swing_upload_failures_total", "Storage uploads that failed after all retries"))
+JOBS_REJECTED = REGISTRY.register(Counter(
+    "swing_jobs_rejected_total", "Submissions refused because the queue was full"))
+CACHE_HITS = REGISTRY.register(Counter(
+    "swing_cache_hits_total", "Requests answered from the analysis cache"))
+AI_LATE = REGISTRY.register(Counter(
+    "swing_ai_late_total", "AI tips that missed the request budget"))
+
+
+@contextmanager
+def span(stage: str):
+    """Time the block into swing_stage_seconds{stage}."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.labels(stage).observe(time.perf_counter() - t0)
+
+
+def buffer_events() -> None:
+    """Keep this process's metric updates for `drain()` (worker processes)."""
+    global _buffer
+    _buffer = []
+
+
+def drain() -> List[Event]:
+    """Buffered events since the last drain (empty when not buffering)."""
+    global _buffer
+    if _buffer is None:
+        return []
+    events, _buffer = _buffer, []
+    return events
+
+
+def replay(events: Iterable[Event]) -> None:
+    """Apply events drained in another process to this registry."""
+    for name, key, op, value in events:
+        metric = REGISTRY.get(name)
+        if metric is not None:
+            metric._update(key, op, value)
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+def setup_logging() -> None:
+    """Root logging at SWING_LOG_LEVEL; DEBUG turns the analysis traces on."""
+    logging.basicConfig(
+        level=os.environ.get("SWING_LOG_LEVEL", "WARNING").upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
@@ -0,0 +1,60 @@
+# test_batch_metrics.py
+# ---------------------------------------------------------------------------
+# batch_measure / measure_swings must give, swing for swing, what
+# enrich_and_measure gives for that swing alone – padding, handedness,
+# short clips and the missing-data fallbacks included.
+# ---------------------------------------------------------------------------
+
+import numpy as np
+import pytest
+
+import swing_bench
+from batch_metrics import measure_swings
+from com_velo_parser import frame_from_pose, load_com_velo_csv
+from metrics import enrich_and_measure
+from pose_track import write_pose_csv
+from swing_pose import SwingPose
+
+# 1 frame: defaults; < 5 frames: no Savitzky–Golay; the rest: padded
+LENGTHS = [1, 3, 4, 7, 60, 240, 600]
+SIDES = ["Right", "Left", "Right", "Left", "Left", "Right", "Left"]
+SHOULDER_IN = [16.0, 14.5, 16.0, 18.0, 15.0, 16.0, 17.25]
+
+
+@pytest.fixture(scope="module")
+def swing_arrays():
+    tracks = [swing_bench.synth_swing(n, seed=n) for n in LENGTHS]
+    # no shoulders on the first frame → the 60 mph fallback
+    tracks[4]["keypoints"][0, 5:7] = np.nan
+    return tracks
+
+
+def assert_rows_match(batch, singles):
+    assert len(batch) == len(singles)
+    for i, single in enumerate(singles):
+        row = batch.iloc[i]
+        assert set(row.index) == set(single)
+        for key, want in single.items():
+            assert row[key] == pytest.approx(want, rel=1e-12, abs=1e-9, nan_ok=True), (i, key)
+
+
+def test_dataframes_match_single_swing_metrics(swing_arrays, tmp_path):
+    frames = []
+    for n, arrays in zip(LENGTHS, swing_arrays):
+        path = tmp_path / f"swing_{n}.csv"
+        write_pose_csv(path, arrays)
+        frames.append(load_com_velo_csv(path))
+    singles = [enrich_and_measure(df.copy(), side=side, shoulder_in=width)
+               for df, side, width in zip(frames, SIDES, SHOULDER_IN)]
+    batch = measure_swings(frames, sides=SIDES, shoulder_in=SHOULDER_IN)
+    assert_rows_match(batch, singles)
+    assert batch["peak_hand_speed_mph"].iloc[4] == 60.0
+
+
+@pytest.mark.parametrize("wrap", [dict, SwingPose.from_arrays], ids=["arrays", "swing_pose"])
+def test_pose_arrays_match_single_swing_metrics(swing_arrays, wrap):
+    singles = [enrich_and_measure(frame_from_pose(a), side=side, fps=240.0)
+               for a, side in zip(swing_arrays, SIDES)]
+    batch = measure_swings([wrap(a) for a in swing_arrays], sides=SIDES, fps=240.0)
+    assert_rows_match(batch, singles)
+    np.testing.assert_array_equal(batch["contact_frame"], [s["contact_frame"] for s in singles])
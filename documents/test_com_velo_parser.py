@@ -0,0 +1,107 @@
+# test_com_velo_parser.py
+# ---------------------------------------------------------------------------
+# The vectorised CSV decode must give the columns the old per-row
+# ast.literal_eval parse gave, for extract_pose's JSON cells and for the
+# Python-literal cells older CSVs contain.
+# ---------------------------------------------------------------------------
+
+import ast
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from com_velo_parser import KEYPOINT_COLUMNS, KEYPOINTS, load_com_velo_csv
+
+NUMERIC_COLUMNS = KEYPOINT_COLUMNS + ["com_x", "com_y", "vel_x", "vel_y", "speed"]
+
+
+def per_row_parse(path) -> pd.DataFrame:
+    """The row-by-row parse load_com_velo_csv used before (reference)."""
+    def pair(cell):
+        try:
+            xy = ast.literal_eval(cell) if isinstance(cell, str) else None
+        except (ValueError, SyntaxError):
+            xy = None
+        if isinstance(xy, (tuple, list)) and len(xy) == 2:
+            return tuple(np.nan if v is None else float(v) for v in xy)
+        return (np.nan, np.nan)
+
+    def contact(cell):
+        try:
+            d = ast.literal_eval(cell)
+            return bool(d.get("front", False)), bool(d.get("back", False))
+        except Exception:
+            return False, False
+
+    df = pd.read_csv(path)
+    kp_dicts = df["keypoints"].apply(lambda s: ast.literal_eval(s) if isinstance(s, str) else {})
+    for kp in KEYPOINTS:
+        df[f"{kp}_x"] = kp_dicts.apply(lambda d: d.get(kp, (np.nan, np.nan))[0])
+        df[f"{kp}_y"] = kp_dicts.apply(lambda d: d.get(kp, (np.nan, np.nan))[1])
+    com, vel = df["COM"].apply(pair), df["velocity"].apply(pair)
+    df["com_x"], df["com_y"] = com.str[0], com.str[1]
+    df["vel_x"], df["vel_y"] = vel.str[0], vel.str[1]
+    df["speed"] = np.sqrt(df["vel_x"].fillna(0) ** 2 + df["vel_y"].fillna(0) ** 2)
+    flags = df["foot_contact"].apply(contact)
+    df["contact_front"], df["contact_back"] = flags.str[0], flags.str[1]
+    return df
+
+
+def python_literal_csv(src, dst):
+    """Rewrite extract_pose's JSON cells as the repr() cells of older CSVs."""
+    df = pd.read_csv(src, dtype=str, keep_default_na=False)
+    for col in ("keypoints", "COM", "velocity", "foot_contact"):
+        df[col] = [repr(_tuple_pairs(_cell(cell), col)) for cell in df[col]]
+    df.to_csv(dst, index=False)
+    return dst
+
+
+def _cell(cell):
+    try:
+        return json.loads(cell)
+    except ValueError:
+        return ast.literal_eval(cell)       # "(None,None)" for missed frames
+
+
+def _tuple_pairs(value, col):
+    if col in ("COM", "velocity"):
+        return tuple(value)
+    if col == "keypoints":
+        return {name: tuple(xy) for name, xy in value.items()}
+    return value
+
+
+def assert_same_columns(got: pd.DataFrame, want: pd.DataFrame):
+    for col in NUMERIC_COLUMNS[:-1]:
+        np.testing.assert_array_equal(got[col].to_numpy(dtype=float),
+                                      want[col].to_numpy(dtype=float), err_msg=col)
+    # np.hypot instead of sqrt(x² + y²): equal to the last bit or one ulp
+    np.testing.assert_allclose(got["speed"], want["speed"], rtol=1e-15, atol=0)
+    for col in ("contact_front", "contact_back"):
+        np.testing.assert_array_equal(got[col].to_numpy(dtype=bool),
+                                      want[col].to_numpy(dtype=bool), err_msg=col)
+
+
+@pytest.mark.parametrize("frames", [60, 600])
+def test_json_csv_matches_per_row_parse(swing_files, frames):
+    path = swing_files[frames]["csv"]
+    assert_same_columns(load_com_velo_csv(path), per_row_parse(path))
+
+
+def test_python_literal_csv_matches_per_row_parse(swing_files, tmp_path):
+    path = python_literal_csv(swing_files[240]["csv"], tmp_path / "old.csv")
+    df = load_com_velo_csv(path)
+    assert_same_columns(df, per_row_parse(path))
+    # missed frames carry "(None, None)" COM cells
+    assert df["com_x"].isna().any()
+
+
+def test_pose_file_matches_csv(swing_files):
+    from_csv = load_com_velo_csv(swing_files[240]["csv"])
+    from_pose = load_com_velo_csv(swing_files[240]["pose"])
+    for col in NUMERIC_COLUMNS:
+        np.testing.assert_allclose(from_pose[col].to_numpy(dtype=float),
+                                   from_csv[col].to_numpy(dtype=float),
+                                   rtol=1e-6, equal_nan=True, err_msg=col)
@@ -0,0 +1,71 @@
+# test_live_metrics.py
+# ---------------------------------------------------------------------------
+# LiveSwingMetrics fed one frame at a time must end on exactly what
+# enrich_and_measure reports for the whole track (and, in between, on what
+# it reports for the frames seen so far).
+# ---------------------------------------------------------------------------
+
+import numpy as np
+import pytest
+
+import swing_bench
+from com_velo_parser import frame_from_pose
+from live_metrics import LiveSwingMetrics
+from metrics import enrich_and_measure
+from swing_pipeline import _live_progress
+
+
+def frames(arrays, start=0, stop=None):
+    return {name: a[start:stop] for name, a in arrays.items()}
+
+
+def feed(live, arrays):
+    for kps, com, vel in zip(arrays["keypoints"], arrays["com"], arrays["velocity"]):
+        live.push(kps, com, vel)
+    return live.snapshot()
+
+
+def assert_snapshot_matches(snapshot, arrays, **kw):
+    want = enrich_and_measure(frame_from_pose(arrays), **kw)
+    assert snapshot.pop("frames") == len(arrays["keypoints"])
+    assert snapshot.keys() == want.keys()
+    for key, value in want.items():
+        value = None if not np.isfinite(value) else value      # snapshot is JSON‑safe
+        assert snapshot[key] == pytest.approx(value, rel=1e-9, abs=1e-9), key
+
+
+@pytest.mark.parametrize("n", [1, 2, 4, 5, 6, 60, 240])
+@pytest.mark.parametrize("side,fps", [("Right", 30.0), ("Left", 240.0)])
+def test_final_snapshot_equals_enrich_and_measure(n, side, fps):
+    arrays = swing_bench.synth_swing(n, seed=n)
+    live = LiveSwingMetrics(side=side, fps=fps, shoulder_in=17.0)
+    assert_snapshot_matches(feed(live, arrays), arrays, side=side, fps=fps, shoulder_in=17.0)
+
+
+def test_partial_snapshots_measure_the_frames_so_far():
+    arrays = swing_bench.synth_swing(120, seed=7)
+    live = LiveSwingMetrics()
+    seen = 0
+    for n in (3, 5, 9, 31, 32, 33, 80, 120):
+        snapshot = feed(live, frames(arrays, seen, n))
+        seen = n
+        assert_snapshot_matches(snapshot, frames(arrays, stop=n))
+
+
+def test_missing_wrist_and_shoulders():
+    arrays = swing_bench.synth_swing(90, seed=3)
+    arrays["keypoints"][:12, 10] = np.nan           # lead wrist lost at the start
+    arrays["keypoints"][0, 5] = np.nan              # no shoulder width → 60 mph
+    assert_snapshot_matches(feed(LiveSwingMetrics(), arrays), arrays)
+
+
+def test_last_progress_report_is_the_final_metrics():
+    arrays = swing_bench.synth_swing(150, seed=5)
+    reports = []
+    on_frame = _live_progress(reports.append, "Left", 15.0)
+    n = len(arrays["keypoints"])
+    for i, (kps, com, vel) in enumerate(zip(arrays["keypoints"], arrays["com"], arrays["velocity"])):
+        on_frame(i, n, 240.0, kps, com, vel)
+    assert reports[-1]["frames"] == n
+    assert_snapshot_matches(dict(reports[-1]["metrics"]), arrays, side="Left", fps=240.0,
+                            shoulder_in=15.0)
@@ -0,0 +1,80 @@
+# test_metrics.py
+# ---------------------------------------------------------------------------
+# enrich_and_measure reads every quantity from one memoised SwingAnalysis;
+# the numbers must be the ones a from-scratch computation on the DataFrame
+# gives, however the analysis is shared.
+# ---------------------------------------------------------------------------
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from com_velo_parser import (
+    SwingAnalysis,
+    find_contact_frame,
+    peak_wrist_speed,
+    px_per_inch_from_pose,
+    simple_swing_tips,
+)
+from metrics import _angle, enrich_and_measure
+
+
+def from_scratch(df, side="Right", fps=30.0, shoulder_in=16.0) -> dict:
+    """Every metric straight off the DataFrame, nothing shared (reference)."""
+    lefty = side.lower().startswith("l")
+    wrist, trail = ("left_wrist", "right_wrist") if lefty else ("right_wrist", "left_wrist")
+    elbow, shoulder = ("left_elbow", "left_shoulder") if lefty else ("right_elbow", "right_shoulder")
+    contact = find_contact_frame(df)
+    row = df.loc[contact]
+
+    def p(kp):
+        return np.array([row[f"{kp}_x"], row[f"{kp}_y"]], dtype=float)
+
+    peak = peak_wrist_speed(df, wrist=wrist, fps=fps,
+                            px_per_inch=px_per_inch_from_pose(df, shoulder_in))
+    hip, sh = p("right_hip") - p("left_hip"), p("right_shoulder") - p("left_shoulder")
+    hip_rot = np.degrees(np.arctan2(hip[1], hip[0]))
+    sh_rot = np.degrees(np.arctan2(sh[1], sh[0]))
+    return dict(
+        peak_hand_speed_mph=peak["speed_mph"],
+        peak_hand_speed_frame=peak["frame_idx"],
+        hip_rot_deg=hip_rot,
+        shoulder_rot_deg=sh_rot,
+        hip_shoulder_separation_deg=abs(((sh_rot - hip_rot + 180) % 360) - 180),
+        lead_elbow_angle_deg=_angle(p(shoulder), p(elbow), p(wrist)),
+        bat_lag_deg=_angle(p(shoulder), p(trail), p("nose")),
+        time_peak_to_contact_ms=abs(contact - peak["frame_idx"]) / fps * 1000,
+        contact_frame=contact,
+    )
+
+
+def assert_metrics_equal(got: dict, want: dict):
+    assert got.keys() == want.keys()
+    for key, value in want.items():
+        assert got[key] == pytest.approx(value, rel=1e-12), key
+
+
+@pytest.mark.parametrize("side", ["Right", "Left"])
+def test_metrics_match_a_from_scratch_computation(swing_df, side):
+    before = swing_df.copy()
+    assert_metrics_equal(enrich_and_measure(swing_df, side=side), from_scratch(swing_df, side=side))
+    pd.testing.assert_frame_equal(swing_df, before)        # the frame is only read
+
+
+def test_fps_and_shoulder_width_are_threaded_through(swing_df):
+    got = enrich_and_measure(swing_df, fps=240.0, shoulder_in=18.0)
+    assert_metrics_equal(got, from_scratch(swing_df, fps=240.0, shoulder_in=18.0))
+
+
+def test_shared_analysis_gives_the_same_answers(swing_df):
+    alone = enrich_and_measure(swing_df.copy())
+    analysis = SwingAnalysis(swing_df)
+    tips = simple_swing_tips(analysis)          # fills the cache first
+    assert enrich_and_measure(analysis) == alone
+    assert simple_swing_tips(swing_df.copy()) == tips
+
+
+def test_analysis_side_and_fps_win_over_arguments(swing_df):
+    analysis = SwingAnalysis(swing_df, side="Left", fps=60.0)
+    assert enrich_and_measure(analysis, side="Right", fps=30.0) == \
+        enrich_and_measure(swing_df.copy(), side="Left", fps=60.0)
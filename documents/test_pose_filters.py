@@ -0,0 +1,152 @@
+# test_pose_filters.py
+# ---------------------------------------------------------------------------
+# The one-pass filters must keep the shape of what they are given, fill
+# exactly the gaps they promise to, and match a column-by-column reference.
+# ---------------------------------------------------------------------------
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.signal import savgol_filter
+
+from pose_filters import (
+    POINT_COLUMNS,
+    Kinematics,
+    interpolate_gaps,
+    smooth_frame,
+    smooth_points,
+)
+
+
+def with_gaps(shape, seed=0):
+    """Random walk with NaN runs of length 1‥6, inside and at both ends."""
+    rng = np.random.default_rng(seed)
+    x = np.cumsum(rng.normal(0, 3, shape), axis=0) + 500
+    flat = x.reshape(len(x), -1)
+    for col in range(flat.shape[1]):
+        for _ in range(4):
+            start, length = rng.integers(0, len(x)), rng.integers(1, 7)
+            flat[start:start + length, col] = np.nan
+    return x
+
+
+def interpolate_column(v, max_gap):
+    """Reference: walk the NaN runs of one column, bridge the short inner ones."""
+    out, n, i = v.copy(), len(v), 0
+    while i < n:
+        if np.isfinite(v[i]):
+            i += 1
+            continue
+        j = i
+        while j < n and not np.isfinite(v[j]):
+            j += 1
+        if i > 0 and j < n and j - i <= max_gap:
+            out[i:j] = np.interp(np.arange(i, j), [i - 1, j], [v[i - 1], v[j]])
+        i = j
+    return out
+
+
+def one_euro_column(v, fps, min_cutoff=1.0, beta=0.007, d_cutoff=1.0):
+    """Reference: the scalar One-Euro filter, restarted after every gap."""
+    def alpha(cutoff):
+        return 1.0 / (1.0 + fps / (2 * np.pi * cutoff))
+
+    out, prev, dprev = np.full_like(v, np.nan), None, 0.0
+    for t, x in enumerate(v):
+        if not np.isfinite(x):
+            prev, dprev = None, 0.0
+            continue
+        if prev is None:
+            out[t], prev, dprev = x, x, 0.0
+            continue
+        dx = alpha(d_cutoff) * (x - prev) * fps + (1 - alpha(d_cutoff)) * dprev
+        a = alpha(min_cutoff + beta * abs(dx))
+        out[t] = prev = a * x + (1 - a) * prev
+        dprev = dx
+    return out
+
+
+@pytest.mark.parametrize("max_gap", [0, 1, 3, 5])
+def test_interpolate_gaps_fills_short_inner_gaps_only(max_gap):
+    x = with_gaps((80, 17, 2), seed=max_gap)
+    got = interpolate_gaps(x, max_gap)
+    assert got.shape == x.shape
+    want = np.stack([interpolate_column(c, max_gap) for c in x.reshape(80, -1).T], axis=1)
+    np.testing.assert_allclose(got.reshape(80, -1), want, rtol=1e-12, equal_nan=True)
+    np.testing.assert_array_equal(got[np.isfinite(x)], x[np.isfinite(x)])
+
+
+def test_savgol_matches_scipy_per_column():
+    x = with_gaps((120, 18, 2), seed=1)
+    x = interpolate_gaps(x, max_gap=100)[10:-10]            # complete columns
+    assert np.isfinite(x).all()
+    got = smooth_points(x, "savgol", window=7, order=3)
+    assert got.shape == x.shape
+    want = savgol_filter(x.reshape(len(x), -1), 7, 3, axis=0, mode="interp")
+    np.testing.assert_allclose(got.reshape(len(x), -1), want, rtol=1e-12)
+
+
+@pytest.mark.parametrize("method", ["savgol", "one_euro"])
+def test_smoothing_keeps_shape_and_missing_samples(method):
+    x = with_gaps((90, 18, 2), seed=2)
+    got = smooth_points(x, method, fps=240.0)
+    assert got.shape == x.shape
+    np.testing.assert_array_equal(np.isfinite(got), np.isfinite(x))
+    short = x[:3]                                           # shorter than the window
+    assert smooth_points(short, method).shape == short.shape
+
+
+def test_one_euro_matches_scalar_filter():
+    x = with_gaps((150, 6), seed=3)
+    got = smooth_points(x, "one_euro", fps=120.0)
+    want = np.stack([one_euro_column(c, 120.0) for c in x.T], axis=1)
+    np.testing.assert_allclose(got, want, rtol=1e-12, equal_nan=True)
+
+
+def test_one_euro_is_causal():
+    x = with_gaps((100, 4), seed=4)
+    later = x.copy()
+    later[60:] += 50.0
+    np.testing.assert_array_equal(smooth_points(x, "one_euro")[:60],
+                                  smooth_points(later, "one_euro")[:60])
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError, match="unknown smoothing"):
+        smooth_points(np.zeros((10, 2)), "kalman")
+
+
+@pytest.mark.parametrize("method", ["savgol", "one_euro"])
+def test_smooth_frame(swing_df, method):
+    df = swing_df
+    df.loc[20:21, "right_wrist_x"] = np.nan                 # two‑frame dropout
+    columns, length = list(df.columns), len(df)
+    assert smooth_frame(df, method, fps=60.0) is df
+    assert list(df.columns) == columns and len(df) == length
+    assert df.attrs["smoothing"] == method
+    assert np.isfinite(df.loc[20:21, "right_wrist_x"]).all()
+
+    com = df[["com_x", "com_y"]].to_numpy()
+    vel = np.vstack([[0.0, 0.0], np.diff(com, axis=0) * 60.0])
+    np.testing.assert_allclose(df[["vel_x", "vel_y"]], np.nan_to_num(vel))
+    np.testing.assert_allclose(df["speed"], np.hypot(df["vel_x"], df["vel_y"]))
+
+    before = df.copy()
+    smooth_frame(df, method)                                # applied once only
+    pd.testing.assert_frame_equal(df, before)
+
+
+def test_smooth_frame_none_is_a_no_op(swing_df):
+    before = swing_df.copy()
+    smooth_frame(swing_df, None)
+    pd.testing.assert_frame_equal(swing_df, before)
+    assert "smoothing" not in swing_df.attrs
+
+
+def test_kinematics_peak(swing_df):
+    kin = Kinematics.from_frame(swing_df, fps=30.0)
+    assert kin.xy.shape == (len(swing_df), len(POINT_COLUMNS) // 2, 2)
+    x, y = swing_df["left_wrist_x"].to_numpy(), swing_df["left_wrist_y"].to_numpy()
+    speed = np.hypot(np.diff(x), np.diff(y)) * 30.0
+    frame, peak = kin.peak("left_wrist")
+    assert peak == pytest.approx(np.nanmax(speed)) and frame == np.nanargmax(speed) + 1
@@ -0,0 +1,69 @@
+# test_pose_store.py
+# ---------------------------------------------------------------------------
+# A .pose round trip must give back the exact arrays – and so the exact
+# DataFrame – that went in, whichever way the file is read.
+# ---------------------------------------------------------------------------
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import swing_bench
+from com_velo_parser import frame_from_pose, load_com_velo_csv
+from pose_store import dump_pose, is_pose_file, loads_pose, read_pose, write_pose
+
+
+@pytest.fixture(params=[1, 240])
+def arrays(request):
+    return swing_bench.synth_swing(request.param, seed=request.param)
+
+
+def read_back(path, how):
+    if how == "bytes":
+        return loads_pose(path.read_bytes())
+    return read_pose(path, mmap=(how == "mmap"))
+
+
+@pytest.mark.parametrize("how", ["mmap", "memory", "bytes"])
+def test_round_trip_gives_identical_arrays(tmp_path, arrays, how):
+    path = write_pose(tmp_path / "swing.pose", arrays, fps=240.0, source="clip.mov")
+    back, meta = read_back(path, how)
+    assert meta == {"fps": 240.0, "source": "clip.mov"}
+    assert back.keys() == arrays.keys()
+    for name, a in arrays.items():
+        assert back[name].dtype == a.dtype and back[name].shape == a.shape, name
+        np.testing.assert_array_equal(back[name], a, err_msg=name)
+
+
+@pytest.mark.parametrize("how", ["mmap", "memory", "bytes"])
+def test_round_trip_gives_identical_frames(tmp_path, arrays, how):
+    path = write_pose(tmp_path / "swing.pose", arrays)
+    back, _ = read_back(path, how)
+    pd.testing.assert_frame_equal(frame_from_pose(back), frame_from_pose(arrays))
+
+
+def test_mapped_frame_writes_leave_the_file_alone(tmp_path, arrays):
+    path = write_pose(tmp_path / "swing.pose", arrays)
+    before = path.read_bytes()
+    df = load_com_velo_csv(path)
+    df["nose_x"] = 0.0
+    df.loc[:, "left_wrist_x"] *= 2
+    assert path.read_bytes() == before
+
+
+def test_dump_pose_matches_write_pose(tmp_path, arrays):
+    buf = io.BytesIO()
+    dump_pose(buf, arrays, fps=30.0)
+    path = write_pose(tmp_path / "swing.pose", arrays, fps=30.0)
+    assert buf.getvalue() == path.read_bytes()
+    assert is_pose_file(path) and not is_pose_file(tmp_path / "missing.pose")
+
+
+def test_truncated_file_is_rejected(tmp_path, arrays):
+    data = write_pose(tmp_path / "swing.pose", arrays).read_bytes()
+    with pytest.raises(ValueError, match="truncated"):
+        loads_pose(data[:-100])
+    with pytest.raises(ValueError, match="magic"):
+        loads_pose(b"frame,keypoints" + data[15:])
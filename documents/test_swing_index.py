@@ -0,0 +1,85 @@
+# test_swing_index.py
+# ---------------------------------------------------------------------------
+# SwingIndex.query must return exactly the k nearest swings a full
+# distance computation finds – after build, after inserts and after a
+# save / load – and percentiles must count the library directly.
+# ---------------------------------------------------------------------------
+
+import numpy as np
+import pytest
+
+from swing_index import METRIC_KEYS, TRAJ_DIM, SwingIndex
+
+
+def library(n, seed=0):
+    rng = np.random.default_rng(seed)
+    metrics = rng.normal([70, 150, 30, 45, 15, 120, 90], [8, 60, 10, 12, 6, 20, 15],
+                         (n, len(METRIC_KEYS)))
+    basis = rng.normal(0, 1, (6, TRAJ_DIM))             # trajectories share a few modes
+    traj = (rng.normal(0, 1, (n, 6)) @ basis + rng.normal(0, 0.05, (n, TRAJ_DIM))).astype(np.float32)
+    return [f"swing{i}" for i in range(n)], metrics, traj
+
+
+def brute_force(index, metrics, traj, k):
+    """Distances to every reference swing in the index's embedding (reference)."""
+    every = index._embed(index.metrics, index.traj)
+    d = np.linalg.norm(every - index._embed(metrics, traj), axis=1)
+    top = np.argsort(d, kind="stable")[:k]
+    return [index.ids[i] for i in top], d[top]
+
+
+def assert_query_matches(index, queries, k=5):
+    for m, traj in zip(*queries):
+        got = index.query(m, traj, k=k)
+        ids, dist = brute_force(index, m, traj, k)
+        assert [g["id"] for g in got] == ids
+        np.testing.assert_allclose([g["distance"] for g in got], dist, atol=1e-4)
+
+
+@pytest.fixture(scope="module")
+def queries():
+    _, metrics, traj = library(25, seed=1)
+    return metrics, traj
+
+
+def test_query_matches_brute_force(queries):
+    index = SwingIndex.build(*library(400))
+    assert_query_matches(index, queries)
+    assert_query_matches(index, queries, k=1)
+
+
+def test_inserts_are_searchable_at_once(queries):
+    ids, metrics, traj = library(400)
+    index = SwingIndex.build(ids[:300], metrics[:300], traj[:300])
+    for i in range(300, 400):
+        index.add(ids[i], metrics[i], traj[i], label="peer")
+    assert_query_matches(index, queries)
+    assert index.query(metrics[350], traj[350], k=1)[0] == \
+        {"id": "swing350", "label": "peer", "distance": 0.0}
+
+
+def test_growing_from_empty(queries):
+    ids, metrics, traj = library(30)
+    index = SwingIndex()
+    assert index.query(metrics[0], traj[0]) == [] and index.percentiles(metrics[0]) == {}
+    for i in range(30):
+        index.add(ids[i], dict(zip(METRIC_KEYS, metrics[i])), traj[i])
+    assert_query_matches(index, queries, k=50)          # k past the library size
+    assert index.query(metrics[0], traj[0], k=0) == []
+
+
+def test_save_load_round_trip(tmp_path, queries):
+    index = SwingIndex.build(*library(200), labels=["MLB"] * 200)
+    index.save(tmp_path / "reference.npz")
+    loaded = SwingIndex.load(tmp_path / "reference.npz")
+    for m, traj in zip(*queries):
+        assert loaded.query(m, traj) == index.query(m, traj)
+        assert loaded.percentiles(m) == index.percentiles(m)
+
+
+def test_percentiles_count_the_library(queries):
+    _, metrics, traj = library(200)
+    index = SwingIndex.build([str(i) for i in range(200)], metrics, traj)
+    for m in queries[0]:
+        want = 100.0 * (metrics <= m).mean(axis=0)
+        np.testing.assert_allclose(list(index.percentiles(m).values()), want, atol=0.05)
@@ -0,0 +1,56 @@
+# test_swing_pose.py
+# ---------------------------------------------------------------------------
+# SwingPose keeps keypoints in float32: metrics from to_frame() may drift
+# from the source frame's, but only in the last digits.
+# ---------------------------------------------------------------------------
+
+import numpy as np
+import pytest
+
+from com_velo_parser import KEYPOINT_COLUMNS
+from metrics import enrich_and_measure
+from swing_pose import SwingPose
+
+# metric → largest accepted |drift| (mph, degrees); frame / ms metrics exact
+TOLERANCE = {
+    "peak_hand_speed_mph": 1e-3,
+    "hip_rot_deg": 1e-3,
+    "shoulder_rot_deg": 1e-3,
+    "hip_shoulder_separation_deg": 1e-3,
+    "lead_elbow_angle_deg": 1e-3,
+    "bat_lag_deg": 1e-3,
+}
+
+
+@pytest.fixture
+def csv_precision_df(swing_df):
+    """The synthetic frame with full float64 keypoints, as a CSV can carry."""
+    rng = np.random.default_rng(len(swing_df))
+    swing_df[KEYPOINT_COLUMNS] += rng.uniform(-1e-3, 1e-3, (len(swing_df), len(KEYPOINT_COLUMNS)))
+    return swing_df
+
+
+def test_com_and_velocity_round_trip_exactly(csv_precision_df):
+    df = csv_precision_df
+    back = SwingPose.from_frame(df).to_frame()
+    for col in ("com_x", "com_y", "vel_x", "vel_y", "speed"):
+        np.testing.assert_array_equal(back[col].to_numpy(), df[col].to_numpy(), err_msg=col)
+
+
+def test_keypoints_round_to_float32(csv_precision_df):
+    df = csv_precision_df
+    back = SwingPose.from_frame(df).to_frame()
+    np.testing.assert_allclose(back[KEYPOINT_COLUMNS].to_numpy(), df[KEYPOINT_COLUMNS].to_numpy(),
+                               rtol=0, atol=2e-4, equal_nan=True)
+
+
+def test_metric_drift_is_bounded(csv_precision_df):
+    df = csv_precision_df
+    expected = enrich_and_measure(df.copy())
+    got = enrich_and_measure(SwingPose.from_frame(df).to_frame())
+    assert got.keys() == expected.keys()
+    for key, want in expected.items():
+        if key in TOLERANCE:
+            assert got[key] == pytest.approx(want, abs=TOLERANCE[key]), key
+        else:
+            assert got[key] == want, key
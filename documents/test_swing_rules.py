@@ -0,0 +1,117 @@
+# test_swing_rules.py
+# ---------------------------------------------------------------------------
+# The compiled rule table must fire exactly where the rules say, and
+# evaluating a whole batch must agree with recommend() swing by swing.
+# ---------------------------------------------------------------------------
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from com_velo_parser import SwingAnalysis, simple_swing_tips
+from drills import DRILLS
+from swing_rules import DRILLS_FOR, RULES, RULESET, RuleSet, recommend, tip_features
+
+# several conditions per rule, every operator, a metric shared by two rules
+TABLE = {
+    "slow_hand_speed": {"when": [("peak_hand_speed_mph", "<", 55.0)], "tip": "{peak_hand_speed_mph:.0f} mph"},
+    "no_extension": {"when": [("lead_elbow_angle_deg", "<=", 110.0),
+                              ("peak_hand_speed_mph", ">=", 40.0)], "tip": "extend"},
+    "hips_stuck": {"when": [("hip_rot_deg", ">", -5.0), ("hip_rot_deg", "<", 5.0),
+                            ("hip_shoulder_separation_deg", ">=", 20.0)], "tip": "hips"},
+}
+
+
+def features(n, seed=0):
+    """Random feature rows straddling every threshold, with some NaN."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "contact_speed": rng.uniform(-0.002, 0.012, n),
+        "hip_open_px": rng.normal(5.0, 4.0, n),
+        "weight_shift_px": rng.normal(0.0, 10.0, n),
+        "peak_hand_speed_mph": rng.uniform(30, 80, n),
+        "lead_elbow_angle_deg": rng.uniform(80, 160, n),
+        "hip_rot_deg": rng.uniform(-15, 15, n),
+        "hip_shoulder_separation_deg": rng.uniform(0, 40, n),
+    })
+    df[df > df.quantile(0.93)] = np.nan
+    df.iloc[::17] = df.iloc[::17].round()        # exact hits on the thresholds
+    return df
+
+
+def fires(rule, row) -> bool:
+    """Reference: every condition of *rule* holds for *row* (NaN never holds)."""
+    ops = {"<": lambda a, b: a < b, "<=": lambda a, b: a <= b,
+           ">": lambda a, b: a > b, ">=": lambda a, b: a >= b}
+    return all(ops[op](row.get(m, np.nan), t) for m, op, t in rule["when"])
+
+
+@pytest.mark.parametrize("rules", [RULES, TABLE], ids=["RULES", "table"])
+def test_evaluate_matches_the_rule_definitions(rules):
+    rule_set = RuleSet(rules)
+    df = features(500)
+    want = np.array([[fires(rules[f], row) for f in rule_set.faults]
+                     for row in df.to_dict("records")])
+    np.testing.assert_array_equal(rule_set.evaluate(df), want)
+
+
+@pytest.mark.parametrize("rules", [RULES, TABLE], ids=["RULES", "table"])
+def test_evaluate_batch_equals_per_swing_recommend(rules):
+    rule_set = RuleSet(rules)
+    df = features(300, seed=1)
+    batch = rule_set.evaluate_batch(df)
+    assert list(batch.index) == list(df.index)
+    for i, row in df.iterrows():
+        single = rule_set.recommend(row.to_dict())
+        assert batch.at[i, "faults"] == single["faults"]
+        assert batch.at[i, "drills"] == [d["id"] for d in single["drills"]]
+        assert [f for f in rule_set.faults if batch.at[i, f]] == single["faults"]
+
+
+def test_missing_metrics_never_fire():
+    assert recommend({}) == {"faults": [], "tips": [], "drills": []}
+    assert not RuleSet(TABLE).evaluate({"peak_hand_speed_mph": np.nan}).any()
+
+
+def test_recommend_gives_the_baseline_tips():
+    advice = recommend({"contact_speed": 0.0031, "hip_open_px": 2.0, "weight_shift_px": -4.0})
+    assert advice["faults"] == ["bat_speed_low", "weak_hip_fire", "late_weight_shift"]
+    assert advice["tips"] == [
+        "Bat speed low: 0.003 px/frame at contact.",
+        "Open hips earlier – limited rotation before contact.",
+        "Weight still back at contact – shift onto front leg.",
+    ]
+    assert recommend({"contact_speed": 0.005, "hip_open_px": 5.0, "weight_shift_px": 0.0})["faults"] == []
+
+
+def test_drills_are_ranked_by_faults_fixed():
+    library = {
+        "a": {"id": "a", "fixes": ["no_extension"]},
+        "b": {"id": "b", "fixes": ["slow_hand_speed", "no_extension"]},
+        "c": {"id": "c", "fixes": ["hips_stuck"]},
+    }
+    advice = RuleSet(TABLE, library).recommend(
+        {"peak_hand_speed_mph": 50.0, "lead_elbow_angle_deg": 100.0, "hip_rot_deg": 30.0})
+    assert advice["faults"] == ["slow_hand_speed", "no_extension"]
+    assert [d["id"] for d in advice["drills"]] == ["b", "a"]
+
+
+def test_drill_index_inverts_the_library():
+    for fault, ids in DRILLS_FOR.items():
+        assert ids == tuple(d for d, drill in DRILLS.items() if fault in drill.get("fixes", ()))
+    assert sum(map(len, DRILLS_FOR.values())) == sum(len(d.get("fixes", ())) for d in DRILLS.values())
+
+
+@pytest.mark.parametrize("rule", [{"when": [], "tip": ""}, {"when": [("x", "==", 1)], "tip": ""}])
+def test_bad_rules_are_rejected(rule):
+    with pytest.raises(ValueError):
+        RuleSet({"bad": rule})
+
+
+def test_simple_swing_tips_runs_the_rules_once(swing_df):
+    analysis = SwingAnalysis(swing_df)
+    tips = simple_swing_tips(analysis)
+    advice = recommend(tip_features(analysis))
+    assert tips[0].startswith("Peak hand speed") and tips[1:] == advice["tips"]
+    given = {"faults": [], "tips": ["from the caller"], "drills": []}
+    assert simple_swing_tips(analysis, advice=given)[1:] == ["from the caller"]